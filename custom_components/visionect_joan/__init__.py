@@ -1,21 +1,27 @@
 import logging
 import urllib.parse
 import voluptuous as vol
-from datetime import datetime, timezone, timedelta, date
+from datetime import datetime, timezone, timedelta
 from pathlib import Path
 import uuid
 import hashlib
-from functools import partial
+from functools import partial, wraps
 import asyncio
 import time
-import feedparser
 import json
 import re
 import aiohttp
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
-from homeassistant.const import CONF_HOST, CONF_USERNAME, CONF_PASSWORD, ATTR_DEVICE_ID, EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, callback
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_USERNAME,
+    CONF_PASSWORD,
+    ATTR_DEVICE_ID,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_HOMEASSISTANT_STOP,
+)
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers import device_registry as dr
@@ -28,7 +34,6 @@ from homeassistant.components.persistent_notification import (
     async_dismiss as async_dismiss_persistent_notification,
 )
 from homeassistant.helpers.network import get_url
-from homeassistant.components.recorder import history, get_instance
 from homeassistant.helpers.event import async_track_time_interval, async_call_later
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
@@ -53,7 +58,7 @@ from .const import (
     UNKNOWN_STRINGS, DISPLAY_ROTATIONS, SERVICE_FORCE_REFRESH, SERVICE_CLEAR_DISPLAY,
     SERVICE_SLEEP_DEVICE, SERVICE_WAKE_DEVICE, SERVICE_SEND_QR_CODE, EVENT_COMMAND_RESULT,
     NETWORK_RETRY_DELAY, ATTR_PREDEFINED_URL,
-    CONF_VIEWS, CONF_MAIN_MENU_URL, CONF_CLEANUP_MAX_AGE, CONF_CLEANUP_INTERVAL,
+    CONF_VIEWS, CONF_MAIN_MENU_URL, CONF_CLEANUP_MAX_AGE, CONF_CLEANUP_INTERVAL, MEDIA_CLEANUP_MIN_INTERVAL_S,
     SERVICE_SEND_KEYPAD, SUPPORTED_IMAGE_FORMATS, SERVICE_SEND_BUTTON_PANEL,
     CONF_TABLET_LANGUAGE, CONF_RECOVERY_PROBE_URL, CONF_RECOVERY_PAGE_TOKEN, API_TCLV_PARAM,
     CONF_OLLAMA_ENABLED, CONF_OLLAMA_URL, CONF_OLLAMA_API_KEY,
@@ -70,6 +75,15 @@ from .const import (
     OFFLINE_THRESHOLD_HOUR_CHOICES,
     POLL_INTERVAL_ECO, POLL_INTERVAL_NORMAL, POLL_INTERVAL_ALERT,
     SESSION_REFRESH_EVERY_TICKS_ECO, SESSION_REFRESH_EVERY_TICKS_NORMAL, SESSION_REFRESH_EVERY_TICKS_ALERT,
+    CONF_DISCOVERY_CONCURRENCY, CONF_DISCOVERY_DEVICE_TIMEOUT_SEC,
+    DISCOVERY_CONCURRENCY_DEFAULT, DISCOVERY_CONCURRENCY_MAX, DISCOVERY_DEVICE_TIMEOUT_DEFAULT_SEC,
+    CONF_PUSH_CONCURRENCY, PUSH_CONCURRENCY_DEFAULT,
+    CONF_SCREEN_MEMORY_MB, CONF_SCREEN_GZIP, SCREEN_MEMORY_MB_DEFAULT,
+    CONF_DETERMINISTIC_RENDER,
+    STATUS_PANEL_DEBOUNCE_DEFAULT_S,
+    CONF_RASTER_BACKEND, CONF_RASTER_GRAY_LEVELS, RASTER_GRAY_LEVELS_DEFAULT,
+    CONF_GRAPH_STATISTICS_AFTER_HOURS, GRAPH_STATISTICS_AFTER_HOURS_DEFAULT,
+    GRAPH_RENDERER_AUTO, GRAPH_RENDERER_SVG, GRAPH_RENDERERS,
     resolve_tablet_content_lang,
     TABLET_CONTENT_LANGS,
     vss_error_code_is_nonzero,
@@ -82,12 +96,33 @@ from .html_generator import (
     create_calendar_url, create_monthly_calendar_url, create_weather_url,
     create_weather_calendar_url,
     create_simple_cache_buster, _generate_graph_image, _check_matplotlib,
+    render_mode, status_panel_row,
     create_sensor_graph_svg_data_url,
     _add_interactive_layer_to_url, _get_lang, create_keypad_url,
     create_button_panel_url,
+    async_setup_icon_index,
     create_crypto_panel_url, create_exchange_rates_url, async_get_icon_as_base64,
 )
-from .screen_layout import infer_screen_size_from_device
+from .screen_layout import infer_screen_size_from_device, device_resolution
+from .raster_render import (
+    RASTER_BACKEND_NONE,
+    find_raster_backend,
+    image_page_html,
+    is_static_page,
+    predither_gray,
+)
+from .content_fingerprint import fingerprint_image
+from .html_i18n import state_translations
+from .live_status_panel import LiveStatusPanel, async_detach_tablets
+from .graph_engine import GRAPH_ENGINE
+from .graph_history import HistoryWindowCache, async_get_graph_history
+from .feed_fetcher import FeedFetcher
+from .market_data import MarketData
+from .prefetch import PrefetchScheduler
+from .calendar_cache import CalendarEventCache
+from .snapshot_pipeline import SNAPSHOT_FILE_PREFIX, SnapshotRing, prepare_snapshot
+from .publish_store import PublishStore, TAG_LOW_BATTERY
+from .screen_http import SCREEN_URL_PREFIX, ScreenStore, is_screen_name, screen_name_for
 from .profile_tuning import (
     apply_api_cache_ttls_for_profile_map,
     global_refresh_profile_from_map,
@@ -97,7 +132,8 @@ from .profile_tuning import (
 )
 from .url_push import (
     ATTR_WAKE_TABLET,
-    async_push_url_from_service,
+    async_push_urls_batch,
+    fire_batch_command_result,
     fire_command_result,
 )
 from . import repairs as visionect_repairs
@@ -481,6 +517,68 @@ def _collect_recovery_uuids_from_device_list(devices) -> list[str]:
     return list(dict.fromkeys(uuids))
 
 
+def _apply_session_fields_to_details(details: dict, session_data) -> None:
+    """Copy session URL / ReloadTimeout / Options into device details (in place)."""
+    if not isinstance(session_data, dict):
+        return
+    backend = session_data.get("Backend", {})
+    fields = backend.get("Fields", {}) if isinstance(backend, dict) else {}
+    if not isinstance(details.get("Config"), dict):
+        details["Config"] = {}
+    details["Config"]["Url"] = fields.get("url", "")
+    details["Config"]["ReloadTimeout"] = fields.get("ReloadTimeout", "0")
+    if "Options" in session_data:
+        details["SessionOptions"] = session_data.get("Options", {})
+
+
+async def _async_fetch_device_details_bounded(
+    api: VisionectAPI,
+    uuids: list[str],
+    *,
+    fetch_session: bool,
+    concurrency: int,
+    timeout_s: float,
+) -> tuple[dict[str, dict], set[str]]:
+    """Fetch details for many tablets in parallel (at most ``concurrency`` at once).
+
+    Each device gets its own timeout, so one slow tablet cannot stall the whole
+    discovery tick. Returns ``(details_by_uuid, timed_out_uuids)``; devices whose
+    fetch failed are simply absent from the dict.
+    """
+    semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+    timed_out: set[str] = set()
+
+    async def _fetch(uuid_val: str) -> dict | None:
+        details = await api.async_get_device_data(
+            uuid_val, fetch_session=fetch_session, prefer_fleet=True
+        )
+        if not details:
+            return None
+        if not fetch_session:
+            cfg = details.get("Config", {}) if isinstance(details, dict) else {}
+            if not cfg.get("Url"):
+                _apply_session_fields_to_details(
+                    details, await api.async_get_session_data(uuid_val, allow_stale=True)
+                )
+        return details
+
+    async def _fetch_one(uuid_val: str) -> dict | None:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(_fetch(uuid_val), timeout=timeout_s)
+            except asyncio.TimeoutError:
+                timed_out.add(uuid_val)
+                _LOGGER.warning(
+                    "Device %s did not answer within %ss during discovery refresh", uuid_val, timeout_s
+                )
+            except Exception as err:
+                _LOGGER.debug("Discovery fetch failed for %s: %s", uuid_val, err)
+            return None
+
+    results = await asyncio.gather(*(_fetch_one(u) for u in uuids))
+    return {u: d for u, d in zip(uuids, results) if d}, timed_out
+
+
 def _resolve_recovery_probe_url(
     entry: ConfigEntry,
     main_menu_fallback: str | None,
@@ -1493,6 +1591,8 @@ ATTR_ACTION_WEBHOOK_2_ID = "action_webhook_2_id"
 ATTR_SMALL_SCREEN = "small_screen_optimized"  # backwards compat alias
 ATTR_SCREEN_SIZE = "screen_size"
 ATTR_AUTO_RETURN_SECONDS = "auto_return_seconds"
+ATTR_LIVE_UPDATE = "live_update"
+ATTR_DEBOUNCE_SECONDS = "debounce_seconds"
 
 ATTR_URL = "url"
 ATTR_MESSAGE = "message"
@@ -1526,11 +1626,14 @@ ATTR_DAILY_GRID_EXPORT_ENTITY = "daily_grid_export_entity"
 ATTR_TODO_ENTITY = "todo_entity"
 ATTR_TITLE = "title"
 ATTR_CAMERA_ENTITY = "camera_entity"
+ATTR_DITHER = "dither"
 ATTR_CAPTION = "caption"
 ATTR_ENTITIES = "entities"
 ATTR_DURATION_HOURS = "duration_hours"
 ATTR_GRAPH_TYPE = "graph_type"
 ATTR_SHOW_POINTS = "show_points"
+ATTR_GRAPH_RENDERER = "renderer"
+ATTR_PREFETCH_MINUTES = "prefetch_minutes"
 ATTR_ENERGY_THEME = "theme"
 ATTR_COINS = "coins"
 ATTR_VS_CURRENCY = "vs_currency"
@@ -1631,6 +1734,11 @@ INTERACTIVE_SCHEMA_EXTENSION = {
     vol.Optional(ATTR_WAKE_TABLET, default=False): cv.boolean,
 }
 
+# Services whose inputs come from slow backends (forecasts, calendars, HTTP APIs)
+PREFETCH_SCHEMA_EXTENSION = {
+    vol.Optional(ATTR_PREFETCH_MINUTES, default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+}
+
 SERVICE_DEVICE_SCHEMA = vol.Schema({
     vol.Required(ATTR_DEVICE_ID): vol.Any(cv.string, [cv.string]),
 })
@@ -1683,6 +1791,7 @@ SERVICE_SEND_CALENDAR_SCHEMA = SERVICE_DEVICE_SCHEMA.extend({
     vol.Optional(ATTR_DURATION_DAYS, default=1): vol.All(vol.Coerce(int), vol.Range(min=1, max=31)),
     vol.Optional(ATTR_DISPLAY_STYLE, default="modern"): vol.In(["modern", "minimalist", "monthly_grid", "weather_calendar"]),
     vol.Optional(ATTR_WEATHER_ENTITY): cv.entity_id,
+    **PREFETCH_SCHEMA_EXTENSION,
     **INTERACTIVE_SCHEMA_EXTENSION,
 })
 
@@ -1691,6 +1800,7 @@ SERVICE_SEND_WEATHER_SCHEMA = SERVICE_DEVICE_SCHEMA.extend({
     vol.Optional(ATTR_LAYOUT, default="detailed_summary"): vol.In([
         "detailed_summary", "daily_forecast_list", "weather_graph_panel"
     ]),
+    **PREFETCH_SCHEMA_EXTENSION,
     **INTERACTIVE_SCHEMA_EXTENSION,
 })
 
@@ -1715,19 +1825,23 @@ SERVICE_SEND_CAMERA_SNAPSHOT_SCHEMA = SERVICE_DEVICE_SCHEMA.extend({
     vol.Optional(ATTR_CAPTION): cv.template,
     vol.Optional(ATTR_IMAGE_ZOOM, default=100): vol.All(vol.Coerce(int), vol.Range(min=10, max=200)),
     vol.Optional(ATTR_DISPLAY_ROTATION, default="0"): vol.In(["0", "90", "180", "270"]),
+    vol.Optional(ATTR_DITHER, default=False): cv.boolean,
     **INTERACTIVE_SCHEMA_EXTENSION,
 })
 
 SERVICE_SEND_STATUS_PANEL_SCHEMA = SERVICE_DEVICE_SCHEMA.extend({
     vol.Optional(ATTR_TITLE, default="Status Panel"): cv.string,
     vol.Required(ATTR_ENTITIES): cv.entity_ids,
+    vol.Optional(ATTR_LIVE_UPDATE, default=False): cv.boolean,
+    vol.Optional(ATTR_DEBOUNCE_SECONDS, default=STATUS_PANEL_DEBOUNCE_DEFAULT_S): vol.All(vol.Coerce(float), vol.Range(min=0, max=3600)),
     **INTERACTIVE_SCHEMA_EXTENSION,
 })
 
 SERVICE_SEND_SENSOR_GRAPH_SCHEMA = SERVICE_DEVICE_SCHEMA.extend({
     vol.Required(ATTR_ENTITIES): cv.entity_ids,
-    vol.Optional(ATTR_DURATION_HOURS, default=24): vol.All(vol.Coerce(int), vol.Range(min=1, max=48)),
-    vol.Optional(ATTR_GRAPH_TYPE, default="line"): vol.In(["line", "bar"]),
+    vol.Optional(ATTR_DURATION_HOURS, default=24): vol.All(vol.Coerce(int), vol.Range(min=1, max=720)),
+    vol.Optional(ATTR_GRAPH_TYPE, default="line"): vol.In(["line", "step", "bar"]),
+    vol.Optional(ATTR_GRAPH_RENDERER, default=GRAPH_RENDERER_AUTO): vol.In(GRAPH_RENDERERS),
     vol.Optional(ATTR_SHOW_POINTS, default=False): cv.boolean,
     vol.Optional(ATTR_IMAGE_ZOOM, default=100): vol.All(vol.Coerce(int), vol.Range(min=10, max=200)),
     vol.Optional(ATTR_DISPLAY_ROTATION, default="0"): vol.In(["0", "90", "180", "270"]),
@@ -1738,6 +1852,7 @@ SERVICE_SEND_RSS_FEED_SCHEMA = SERVICE_DEVICE_SCHEMA.extend({
     vol.Required("feed_url"): cv.url,
     vol.Optional("title", default="News"): cv.string,
     vol.Optional("max_items", default=5): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+    **PREFETCH_SCHEMA_EXTENSION,
     **INTERACTIVE_SCHEMA_EXTENSION,
 })
 
@@ -1786,6 +1901,7 @@ SERVICE_SEND_CRYPTO_SCHEMA = SERVICE_DEVICE_SCHEMA.extend({
     vol.Optional(ATTR_VS_CURRENCY, default="usd"): cv.string,  # e.g. usd, eur, pln
     vol.Optional(ATTR_HISTORY_HOURS, default=24): vol.All(vol.Coerce(int), vol.Range(min=0, max=168)),
     vol.Optional(ATTR_SHOW_HEADER, default=True): cv.boolean,
+    **PREFETCH_SCHEMA_EXTENSION,
     **INTERACTIVE_SCHEMA_EXTENSION,
 })
 
@@ -1818,8 +1934,21 @@ def _schedule_media_cleanup(hass: HomeAssistant) -> None:
     hass.async_create_task(_periodic_cleanup())
     async_track_time_interval(hass, _periodic_cleanup, timedelta(hours=interval_h))
 
+@callback
+def _request_media_cleanup(hass: HomeAssistant) -> None:
+    """Sweep www/ in the background after a publish, at most once per MEDIA_CLEANUP_MIN_INTERVAL_S."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    now = time.monotonic()
+    last = domain_data.get("media_cleanup_requested")
+    if last is not None and now - last < MEDIA_CLEANUP_MIN_INTERVAL_S:
+        return
+    domain_data["media_cleanup_requested"] = now
+    hass.async_create_background_task(
+        _async_cleanup_media_files(hass), "visionect_joan_media_cleanup"
+    )
+
 async def _async_cleanup_media_files(hass: HomeAssistant) -> None:
-    MEDIA_PREFIXES = ("visionect_snapshot_", "visionect_graph_")
+    MEDIA_PREFIXES = ("visionect_snapshot_", "visionect_graph_", "visionect_raster_")
     max_age_h = max(1, int(hass.data[DOMAIN]["cleanup_max_age_hours"]))
     cutoff = dt_util.utcnow() - timedelta(hours=max_age_h)
     
@@ -1828,8 +1957,19 @@ async def _async_cleanup_media_files(hass: HomeAssistant) -> None:
     if cache_path.exists():
         paths_to_clean.append(cache_path)
 
+    # Pages re-published recently are still on tablets even if the file itself is old.
+    store = _get_publish_store(hass)
+    keep_pages = store.recently_published(cutoff.timestamp())
+    screens = _get_screen_store(hass)
+    if screens is not None:
+        keep_pages |= screens.recently_used(cutoff.timestamp())
+        expired = screens.expire(cutoff.timestamp(), keep=keep_pages)
+        if expired:
+            store.forget(expired)
+            _LOGGER.debug("Visionect cleanup: dropped %s idle screens from memory.", len(expired))
+
     def _cleanup():
-        removed = 0
+        removed: list[str] = []
         for directory in paths_to_clean:
             if not directory.exists():
                 continue
@@ -1838,20 +1978,169 @@ async def _async_cleanup_media_files(hass: HomeAssistant) -> None:
                     continue
                 if directory.name == "www" and not p.name.startswith(MEDIA_PREFIXES):
                     continue
+                if directory.name == CACHE_DIR_NAME and p.name in keep_pages:
+                    continue
                 try:
                     mtime = datetime.fromtimestamp(p.stat().st_mtime, tz=timezone.utc)
                     if mtime < cutoff:
                         p.unlink(missing_ok=True)
-                        removed += 1
+                        removed.append(p.name)
                 except Exception:
                     continue
         return removed
     
     removed = await hass.async_add_executor_job(_cleanup)
-    if isinstance(removed, int) and removed > 0:
-        _LOGGER.info("Visionect cleanup: removed %s old media/cache files.", removed)
+    if removed:
+        store.forget(removed)
+        if screens is not None:
+            screens.forget_disk(removed)
+        _LOGGER.info("Visionect cleanup: removed %s old media/cache files.", len(removed))
+
+
+def _get_screen_store(hass: HomeAssistant) -> ScreenStore | None:
+    """In-memory screen tier served by VisionectJoanScreenView (created in async_setup)."""
+    return hass.data.get(DOMAIN, {}).get("screen_store")
+
+
+def _get_publish_store(hass: HomeAssistant) -> PublishStore:
+    """Shared content-addressed page store (one per HA instance, like the cache dir)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store = domain_data.get("publish_store")
+    if store is None:
+        store = PublishStore(hass, Path(hass.config.path("www")) / CACHE_DIR_NAME)
+        if domain_data.get("screen_memory_enabled", True):
+            store.screens = _get_screen_store(hass)
+        domain_data["publish_store"] = store
+    return store
+
+
+def _get_history_cache(hass: HomeAssistant) -> HistoryWindowCache:
+    """Recorder rows shared by every graph call (one per HA instance)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get("history_cache")
+    if cache is None:
+        cache = domain_data["history_cache"] = HistoryWindowCache()
+    return cache
+
+
+def _get_feed_fetcher(hass: HomeAssistant) -> FeedFetcher:
+    """Conditional-GET RSS fetcher with parsed items (one per HA instance)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    fetcher = domain_data.get("feed_fetcher")
+    if fetcher is None:
+        fetcher = domain_data["feed_fetcher"] = FeedFetcher(hass)
+    return fetcher
+
+
+def _get_calendar_cache(hass: HomeAssistant) -> CalendarEventCache:
+    """Normalized calendar events per calendar entity (one per HA instance)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache = domain_data.get("calendar_cache")
+    if cache is None:
+        cache = domain_data["calendar_cache"] = CalendarEventCache(hass)
+    return cache
+
+
+async def _async_fetch_calendar_events(
+    hass: HomeAssistant, cal_entity: str, duration_days: int
+) -> list[dict]:
+    """Events of one calendar from now to ``duration_days`` ahead, start/end as aware datetimes.
+
+    Raises when the calendar cannot be read, so a failure is never prefetched as "no events".
+    """
+    return await _get_calendar_cache(hass).async_get_events(cal_entity, duration_days, raise_on_error=True)
+
+
+async def _async_get_forecast(
+    hass: HomeAssistant, weather_entity_id: str, forecast_type: str
+) -> list:
+    """weather.get_forecasts for one entity; raises when the call fails or returns nothing."""
+    resp = await hass.services.async_call(
+        "weather", "get_forecasts",
+        {"entity_id": weather_entity_id, "type": forecast_type},
+        blocking=True, return_response=True,
+    )
+    if not resp or weather_entity_id not in resp:
+        raise RuntimeError(f"get_forecasts({weather_entity_id}, {forecast_type}) returned no forecast")
+    return resp[weather_entity_id].get("forecast", [])
+
+
+def _get_market_data(hass: HomeAssistant) -> MarketData:
+    """CryptoCompare price snapshots and hourly history (one per HA instance)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    market = domain_data.get("market_data")
+    if market is None:
+        market = domain_data["market_data"] = MarketData(hass)
+    return market
+
+
+def _published_url(hass: HomeAssistant, filename: str) -> str:
+    """Absolute URL of a published file: memory view when enabled, else /local/ cache dir."""
+    try:
+        base_url = get_internal_url(hass) if get_internal_url else get_url(hass)
+    except Exception:
+        base_url = get_url(hass)
+    if _get_publish_store(hass).screens is not None:
+        return f"{base_url}{SCREEN_URL_PREFIX}/{filename}"
+    return f"{base_url}/local/{CACHE_DIR_NAME}/{filename}"
+
+
+async def _publish_media(hass: HomeAssistant, data: bytes, ext: str, legacy_prefix: str) -> str:
+    """Publish graph PNG / snapshot JPEG bytes and return their absolute URL."""
+    store = _get_publish_store(hass)
+    screens = store.screens
+    if screens is not None:
+        name = screen_name_for(data, ext)
+        if store.media_fingerprint(name) is None:
+            store.note_media(name, await hass.async_add_executor_job(fingerprint_image, data))
+        screens.put(name, data)
+        return _published_url(hass, name)
+
+    www_dir = Path(hass.config.path("www"))
+    image_path = www_dir / f"{legacy_prefix}{uuid.uuid4().hex}.{ext}"
+
+    def _write() -> None:
+        www_dir.mkdir(parents=True, exist_ok=True)
+        image_path.write_bytes(data)
+
+    await hass.async_add_executor_job(_write)
+    _request_media_cleanup(hass)
+    try:
+        base_url = get_internal_url(hass) if get_internal_url else get_url(hass)
+    except Exception:
+        base_url = get_url(hass)
+    return f"{base_url}/local/{image_path.name}"
+
+def _get_snapshot_ring(hass: HomeAssistant) -> SnapshotRing:
+    """Per-camera www/ snapshot files (one per HA instance)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    ring = domain_data.get("snapshot_ring")
+    if ring is None:
+        ring = domain_data["snapshot_ring"] = SnapshotRing(hass, Path(hass.config.path("www")))
+    return ring
+
+
+async def _publish_snapshot(
+    hass: HomeAssistant, camera_entity_id: str, box: tuple[int, int], data: bytes, ext: str
+) -> str:
+    """Publish a camera frame fitted into ``box``: memory tier like other media, else a www/ ring."""
+    if _get_publish_store(hass).screens is not None:
+        return await _publish_media(hass, data, ext, SNAPSHOT_FILE_PREFIX)
+    name, digest = await _get_snapshot_ring(hass).async_write(camera_entity_id, box, data, ext)
+    try:
+        base_url = get_internal_url(hass) if get_internal_url else get_url(hass)
+    except Exception:
+        base_url = get_url(hass)
+    # Slot names are reused: the digest keeps tablets from showing a stale frame.
+    return f"{base_url}/local/{name}?v={digest}"
 
-async def _process_final_url(hass: HomeAssistant, url: str) -> str:
+async def _process_final_url(
+    hass: HomeAssistant,
+    url: str,
+    *,
+    service: str | None = None,
+    tags: tuple[str, ...] = (),
+) -> str:
     # HTML data URIs may be "data:text/html,..." or "data:text/html;charset=UTF-8,..."
     # (see create_button_panel_url). Only the latter was mishandled before: api rejects raw data: URLs.
     encoded_content = _html_data_uri_payload_segment(url)
@@ -1860,27 +2149,11 @@ async def _process_final_url(hass: HomeAssistant, url: str) -> str:
 
     try:
         html_content = urllib.parse.unquote(encoded_content)
-        content_hash = hashlib.md5(html_content.encode("utf-8")).hexdigest()
-        filename = f"{content_hash}.html"
-        www_path = Path(hass.config.path("www"))
-        cache_dir = www_path / CACHE_DIR_NAME
-        
-        def _write_file():
-            cache_dir.mkdir(parents=True, exist_ok=True)
-            file_path = cache_dir / filename
-            if not file_path.exists():
-                with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(html_content)
-        
-        await hass.async_add_executor_job(_write_file)
-        
-        try:
-            base_url = get_internal_url(hass) if get_internal_url else get_url(hass)
-        except Exception:
-            base_url = get_url(hass)
-            
-        final_file_url = f"{base_url}/local/{CACHE_DIR_NAME}/{filename}"
-        return create_simple_cache_buster(final_file_url)
+        # Content-addressed: an already indexed page is not written (or even stat'ed) again.
+        filename = await _get_publish_store(hass).async_publish(
+            html_content, service=service, tags=tags
+        )
+        return create_simple_cache_buster(_published_url(hass, filename))
     except Exception as e:
         _LOGGER.error("Failed to save HTML to file: %s", e)
         return url
@@ -1925,26 +2198,45 @@ async def _is_low_battery_cache_screen(hass: HomeAssistant, url: str) -> bool:
     try:
         parsed = urllib.parse.urlparse(url or "")
         path = parsed.path or ""
-        if f"/local/{CACHE_DIR_NAME}/" not in path or not path.endswith(".html"):
+        if not path.endswith(".html") or (
+            f"/local/{CACHE_DIR_NAME}/" not in path and f"{SCREEN_URL_PREFIX}/" not in path
+        ):
             return False
 
         filename = Path(path).name
-        file_path = Path(hass.config.path("www")) / CACHE_DIR_NAME / filename
-        if not file_path.exists():
-            return False
+        store = _get_publish_store(hass)
+        page = store.get(filename[: -len(".html")])
+        if page is not None:
+            return TAG_LOW_BATTERY in page.tags
+
+        # Not indexed (published before a restart): classify once, then remember.
+        screens = _get_screen_store(hass)
+        blob = await screens.async_get(filename) if screens and is_screen_name(filename) else None
+        if blob is not None:
+            html_text = blob.data.decode("utf-8", errors="replace")
+        else:
+            file_path = store.cache_dir / filename
+            if not file_path.exists():
+                return False
 
-        def _read_text() -> str:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
+            def _read_text() -> str:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    return f.read()
 
-        html_text = await hass.async_add_executor_job(_read_text)
+            html_text = await hass.async_add_executor_job(_read_text)
         markers = (
             "LOW BATTERY",
             "NISKI POZIOM BATERII",
             "Please connect charger.",
             "Podłącz ładowarkę.",
         )
-        return any(m in html_text for m in markers)
+        is_low = any(m in html_text for m in markers)
+        store.record_existing(
+            filename[: -len(".html")],
+            len(html_text.encode("utf-8")),
+            tags=(TAG_LOW_BATTERY,) if is_low else (),
+        )
+        return is_low
     except Exception:
         return False
 
@@ -2052,6 +2344,27 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         hass.http.register_view(VisionectJoanRecoveryChooseView(hass))
         hass.http.register_view(VisionectJoanRecoveryApplyBackView(hass))
         hass.data[DOMAIN]["_recovery_http_registered"] = True
+    if "screen_store" not in hass.data[DOMAIN]:
+        from .screen_http import VisionectJoanScreenView
+
+        yaml_config = hass.data[DOMAIN].get("yaml_config", {})
+        try:
+            screen_memory_mb = max(1, int(yaml_config.get("screen_memory_mb", SCREEN_MEMORY_MB_DEFAULT)))
+        except (TypeError, ValueError):
+            screen_memory_mb = SCREEN_MEMORY_MB_DEFAULT
+        screens = ScreenStore(
+            hass,
+            Path(hass.config.path("www")) / CACHE_DIR_NAME,
+            max_bytes=screen_memory_mb * 1024 * 1024,
+            gzip_enabled=bool(yaml_config.get("screen_gzip", True)),
+        )
+        hass.data[DOMAIN]["screen_store"] = screens
+        hass.http.register_view(VisionectJoanScreenView(hass))
+
+        async def _flush_screens(_event) -> None:
+            await screens.async_flush()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _flush_screens)
     return True
 
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -2084,7 +2397,43 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN]["cleanup_interval_hours"] = cleanup_interval
     hass.data[DOMAIN]["tablet_language"] = entry.options.get(CONF_TABLET_LANGUAGE, "auto")
 
+    # 0 MB switches publishing back to /local/ files; the view keeps serving what it has.
+    try:
+        screen_memory_mb = max(0, int(entry.options.get(
+            CONF_SCREEN_MEMORY_MB,
+            yaml_config.get("screen_memory_mb", SCREEN_MEMORY_MB_DEFAULT),
+        )))
+    except (TypeError, ValueError):
+        screen_memory_mb = SCREEN_MEMORY_MB_DEFAULT
+    screens = _get_screen_store(hass)
+    hass.data[DOMAIN]["screen_memory_enabled"] = screen_memory_mb > 0
+    if screens is not None and screen_memory_mb > 0:
+        screens.configure(
+            max_bytes=screen_memory_mb * 1024 * 1024,
+            gzip_enabled=bool(entry.options.get(CONF_SCREEN_GZIP, yaml_config.get("screen_gzip", True))),
+        )
+    _get_publish_store(hass).screens = screens if screen_memory_mb > 0 else None
+    deterministic_render = bool(
+        entry.options.get(CONF_DETERMINISTIC_RENDER, yaml_config.get("deterministic_render", True))
+    )
+
+    def _in_render_mode(handler):
+        """Run ``handler`` (service call or live re-render) with this entry's render mode."""
+        @wraps(handler)
+        async def _wrapped(*args):
+            with render_mode(deterministic=deterministic_render):
+                return await handler(*args)
+        return _wrapped
+
+    @callback
+    def _stop_live_status_panels(uuids: list[str]) -> None:
+        """Something else is pushed to ``uuids``: their live status panels stop updating them."""
+        live_panels = hass.data.get(DOMAIN, {}).get(entry.entry_id, {}).get("live_status_panels")
+        if live_panels:
+            async_detach_tablets(live_panels, uuids)
+
     _schedule_media_cleanup(hass)
+    await async_setup_icon_index(hass)
 
     api = VisionectAPI(
         hass,
@@ -2136,6 +2485,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # without adding unnecessary API churn on every coordinator cycle.
     session_refresh_state = {"tick": 0}
     SESSION_REFRESH_EVERY_TICKS = 4  # With 15-min scan interval => once per hour
+    try:
+        discovery_concurrency = min(DISCOVERY_CONCURRENCY_MAX, max(1, int(entry.options.get(
+            CONF_DISCOVERY_CONCURRENCY,
+            yaml_config.get("discovery_concurrency", DISCOVERY_CONCURRENCY_DEFAULT),
+        ))))
+    except (TypeError, ValueError):
+        discovery_concurrency = DISCOVERY_CONCURRENCY_DEFAULT
+    try:
+        discovery_timeout_s = max(1.0, float(entry.options.get(
+            CONF_DISCOVERY_DEVICE_TIMEOUT_SEC,
+            yaml_config.get("discovery_device_timeout_sec", DISCOVERY_DEVICE_TIMEOUT_DEFAULT_SEC),
+        )))
+    except (TypeError, ValueError):
+        discovery_timeout_s = float(DISCOVERY_DEVICE_TIMEOUT_DEFAULT_SEC)
 
     async def async_update_data():
         try:
@@ -2149,37 +2512,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             # Pobierz listę orphans (problematycznych sesji)
             orphans = await api.async_get_orphans()
             
-            data = {}
+            uuid_list: list[str] = []
             for device_entry in devices_summary:
                 if isinstance(device_entry, str):
                     uuid_val = str(device_entry).strip().rstrip("/")
                 else:
                     uuid_val = str(device_entry.get("Uuid", "")).strip().rstrip("/")
+                if uuid_val:
+                    uuid_list.append(uuid_val)
+            uuid_list = list(dict.fromkeys(uuid_list))
+
+            # Fetch stage: one detail fetch per device, run in parallel with a bounded fan-out.
+            # Session details are refreshed periodically (or on-demand when missing) to keep
+            # configured_url / reload timeout entities from getting stuck on "unknown".
+            details_by_uuid, timed_out = await _async_fetch_device_details_bounded(
+                api,
+                uuid_list,
+                fetch_session=force_session_refresh,
+                concurrency=discovery_concurrency,
+                timeout_s=discovery_timeout_s,
+            )
+            previous_data = coordinator.data or {}
 
-                if not uuid_val:
-                    continue
-
-                # Single fetch per device.
-                # Session details are refreshed periodically (or on-demand when missing) to keep
-                # configured_url / reload timeout entities from getting stuck on "unknown".
-                device_details = await api.async_get_device_data(
-                    uuid_val, fetch_session=force_session_refresh
-                )
+            # Guard stage: sequential, in device-list order (notifications / tablet pushes).
+            data = {}
+            for uuid_val in uuid_list:
+                device_details = details_by_uuid.get(uuid_val)
                 if not device_details:
+                    # Timed out this tick: keep the last snapshot instead of dropping the device.
+                    if uuid_val in timed_out and uuid_val in previous_data:
+                        data[uuid_val] = previous_data[uuid_val]
                     continue
-                if not force_session_refresh:
-                    cfg = device_details.get("Config", {}) if isinstance(device_details, dict) else {}
-                    if not cfg.get("Url"):
-                        session_data = await api.async_get_session_data(uuid_val)
-                        if isinstance(session_data, dict):
-                            backend = session_data.get("Backend", {})
-                            fields = backend.get("Fields", {}) if isinstance(backend, dict) else {}
-                            if not isinstance(device_details.get("Config"), dict):
-                                device_details["Config"] = {}
-                            device_details["Config"]["Url"] = fields.get("url", "")
-                            device_details["Config"]["ReloadTimeout"] = fields.get("ReloadTimeout", "0")
-                            if "Options" in session_data:
-                                device_details["SessionOptions"] = session_data.get("Options", {})
 
                 device_details["OrphanError"] = api.orphan_error_for_uuid(orphans, uuid_val)
 
@@ -2295,7 +2658,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                                     image_zoom=low_zoom,
                                     screen_size=eff_screen,
                                 )
-                                final_low_batt_url = await _process_final_url(hass, low_batt_url)
+                                final_low_batt_url = await _process_final_url(
+                                    hass, low_batt_url, service="battery_guard", tags=(TAG_LOW_BATTERY,)
+                                )
+                                _stop_live_status_panels([uuid_val])
                                 await api.async_set_device_url(uuid_val, final_low_batt_url)
                                 guard_state["low_battery_tablet_alerted"].add(uuid_val)
                         elif battery_tablet_on and (batt_val >= battery_clear_threshold or is_charging):
@@ -2731,21 +3097,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 )
                 every_ticks = _session_refresh_every_ticks_for_profile(profile_now)
                 fetch_session = (session_ticks[target_uuid] % max(1, every_ticks)) == 0
-                details = await api.async_get_device_data(target_uuid, fetch_session=fetch_session)
+                # Row from the shared /api/device/ snapshot; detail GET only when it is incomplete.
+                details = await api.async_get_device_data(
+                    target_uuid, fetch_session=fetch_session, prefer_fleet=True
+                )
                 if not isinstance(details, dict):
                     return {}
                 if not fetch_session:
                     cfg = details.get("Config", {}) if isinstance(details, dict) else {}
                     if not cfg.get("Url"):
-                        session_data = await api.async_get_session_data(target_uuid)
-                        if isinstance(session_data, dict):
-                            backend = session_data.get("Backend", {})
-                            fields = backend.get("Fields", {}) if isinstance(backend, dict) else {}
-                            details.setdefault("Config", {})
-                            details["Config"]["Url"] = fields.get("url", "")
-                            details["Config"]["ReloadTimeout"] = fields.get("ReloadTimeout", "0")
-                            if "Options" in session_data:
-                                details["SessionOptions"] = session_data.get("Options", {})
+                        _apply_session_fields_to_details(
+                            details, await api.async_get_session_data(target_uuid, allow_stale=True)
+                        )
                 config = details.get("Config", {}) if isinstance(details.get("Config"), dict) else {}
                 options = details.get("Options", {}) if isinstance(details.get("Options"), dict) else {}
                 device_name = options.get("Name") or config.get("Name") or f"Device {target_uuid}"
@@ -3414,29 +3777,144 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             notification_id=f"{DOMAIN}_vss_session_diagnostics_{entry.entry_id}",
         )
 
-    async def _service_push_and_fire(
-        device_uuid: str,
-        url: str,
+    try:
+        push_concurrency = max(1, int(entry.options.get(
+            CONF_PUSH_CONCURRENCY,
+            yaml_config.get("push_concurrency", PUSH_CONCURRENCY_DEFAULT),
+        )))
+    except (TypeError, ValueError):
+        push_concurrency = PUSH_CONCURRENCY_DEFAULT
+
+    raster_backend = await hass.async_add_executor_job(
+        find_raster_backend,
+        str(entry.options.get(CONF_RASTER_BACKEND, yaml_config.get("raster_backend", RASTER_BACKEND_NONE))),
+    )
+    try:
+        raster_gray_levels = int(entry.options.get(
+            CONF_RASTER_GRAY_LEVELS,
+            yaml_config.get("raster_gray_levels", RASTER_GRAY_LEVELS_DEFAULT),
+        ))
+    except (TypeError, ValueError):
+        raster_gray_levels = RASTER_GRAY_LEVELS_DEFAULT
+
+    try:
+        graph_statistics_after_hours = float(entry.options.get(
+            CONF_GRAPH_STATISTICS_AFTER_HOURS,
+            yaml_config.get("graph_statistics_after_hours", GRAPH_STATISTICS_AFTER_HOURS_DEFAULT),
+        ))
+    except (TypeError, ValueError):
+        graph_statistics_after_hours = GRAPH_STATISTICS_AFTER_HOURS_DEFAULT
+
+    prefetch = PrefetchScheduler(hass)
+    hass.data[DOMAIN][entry.entry_id]["prefetch"] = prefetch
+
+    @callback
+    def _schedule_prefetch(call: ServiceCall, service_name: str, uuids: list[str], loaders: dict) -> None:
+        """Refresh ``loaders`` shortly before the call's next expected run (prefetch_minutes)."""
+        panel_id = f"{service_name}:{','.join(sorted(normalize_device_uuid(u) for u in uuids))}"
+        prefetch.async_schedule(panel_id, int(call.data.get(ATTR_PREFETCH_MINUTES) or 0) * 60, loaders)
+
+    async def _service_push_batch(
+        pushes: list[tuple[str, str]],
         call: ServiceCall,
         service_name: str,
         *,
         intentional_wake: bool = False,
-    ) -> str:
-        """Battery-aware session URL push + command_result event."""
+    ) -> dict[str, str]:
+        """Battery-aware session URL push to many tablets + command_result events.
+
+        One event per tablet as its push finishes, plus an aggregate event when the
+        call targeted more than one tablet.
+        """
+        if not pushes:
+            return {}
         entry_data = hass.data[DOMAIN][entry.entry_id]
-        result, skipped = await async_push_url_from_service(
+        if service_name != SERVICE_SEND_STATUS_PANEL:
+            # Another screen replaces a live status panel on these tablets.
+            _stop_live_status_panels([device_uuid for device_uuid, _url in pushes])
+
+        def _fire(device_uuid: str, result: str, skipped: bool) -> None:
+            fire_command_result(
+                hass, device_uuid, service_name, result, skipped_wake=skipped
+            )
+
+        results = await async_push_urls_batch(
             api,
             entry_data.get("coordinator"),
             entry_data,
-            device_uuid,
-            url,
+            pushes,
             call.data,
+            concurrency=push_concurrency,
             intentional_wake=intentional_wake,
+            on_result=_fire,
+            pages=_get_publish_store(hass),
         )
-        fire_command_result(
-            hass, device_uuid, service_name, result, skipped_wake=skipped
+        if len(results) > 1:
+            fire_batch_command_result(hass, service_name, results)
+        return {device_uuid: result for device_uuid, (result, _skipped) in results.items()}
+
+    async def _rasterize_content(render_memo: dict, content_url: str, device_uuid: str) -> str:
+        """Content page -> dithered PNG in an image-only page (HTML again on any failure)."""
+        payload = _html_data_uri_payload_segment(content_url)
+        if payload is None:
+            return content_url
+        snapshot = _get_device_snapshot(device_uuid)
+        width, height = device_resolution(
+            snapshot, (snapshot.get("Config") or {}).get("DisplayRotation", "0")
         )
-        return result
+        memo_key = ("raster", content_url, width, height)
+        if memo_key in render_memo:
+            return render_memo[memo_key]
+        page = urllib.parse.unquote(payload)
+        if not is_static_page(page):
+            # Interactive content (to-do toggles, keypads...) must stay HTML.
+            render_memo[memo_key] = content_url
+            return content_url
+        try:
+            png = await hass.async_add_executor_job(raster_backend.render, page, width, height)
+            png = await hass.async_add_executor_job(
+                predither_gray, png, width, height, raster_gray_levels
+            )
+        except Exception as err:
+            _LOGGER.warning("Rasterizing page for %s failed, publishing HTML: %s", device_uuid, err)
+            render_memo[memo_key] = content_url
+            return content_url
+        image_url = await _publish_media(hass, png, "png", "visionect_raster_")
+        wrapped = "data:text/html;charset=utf-8," + urllib.parse.quote(
+            image_page_html(image_url, width, height), safe=""
+        )
+        render_memo[memo_key] = wrapped
+        return wrapped
+
+    async def _finalize_screen_url(
+        render_memo: dict,
+        content_url: str,
+        device_uuid: str,
+        call: ServiceCall,
+    ) -> str:
+        """Interactive layer + publish for one tablet, shared across one service call.
+
+        Tablets whose content, back URL and back-button flag match get the same
+        published URL, so the overlay, hashing and file write run once per group.
+        """
+        back_url = _get_back_url_for_uuid(device_uuid, call.data)
+        add_back = _effective_add_back_button(call, back_url)
+        memo_key = (content_url, back_url, bool(add_back))
+        final_url = render_memo.get(memo_key)
+        if final_url is None:
+            if raster_backend is not None:
+                content_url = await _rasterize_content(render_memo, content_url, device_uuid)
+            interactive_url = await _add_interactive_layer_to_url(
+                hass, content_url, back_url, add_back,
+                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
+                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
+                call.data.get(ATTR_ACTION_WEBHOOK_ID),
+                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
+                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
+            )
+            final_url = await _process_final_url(hass, interactive_url, service=call.service)
+            render_memo[memo_key] = final_url
+        return final_url
 
     async def handle_set_url(call: ServiceCall):
         uuids = await get_uuids_from_call(call)
@@ -3445,6 +3923,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             _LOGGER.error("No URL provided for set_url.")
             return
 
+        pushes: list[tuple[str, str]] = []
         for uuid_val in uuids:
             url_for_uuid = _expand_uuid_placeholder(original_url, uuid_val) or original_url
             final_url = await _process_final_url(hass, url_for_uuid)
@@ -3456,7 +3935,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 fire_command_result(hass, uuid_val, SERVICE_SET_URL, "failure")
             else:
                 final_url = create_simple_cache_buster(final_url)
-                await _service_push_and_fire(uuid_val, final_url, call, SERVICE_SET_URL)
+                pushes.append((uuid_val, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SET_URL)
         await _async_refresh_device_coordinators(uuids)
 
     async def handle_send_text(call: ServiceCall):
@@ -3486,19 +3966,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             0, # image_rotation
             screen_size
         )
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
         for device_uuid in uuids:
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_TEXT)
+            final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_TEXT)
 
     async def handle_send_weather(call: ServiceCall):
         uuids = await get_uuids_from_call(call)
@@ -3509,6 +3982,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry_data_cache = hass.data[DOMAIN][entry.entry_id]
         wants_return = bool(call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN))
         recovery_token = str((entry.options or {}).get(CONF_RECOVERY_PAGE_TOKEN, "")).strip()
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
+        content_by_orientation: dict[str, str] = {}
+        forecasts: tuple | None = None
+        prefetch_loaders = {
+            ("forecast", weather_entity_id, forecast_type): partial(
+                _async_get_forecast, hass, weather_entity_id, forecast_type
+            )
+            for forecast_type in ("daily", "hourly")
+        }
         for device_uuid in uuids:
             if wants_return:
                 await _async_capture_back_target_before_overlay(device_uuid)
@@ -3535,40 +4018,30 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
             cached_url = _screen_cache_get(entry_data_cache, cache_key, cache_ttl_s)
             if cached_url:
-                await _service_push_and_fire(device_uuid, cached_url, call, SERVICE_SEND_WEATHER)
+                pushes.append((device_uuid, cached_url))
                 continue
             weather_state = hass.states.get(weather_entity_id)
             if not weather_state:
                 stale_url = _screen_cache_get_stale(entry_data_cache, cache_key)
                 if stale_url:
-                    await _service_push_and_fire(device_uuid, stale_url, call, SERVICE_SEND_WEATHER)
+                    pushes.append((device_uuid, stale_url))
                 continue
             
-            daily_forecast, hourly_forecast = None, None
-            try:
-                dr = await hass.services.async_call("weather", "get_forecasts", {"entity_id": weather_entity_id, "type": "daily"}, blocking=True, return_response=True)
-                if dr: daily_forecast = dr.get(weather_entity_id, {}).get("forecast", [])
-            except Exception: pass
-            
-            try:
-                hr = await hass.services.async_call("weather", "get_forecasts", {"entity_id": weather_entity_id, "type": "hourly"}, blocking=True, return_response=True)
-                if hr: hourly_forecast = hr.get(weather_entity_id, {}).get("forecast", [])
-            except Exception: pass
-
-            content_url = await create_weather_url(hass, weather_state, daily_forecast, hourly_forecast, layout, orientation, lang, screen_size)
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
+            # Forecasts are fetched once per call, the page rendered once per orientation.
+            content_url = content_by_orientation.get(orientation)
+            if content_url is None:
+                if forecasts is None:
+                    forecasts = tuple(await asyncio.gather(
+                        *(prefetch.async_get(key, loader, default=None) for key, loader in prefetch_loaders.items())
+                    ))
+
+                content_url = await create_weather_url(hass, weather_state, forecasts[0], forecasts[1], layout, orientation, lang, screen_size)
+                content_by_orientation[orientation] = content_url
+            final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
             _screen_cache_put(entry_data_cache, cache_key, final_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_WEATHER)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_WEATHER)
+        _schedule_prefetch(call, SERVICE_SEND_WEATHER, uuids, prefetch_loaders)
 
     async def handle_send_energy_panel(call: ServiceCall):
         uuids = await get_uuids_from_call(call)
@@ -3577,6 +4050,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         screen_size = call.data.get(ATTR_SCREEN_SIZE, "joan6")
         energy_theme = call.data.get(ATTR_ENERGY_THEME, "classic")
         entry_data_cache = hass.data[DOMAIN][entry.entry_id]
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
+        content_by_orientation: dict[str, str] = {}
         for device_uuid in uuids:
             cache_ttl_s = _screen_cache_ttl_for_device(entry_data_cache, SERVICE_SEND_ENERGY_PANEL, device_uuid)
             orientation = str(_get_device_snapshot(device_uuid).get("Config", {}).get("DisplayRotation", "0"))
@@ -3594,22 +4070,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
             cached_url = _screen_cache_get(entry_data_cache, cache_key, cache_ttl_s)
             if cached_url:
-                await _service_push_and_fire(device_uuid, cached_url, call, SERVICE_SEND_ENERGY_PANEL)
+                pushes.append((device_uuid, cached_url))
                 continue
-            content_url = await create_energy_panel_url(hass, entity_states, orientation, lang, screen_size, theme=energy_theme)
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
+            content_url = content_by_orientation.get(orientation)
+            if content_url is None:
+                content_url = await create_energy_panel_url(hass, entity_states, orientation, lang, screen_size, theme=energy_theme)
+                content_by_orientation[orientation] = content_url
+            final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
             _screen_cache_put(entry_data_cache, cache_key, final_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_ENERGY_PANEL)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_ENERGY_PANEL)
 
     async def handle_send_todo_list(call: ServiceCall):
         uuids = await get_uuids_from_call(call)
@@ -3628,6 +4098,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 items = [{'summary': i.get('summary'), 'status': i.get('status'), 'uid': i.get('uid')} for i in raw]
         except Exception: pass
         
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
+        content_by_orientation: dict[str, str] = {}
         for device_uuid in uuids:
             cache_ttl_s = _screen_cache_ttl_for_device(entry_data_cache, SERVICE_SEND_TODO_LIST, device_uuid)
             orientation = str(_get_device_snapshot(device_uuid).get("Config", {}).get("DisplayRotation", "0"))
@@ -3645,22 +4118,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
             cached_url = _screen_cache_get(entry_data_cache, cache_key, cache_ttl_s)
             if cached_url:
-                await _service_push_and_fire(device_uuid, cached_url, call, SERVICE_SEND_TODO_LIST)
+                pushes.append((device_uuid, cached_url))
                 continue
-            content_url = await create_todo_list_url(hass, title, items, lang, orientation, screen_size)
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
+            content_url = content_by_orientation.get(orientation)
+            if content_url is None:
+                content_url = await create_todo_list_url(hass, title, items, lang, orientation, screen_size)
+                content_by_orientation[orientation] = content_url
+            final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
             _screen_cache_put(entry_data_cache, cache_key, final_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_TODO_LIST)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_TODO_LIST)
 
     async def handle_send_rss_feed(call: ServiceCall):
         uuids = await get_uuids_from_call(call)
@@ -3668,16 +4135,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         lang = _get_lang(hass)
         screen_size = call.data.get(ATTR_SCREEN_SIZE, "joan6")
         entry_data_cache = hass.data[DOMAIN][entry.entry_id]
-        
-        def _parse():
-            try:
-                f = feedparser.parse(feed_url)
-                return [{"title": e.title} for e in f.entries[:max_items]]
-            except Exception: return []
-            
-        items = await hass.async_add_executor_job(_parse)
-        content_url = await create_rss_feed_url(hass, title, items, lang, screen_size)
-        
+
+        pushes: list[tuple[str, str]] = []
+        misses: list[tuple[str, str]] = []
+        # Key from call parameters only: cache hits do no network I/O at all.
         for device_uuid in uuids:
             cache_ttl_s = _screen_cache_ttl_for_device(entry_data_cache, SERVICE_SEND_RSS_FEED, device_uuid)
             cache_key = _screen_cache_key(
@@ -3687,36 +4148,75 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                     "feed_url": feed_url,
                     "title": title,
                     "max_items": max_items,
-                    "items": [i.get("title") for i in items],
                     "lang": lang,
                     "screen_size": screen_size,
                 },
             )
             cached_url = _screen_cache_get(entry_data_cache, cache_key, cache_ttl_s)
             if cached_url:
-                await _service_push_and_fire(device_uuid, cached_url, call, SERVICE_SEND_RSS_FEED)
-                continue
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
-            _screen_cache_put(entry_data_cache, cache_key, final_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_RSS_FEED)
+                pushes.append((device_uuid, cached_url))
+            else:
+                misses.append((device_uuid, cache_key))
+
+        if misses:
+            items = await _get_feed_fetcher(hass).async_get_items(feed_url, max_items)
+            content_url = await create_rss_feed_url(hass, title, items, lang, screen_size)
+            render_memo: dict = {}
+            for device_uuid, cache_key in misses:
+                final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
+                _screen_cache_put(entry_data_cache, cache_key, final_url)
+                pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_RSS_FEED)
+        # Warms the feed fetcher itself; the next call reads it from there.
+        _schedule_prefetch(
+            call,
+            SERVICE_SEND_RSS_FEED,
+            uuids,
+            {("rss", feed_url): partial(_get_feed_fetcher(hass).async_get_items, feed_url, max_items)},
+        )
 
     async def handle_send_status_panel(call: ServiceCall):
         uuids = await get_uuids_from_call(call)
+        _stop_live_status_panels(uuids)
+        pushed = await _async_send_status_panel(call, uuids)
+        if not call.data.get(ATTR_LIVE_UPDATE) or not uuids:
+            return
+
+        translations = state_translations(_get_lang(hass))
+
+        def _format_row(entity_id: str):
+            state = hass.states.get(entity_id)
+            return status_panel_row(state, translations) if state else None
+
+        panel = LiveStatusPanel(
+            hass,
+            call.data[ATTR_ENTITIES],
+            uuids,
+            debounce_s=call.data.get(ATTR_DEBOUNCE_SECONDS, STATUS_PANEL_DEBOUNCE_DEFAULT_S),
+            format_row=_format_row,
+            render=_in_render_mode(lambda: _async_send_status_panel(call, list(panel.uuids))),
+            retry_delay=lambda held: max(api.url_guard_remaining_s(u) for u in held),
+        )
+        panel.async_start(pushed=pushed)
+        live_panels = hass.data[DOMAIN][entry.entry_id].setdefault("live_status_panels", {})
+        for device_uuid in uuids:
+            live_panels[normalize_device_uuid(device_uuid)] = panel
+
+    async def _async_send_status_panel(call: ServiceCall, uuids: list[str]) -> dict[str, str]:
         title, entity_ids = call.data.get(ATTR_TITLE, "Status Panel"), call.data[ATTR_ENTITIES]
         lang = _get_lang(hass)
         screen_size = call.data.get(ATTR_SCREEN_SIZE, "joan6")
         entry_data_cache = hass.data[DOMAIN][entry.entry_id]
+        translations = state_translations(lang)
+        # Rows as displayed (name, unit, translated state), the same the live panel compares.
+        entity_rows = {
+            eid: (status_panel_row(state, translations) if (state := hass.states.get(eid)) else None)
+            for eid in entity_ids
+        }
         
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
+        content_by_orientation: dict[str, str] = {}
         for device_uuid in uuids:
             cache_ttl_s = _screen_cache_ttl_for_device(entry_data_cache, SERVICE_SEND_STATUS_PANEL, device_uuid)
             orientation = str(_get_device_snapshot(device_uuid).get("Config", {}).get("DisplayRotation", "0"))
@@ -3726,7 +4226,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 {
                     "title": title,
                     "entity_ids": entity_ids,
-                    "entity_states": {eid: (hass.states.get(eid).state if hass.states.get(eid) else None) for eid in entity_ids},
+                    "entity_rows": entity_rows,
                     "lang": lang,
                     "screen_size": screen_size,
                     "orientation": orientation,
@@ -3734,22 +4234,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
             cached_url = _screen_cache_get(entry_data_cache, cache_key, cache_ttl_s)
             if cached_url:
-                await _service_push_and_fire(device_uuid, cached_url, call, SERVICE_SEND_STATUS_PANEL)
+                pushes.append((device_uuid, cached_url))
                 continue
-            content_url = await create_status_panel_url(hass, title, entity_ids, lang, orientation, screen_size)
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
+            content_url = content_by_orientation.get(orientation)
+            if content_url is None:
+                content_url = await create_status_panel_url(hass, title, entity_ids, lang, orientation, screen_size)
+                content_by_orientation[orientation] = content_url
+            final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
             _screen_cache_put(entry_data_cache, cache_key, final_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_STATUS_PANEL)
+            pushes.append((device_uuid, final_url))
+        return await _service_push_batch(pushes, call, SERVICE_SEND_STATUS_PANEL)
 
     async def handle_set_display_rotation(call: ServiceCall):
         uuids, rotation = await get_uuids_from_call(call), call.data[ATTR_DISPLAY_ROTATION]
@@ -3774,6 +4268,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "background:#fff;width:100%;height:100%;\"></body></html>"
         )
         blank_url = f"data:text/html;charset=utf-8,{urllib.parse.quote(blank_html, safe='')}"
+        _stop_live_status_panels(uuids)
         for uuid_val in uuids:
             ok = await _push_session_data_url(hass, api, uuid_val, blank_url)
             status = "success" if ok else "failure"
@@ -3788,6 +4283,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             f"}}}}catch(e){{console.log(e);}}"
         )
         sleep_url = _build_okular_script_data_url(sleep_script)
+        _stop_live_status_panels(uuids)
         for uuid_val in uuids:
             ok = await _push_session_data_url(hass, api, uuid_val, sleep_url)
             status = "success" if ok else "failure"
@@ -3799,6 +4295,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "try{if(typeof okular!=='undefined'&&okular.Sleep){okular.Sleep(0);}}catch(e){console.log(e);}"
         )
         wake_url = _build_okular_script_data_url(wake_script)
+        _stop_live_status_panels(uuids)
         for uuid_val in uuids:
             page_ok = await _push_session_data_url(hass, api, uuid_val, wake_url)
             api_ok = await api.async_wake_device(uuid_val)
@@ -3818,19 +4315,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
         except Exception: return
         
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
         for device_uuid in uuids:
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_QR_CODE)
+            final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_QR_CODE)
 
     async def handle_send_calendar(call: ServiceCall):
         """Handle send_calendar service with multi-calendar support."""
@@ -3852,65 +4342,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         display_style = call.data.get(ATTR_DISPLAY_STYLE, "modern")
         screen_size = call.data.get(ATTR_SCREEN_SIZE, "joan6")
         
+        prefetch_loaders = {
+            ("calendar_events", cal, duration_days): partial(
+                _async_fetch_calendar_events, hass, cal, duration_days
+            )
+            for cal in calendar_entities
+        }
         # ✅ ZMIANA: Zbierz eventy z WSZYSTKICH kalendarzy RÓWNOLEGLE dla szybkości
-        async def fetch_calendar_events(cal_entity):
-            try:
-                start = datetime.now(timezone.utc)
-                end = start + timedelta(days=duration_days)
-                
-                events_response = await hass.services.async_call(
-                    "calendar", "get_events",
-                    {"entity_id": cal_entity, "start_date_time": start.isoformat(), "end_date_time": end.isoformat()},
-                    blocking=True, return_response=True,
-                )
-                
-                raw_events = events_response.get(cal_entity, {}).get("events", [])
-                
-                def normalize_to_aware_dt(val):
-                    if val is None: return None
-                    dt_out = None
-                    if isinstance(val, dict):
-                        s = val.get('dateTime') or val.get('date')
-                        if s:
-                            try: dt_out = dt_util.parse_datetime(s)
-                            except: pass
-                            if dt_out is None:
-                                try: 
-                                    d = dt_util.parse_date(s)
-                                    if d: dt_out = datetime.combine(d, datetime.min.time())
-                                except: pass
-                    elif isinstance(val, datetime):
-                        dt_out = val
-                    elif isinstance(val, date):
-                        dt_out = datetime.combine(val, datetime.min.time())
-                    elif isinstance(val, str):
-                        try: dt_out = dt_util.parse_datetime(val)
-                        except: pass
-                        if dt_out is None:
-                            try: 
-                                d = dt_util.parse_date(val)
-                                if d: dt_out = datetime.combine(d, datetime.min.time())
-                            except: pass
-                    if dt_out:
-                        if dt_out.tzinfo is None:
-                            dt_out = dt_out.replace(tzinfo=timezone.utc)
-                        return dt_out
-                    return None
-
-                parsed_events = []
-                for event in raw_events:
-                    if not isinstance(event, dict): continue
-                    event['start'] = normalize_to_aware_dt(event.get('start'))
-                    event['end'] = normalize_to_aware_dt(event.get('end'))
-                    if event['start'] is not None:
-                        parsed_events.append(event)
-                _LOGGER.debug(f"Fetched {len(parsed_events)} events from {cal_entity}")
-                return parsed_events
-            except Exception as e:
-                _LOGGER.error(f"Failed to fetch events from {cal_entity}: {e}")
-                return []
-
-        results = await asyncio.gather(*(fetch_calendar_events(cal) for cal in calendar_entities))
+        results = await asyncio.gather(
+            *(prefetch.async_get(key, loader, default=[]) for key, loader in prefetch_loaders.items())
+        )
         
         all_events = []
         for event_list in results:
@@ -3962,26 +4403,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 content_url = create_calendar_url(all_events, style="modern", lang=lang, screen_size=screen_size)
             else:
                 # Pobierz prognozę pogody przez service call (raz dla wszystkich)
-                daily_forecast = []
-                try:
-                    dr = await hass.services.async_call(
-                        "weather", "get_forecasts", 
-                        {"entity_id": weather_entity_id, "type": "daily"}, 
-                        blocking=True, return_response=True
-                    )
-                    if dr and weather_entity_id in dr:
-                        auths = dr[weather_entity_id].get("forecast", [])
-                        daily_forecast = [f for f in auths if f.get("is_daytime", True)][:5]
-                    else:
-                        _LOGGER.warning(f"No forecast data for {weather_entity_id}")
-                except Exception as e:
-                    _LOGGER.warning(f"Failed to get weather forecast: {e}")
+                forecast_key = ("forecast", weather_entity_id, "daily")
+                prefetch_loaders[forecast_key] = partial(_async_get_forecast, hass, weather_entity_id, "daily")
+                auths = await prefetch.async_get(forecast_key, prefetch_loaders[forecast_key], default=None)
+                if auths is None:
+                    _LOGGER.warning(f"No forecast data for {weather_entity_id}")
+                daily_forecast = [f for f in (auths or []) if f.get("is_daytime", True)][:5]
                 
                 # Content URL generated dynamically inside loop
                 content_url = None 
         else:
             content_url = create_calendar_url(all_events, style=display_style, lang=lang, screen_size=screen_size)
         
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
+        # weather_calendar layout depends only on the back-button flag: render once per value.
+        content_by_back_flag: dict[bool, str] = {}
         for device_uuid in uuids:
             back_url = _get_back_url_for_uuid(device_uuid, call.data)
             add_back = _effective_add_back_button(call, back_url)
@@ -3990,12 +4427,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             current_content_url = content_url
             if display_style == "weather_calendar": 
                 if daily_forecast is not None:
-                    max_events = 5
-                    current_content_url = await create_weather_calendar_url(
-                        hass, all_events, weather_entity_id, lang=lang, 
-                        screen_size=screen_size, daily_forecast=daily_forecast,
-                        add_back_button=add_back, max_events=max_events
-                    )
+                    current_content_url = content_by_back_flag.get(bool(add_back))
+                    if current_content_url is None:
+                        max_events = 5
+                        current_content_url = await create_weather_calendar_url(
+                            hass, all_events, weather_entity_id, lang=lang, 
+                            screen_size=screen_size, daily_forecast=daily_forecast,
+                            add_back_button=add_back, max_events=max_events
+                        )
+                        content_by_back_flag[bool(add_back)] = current_content_url
                 else: 
                      # Fallback lub brak forecast - używamy content_url który powinien być ustawiony w fallbacku
                      pass
@@ -4003,17 +4443,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             if current_content_url is None:
                  # Safety fallback
                  current_content_url = create_calendar_url(all_events, style="modern", lang=lang, screen_size=screen_size)
+                 content_url = current_content_url
 
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, current_content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_CALENDAR)
+            final_url = await _finalize_screen_url(render_memo, current_content_url, device_uuid, call)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_CALENDAR)
+        _schedule_prefetch(call, SERVICE_SEND_CALENDAR, uuids, prefetch_loaders)
 
     async def handle_send_camera_snapshot(call: ServiceCall):
         uuids = await get_uuids_from_call(call)
@@ -4032,49 +4467,47 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             image = await async_get_image(hass, camera_entity_id)
         except Exception: return
 
-        www_dir = Path(hass.config.path("www"))
-        await hass.async_add_executor_job(lambda: www_dir.mkdir(parents=True, exist_ok=True))
-        image_path = www_dir / f"visionect_snapshot_{uuid.uuid4().hex}.jpg"
-        await hass.async_add_executor_job(lambda: image_path.write_bytes(image.content))
-        await _async_cleanup_media_files(hass)
-
         screen_size = call.data.get(ATTR_SCREEN_SIZE, "joan6")
-
-        try:
-            base_url = get_internal_url(hass) if get_internal_url else get_url(hass)
-        except Exception: base_url = get_url(hass)
-        image_url = create_simple_cache_buster(f"{base_url}/local/{image_path.name}")
-
         snapshot_layout = "image_only" if not str(caption or "").strip() else "image_top"
-        content_url = create_text_message_url(
-            message=caption,
-            layout=snapshot_layout,
-            image_url=image_url,
-            text_size="24px",
-            image_zoom=image_zoom,
-            image_rotation=image_rotation,
-            screen_size=screen_size,
-        )
-        
+        gray_levels = raster_gray_levels if call.data.get(ATTR_DITHER, False) else None
+        zoom_factor = max(1.0, image_zoom / 100.0)
+
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
+        # The frame is prepared once per tablet resolution, never shipped at camera size.
+        content_by_box: dict[tuple[int, int], str] = {}
         for device_uuid in uuids:
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
+            device_data = _get_device_snapshot(device_uuid)
+            width, height = device_resolution(
+                device_data, (device_data.get("Config") or {}).get("DisplayRotation", "0")
             )
-            final_url = await _process_final_url(hass, interactive_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_CAMERA_SNAPSHOT)
+            if image_rotation in (90, 270):
+                width, height = height, width
+            box = (round(width * zoom_factor), round(height * zoom_factor))
+            if box not in content_by_box:
+                data, ext = await hass.async_add_executor_job(
+                    prepare_snapshot, image.content, box[0], box[1], gray_levels
+                )
+                image_url = await _publish_snapshot(hass, camera_entity_id, box, data, ext)
+                content_by_box[box] = create_text_message_url(
+                    message=caption,
+                    layout=snapshot_layout,
+                    image_url=image_url,
+                    text_size="24px",
+                    image_zoom=image_zoom,
+                    image_rotation=image_rotation,
+                    screen_size=screen_size,
+                )
+            final_url = await _finalize_screen_url(render_memo, content_by_box[box], device_uuid, call)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_CAMERA_SNAPSHOT)
 
     async def handle_send_sensor_graph(call: ServiceCall):
         uuids = await get_uuids_from_call(call)
         entity_ids = call.data[ATTR_ENTITIES]
         duration_hours = call.data.get(ATTR_DURATION_HOURS, 24)
         graph_type = call.data.get(ATTR_GRAPH_TYPE, "line")
+        graph_renderer = call.data.get(ATTR_GRAPH_RENDERER, GRAPH_RENDERER_AUTO)
         show_points = call.data.get(ATTR_SHOW_POINTS, False)
         image_zoom = call.data.get(ATTR_IMAGE_ZOOM, 100)
         image_rotation = int(call.data.get(ATTR_DISPLAY_ROTATION, "0"))
@@ -4082,21 +4515,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         start_time = dt_util.now() - timedelta(hours=duration_hours)
         entry_data_cache = hass.data[DOMAIN][entry.entry_id]
 
+        # matplotlib is imported on the first PNG graph only (never for svg-only setups),
+        # while the recorder is being queried.
+        graph_warm = None
+        if graph_renderer != GRAPH_RENDERER_SVG and not GRAPH_ENGINE.warmed:
+            graph_warm = hass.async_add_executor_job(GRAPH_ENGINE.warm)
 
-        history_data = await get_instance(hass).async_add_executor_job(
-            partial(
-                history.get_significant_states, 
-                hass, 
-                start_time, 
-                entity_ids=entity_ids, 
-                significant_changes_only=False, 
-                include_start_time_state=True
-            )
+        history_data = await async_get_graph_history(
+            hass,
+            entity_ids,
+            start_time,
+            statistics_after_hours=graph_statistics_after_hours,
+            cache=_get_history_cache(hass),
         )
-        
-        www_dir = Path(hass.config.path("www"))
-        await hass.async_add_executor_job(lambda: www_dir.mkdir(parents=True, exist_ok=True))
+        if graph_warm is not None:
+            await graph_warm
+
 
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
+        graph_content_by_orientation: dict[str, str] = {}
         for device_uuid in uuids:
             cache_ttl_s = _screen_cache_ttl_for_device(entry_data_cache, SERVICE_SEND_SENSOR_GRAPH, device_uuid)
             orientation = str(_get_device_snapshot(device_uuid).get("Config", {}).get("DisplayRotation", "0"))
@@ -4107,6 +4545,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                     "entity_ids": entity_ids,
                     "duration_hours": duration_hours,
                     "graph_type": graph_type,
+                    "renderer": graph_renderer,
                     "show_points": show_points,
                     "image_zoom": image_zoom,
                     "image_rotation": image_rotation,
@@ -4116,74 +4555,67 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
             cached_url = _screen_cache_get(entry_data_cache, cache_key, cache_ttl_s)
             if cached_url:
-                await _service_push_and_fire(device_uuid, cached_url, call, SERVICE_SEND_SENSOR_GRAPH)
+                pushes.append((device_uuid, cached_url))
                 continue
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            try:
-                image_bytes = await hass.async_add_executor_job(
-                    _generate_graph_image,
-                    hass,
-                    history_data,
-                    entity_ids,
-                    graph_type,
-                    show_points,
-                    orientation,
-                    screen_size,
-                )
-            except Exception as e:
-                _LOGGER.error(f"Graph generation exception: {e}")
+            # Graph image depends on orientation only: generate once per orientation.
+            content_url = graph_content_by_orientation.get(orientation)
+            if content_url is None:
                 image_bytes = None
-
-            if not image_bytes:
-                if not _check_matplotlib():
-                    _LOGGER.debug(
-                        "send_sensor_graph: matplotlib unavailable, using SVG fallback graph"
-                    )
-                    content_url = create_sensor_graph_svg_data_url(
-                        hass,
-                        history_data,
-                        entity_ids,
-                        orientation,
-                        screen_size,
-                        graph_type,
-                        image_rotation,
-                    ) or f"data:text/html,{urllib.parse.quote('<html><body style=\"display:flex;align-items:center;justify-content:center;height:100vh;font-size:2em;\">No Data (Check Logs)</body></html>')}"
+                if graph_renderer != GRAPH_RENDERER_SVG:
+                    try:
+                        image_bytes = await hass.async_add_executor_job(
+                            _generate_graph_image,
+                            hass,
+                            history_data,
+                            entity_ids,
+                            graph_type,
+                            show_points,
+                            orientation,
+                            screen_size,
+                        )
+                    except Exception as e:
+                        _LOGGER.error(f"Graph generation exception: {e}")
+
+                if not image_bytes:
+                    # SVG renderer never imports matplotlib (short-circuit before the check).
+                    if graph_renderer == GRAPH_RENDERER_SVG or not _check_matplotlib():
+                        _LOGGER.debug(
+                            "send_sensor_graph: rendering SVG graph (renderer=%s)", graph_renderer
+                        )
+                        content_url = create_sensor_graph_svg_data_url(
+                            hass,
+                            history_data,
+                            entity_ids,
+                            orientation,
+                            screen_size,
+                            graph_type,
+                            image_rotation,
+                            show_points,
+                        ) or f"data:text/html,{urllib.parse.quote('<html><body style=\"display:flex;align-items:center;justify-content:center;height:100vh;font-size:2em;\">No Data (Check Logs)</body></html>')}"
+                    else:
+                        data_points_count = sum(len(states) for states in history_data.values()) if history_data else 0
+                        _LOGGER.warning(
+                            "Graph generation returned no data. Entity IDs: %s, Data points found: %s. Check if entities have numeric states.",
+                            entity_ids,
+                            data_points_count,
+                        )
+                        content_url = f"data:text/html,{urllib.parse.quote('<html><body style=\"display:flex;align-items:center;justify-content:center;height:100vh;font-size:2em;\">No Data (Check Logs)</body></html>')}"
                 else:
-                    data_points_count = sum(len(states) for states in history_data.values()) if history_data else 0
-                    _LOGGER.warning(
-                        "Graph generation returned no data. Entity IDs: %s, Data points found: %s. Check if entities have numeric states.",
-                        entity_ids,
-                        data_points_count,
+                    image_url = await _publish_media(hass, image_bytes, "png", "visionect_graph_")
+                    content_url = create_text_message_url(
+                        message="",
+                        layout="image_only",
+                        image_url=image_url,
+                        image_zoom=image_zoom,
+                        image_rotation=image_rotation,
+                        screen_size=screen_size,
                     )
-                    content_url = f"data:text/html,{urllib.parse.quote('<html><body style=\"display:flex;align-items:center;justify-content:center;height:100vh;font-size:2em;\">No Data (Check Logs)</body></html>')}"
-            else:
-                image_path = www_dir / f"visionect_graph_{uuid.uuid4().hex}.png"
-                await hass.async_add_executor_job(lambda: image_path.write_bytes(image_bytes))
-                await _async_cleanup_media_files(hass)
-                try: base_url = get_internal_url(hass) if get_internal_url else get_url(hass)
-                except Exception: base_url = get_url(hass)
-                image_url = f"{base_url}/local/{image_path.name}"
-                content_url = create_text_message_url(
-                    message="",
-                    layout="image_only",
-                    image_url=image_url,
-                    image_zoom=image_zoom,
-                    image_rotation=image_rotation,
-                    screen_size=screen_size,
-                )
+                graph_content_by_orientation[orientation] = content_url
 
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
+            final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
             _screen_cache_put(entry_data_cache, cache_key, final_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_SENSOR_GRAPH)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_SENSOR_GRAPH)
 
     async def handle_clear_web_cache(call: ServiceCall):
         uuids = await get_uuids_from_call(call)
@@ -4215,19 +4647,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             screen_size=screen_size,
         )
         
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
         for device_uuid in uuids:
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_IMAGE_URL)
+            final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_IMAGE_URL)
 
     async def handle_start_slideshow(call: ServiceCall):
         uuids = await get_uuids_from_call(call)
@@ -4258,6 +4683,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             html_doc = f"""<!DOCTYPE html><html><head><meta charset="UTF-8"><style>html,body{{margin:0;height:100%;background:#fff}}#frame{{border:0;width:100%;height:100%;}}</style></head><body><iframe id="frame" referrerpolicy="no-referrer"></iframe><script>(function(){{var urls={js_urls};var idx=0;var loop={loop_js};var sec={int(sec)};function setSrc(){{try{{document.getElementById('frame').src=urls[idx];}}catch(e){{}}}}function next(){{idx++;if(idx>=urls.length){{if(loop)idx=0;else return;}}setSrc();}}setSrc();setInterval(next,Math.max(1,sec)*1000);}})();</script></body></html>"""
             return f"data:text/html,{urllib.parse.quote(html_doc, safe='')}"
         
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
         for device_uuid in uuids:
             entry_data = hass.data[DOMAIN].get(entry.entry_id) or {}
             prefs = entry_data.get("prefs") or {}
@@ -4279,18 +4706,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 p = await _process_final_url(hass, url_for_uuid)
                 processed_urls.append(p)
             content_url = _build_slideshow_data_url(processed_urls, effective_seconds, loop)
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_START_SLIDESHOW)
+            final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_START_SLIDESHOW)
 
     async def handle_health_check_vss_url(call: ServiceCall):
         """Check VSS session health and URL reachability."""
@@ -4502,10 +4920,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         content_url = await create_keypad_url(hass, title, webhook_url, screen_size=screen_size)
         
-        for device_uuid in uuids:
-            interactive_url = await _add_interactive_layer_to_url(hass, content_url, None, False, False, False, None, None, call.data.get(ATTR_AUTO_RETURN_SECONDS, 0))
-            final_url = await _process_final_url(hass, interactive_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_KEYPAD)
+        # Keypad has no per-tablet overlay inputs: publish once for all tablets.
+        interactive_url = await _add_interactive_layer_to_url(hass, content_url, None, False, False, False, None, None, call.data.get(ATTR_AUTO_RETURN_SECONDS, 0))
+        final_url = await _process_final_url(hass, interactive_url)
+        pushes = [(device_uuid, final_url) for device_uuid in uuids]
+        await _service_push_batch(pushes, call, SERVICE_SEND_KEYPAD)
 
     async def handle_send_crypto(call: ServiceCall):
         """Fetch crypto prices from CryptoCompare API (free, no key) and display on Joan."""
@@ -4525,28 +4944,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             return comp_map.get(s_clean, s.strip().upper())
 
         symbols = [_to_symbol(c) for c in coins_input]
-        session = async_get_clientsession(hass)
-
-        # --- Fetch current prices + 24h change ---
-        price_data = {}
-        try:
-            syms_param = ",".join(symbols)
-            price_url = (
-                f"https://min-api.cryptocompare.com/data/pricemultifull"
-                f"?fsyms={syms_param}&tsyms={vs_currency}"
-            )
-            async with session.get(price_url, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-                if resp.status == 200:
-                    data_json = await resp.json()
-                    price_data = data_json.get("RAW", {})
-                else:
-                    _LOGGER.warning("send_crypto: CryptoCompare returned HTTP %s", resp.status)
-        except Exception as exc:
-            _LOGGER.error("send_crypto: price fetch failed: %s", exc)
+        market = _get_market_data(hass)
+
+        # --- Current prices + 24h change (fresh snapshot reused across calls) ---
+        price_data = await market.async_prices(symbols, vs_currency)
+        # --- Sparkline history: all coins concurrently, only new hours fetched ---
+        histories = await market.async_histories(
+            [sym for sym in symbols if (price_data.get(sym) or {}).get("PRICE") is not None],
+            vs_currency,
+            history_hours,
+        )
 
         coins_out = []
         for orig_input, sym in zip(coins_input, symbols):
-            data = price_data.get(sym, {}).get(vs_currency, {})
+            data = price_data.get(sym, {})
             price = data.get("PRICE")
             change = data.get("CHANGEPCT24HOUR")
             high_24h = data.get("HIGHDAY")
@@ -4556,26 +4967,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             if sym in CRYPTO_SYMBOL_MAP:
                 display_name = CRYPTO_SYMBOL_MAP[sym].replace("-", " ").title()
 
-            # --- Fetch sparkline history ---
-            hist_vals = []
-            if history_hours > 0 and price is not None:
-                try:
-                    limit = max(1, history_hours)
-                    hist_url = (
-                        f"https://min-api.cryptocompare.com/data/v2/histohour"
-                        f"?fsym={sym}&tsym={vs_currency}&limit={limit}"
-                    )
-                    async with session.get(hist_url, timeout=aiohttp.ClientTimeout(total=15)) as hr:
-                        if hr.status == 200:
-                            hist_json = await hr.json()
-                            raw_data = hist_json.get("Data", {}).get("Data", [])
-                            raw = [float(item.get("close")) for item in raw_data if item.get("close") is not None]
-                            if len(raw) > 20:
-                                step = max(1, len(raw) // 20)
-                                raw = raw[::step][:20]
-                            hist_vals = raw
-                except Exception:
-                    pass  # sparkline is optional
+            hist_vals = histories.get(sym) or []
+            if len(hist_vals) > 20:
+                step = max(1, len(hist_vals) // 20)
+                hist_vals = hist_vals[::step][:20]
 
             coins_out.append({
                 "name": display_name,
@@ -4595,19 +4990,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         history_label = f"{history_hours}h" if history_hours > 0 else ""
         content_url = await create_crypto_panel_url(hass, coins_out, screen_size, lang, show_header, history_label)
 
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
         for device_uuid in uuids:
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_CRYPTO)
+            final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_CRYPTO)
+
+        async def _warm_market_data() -> None:
+            prices = await market.async_prices(symbols, vs_currency)
+            await market.async_histories([sym for sym in symbols if sym in prices], vs_currency, history_hours)
+
+        # Warms the market data caches; the next call reads them from there.
+        _schedule_prefetch(call, SERVICE_SEND_CRYPTO, uuids, {("crypto", vs_currency, tuple(symbols)): _warm_market_data})
 
 
 
@@ -4639,19 +5034,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         content_url = await create_button_panel_url(hass, title, buttons, screen_size)
         
+        pushes: list[tuple[str, str]] = []
+        render_memo: dict = {}
         for device_uuid in uuids:
-            back_url = _get_back_url_for_uuid(device_uuid, call.data)
-            add_back = _effective_add_back_button(call, back_url)
-            interactive_url = await _add_interactive_layer_to_url(
-                hass, content_url, back_url, add_back,
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_RETURN),
-                call.data.get(ATTR_CLICK_ANYWHERE_TO_ACTION),
-                call.data.get(ATTR_ACTION_WEBHOOK_ID),
-                call.data.get(ATTR_ACTION_WEBHOOK_2_ID),
-                call.data.get(ATTR_AUTO_RETURN_SECONDS, 0)
-            )
-            final_url = await _process_final_url(hass, interactive_url)
-            await _service_push_and_fire(device_uuid, final_url, call, SERVICE_SEND_BUTTON_PANEL)
+            final_url = await _finalize_screen_url(render_memo, content_url, device_uuid, call)
+            pushes.append((device_uuid, final_url))
+        await _service_push_batch(pushes, call, SERVICE_SEND_BUTTON_PANEL)
 
     SAFE_TCLV_NAME_ALIASES = {
         ATTR_HEART_BEAT_INTERVAL: [
@@ -5087,32 +5475,32 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
 
     # Register services
-    hass.services.async_register(DOMAIN, SERVICE_SET_URL, handle_set_url, schema=SERVICE_SET_URL_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_TEXT, handle_send_text, schema=SERVICE_SEND_TEXT_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SET_DISPLAY_ROTATION, handle_set_display_rotation, schema=SERVICE_SET_DISPLAY_ROTATION_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_FORCE_REFRESH, handle_force_refresh, schema=SERVICE_DEVICE_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_CLEAR_DISPLAY, handle_clear_display, schema=SERVICE_DEVICE_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SLEEP_DEVICE, handle_sleep_device, schema=SERVICE_SLEEP_DEVICE_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_WAKE_DEVICE, handle_wake_device, schema=SERVICE_DEVICE_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_QR_CODE, handle_send_qr_code, schema=SERVICE_SEND_QR_CODE_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_CALENDAR, handle_send_calendar, schema=SERVICE_SEND_CALENDAR_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_WEATHER, handle_send_weather, schema=SERVICE_SEND_WEATHER_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_ENERGY_PANEL, handle_send_energy_panel, schema=SERVICE_SEND_ENERGY_PANEL_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_TODO_LIST, handle_send_todo_list, schema=SERVICE_SEND_TODO_LIST_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_CAMERA_SNAPSHOT, handle_send_camera_snapshot, schema=SERVICE_SEND_CAMERA_SNAPSHOT_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_STATUS_PANEL, handle_send_status_panel, schema=SERVICE_SEND_STATUS_PANEL_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_SENSOR_GRAPH, handle_send_sensor_graph, schema=SERVICE_SEND_SENSOR_GRAPH_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_RSS_FEED, handle_send_rss_feed, schema=SERVICE_SEND_RSS_FEED_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_KEYPAD, handle_send_keypad, schema=SERVICE_SEND_KEYPAD_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_CLEAR_WEB_CACHE, handle_clear_web_cache, schema=SERVICE_CLEAR_WEB_CACHE_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_START_SLIDESHOW, handle_start_slideshow, schema=SERVICE_START_SLIDESHOW_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_IMAGE_URL, handle_send_image_url, schema=SERVICE_SEND_IMAGE_URL_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SET_SESSION_OPTIONS, handle_set_session_options, schema=SERVICE_SET_SESSION_OPTIONS_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_BUTTON_PANEL, handle_send_button_panel, schema=SERVICE_SEND_BUTTON_PANEL_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_SEND_CRYPTO, handle_send_crypto, schema=SERVICE_SEND_CRYPTO_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_READ_SAFE_DEVICE_CONFIG, handle_read_safe_device_config, schema=SERVICE_DEVICE_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_APPLY_SAFE_DEVICE_CONFIG, handle_apply_safe_device_config, schema=SERVICE_APPLY_SAFE_DEVICE_CONFIG_SCHEMA)
-    hass.services.async_register(DOMAIN, SERVICE_RESTORE_SAFE_DEVICE_CONFIG, handle_restore_safe_device_config, schema=SERVICE_DEVICE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SET_URL, _in_render_mode(handle_set_url), schema=SERVICE_SET_URL_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_TEXT, _in_render_mode(handle_send_text), schema=SERVICE_SEND_TEXT_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SET_DISPLAY_ROTATION, _in_render_mode(handle_set_display_rotation), schema=SERVICE_SET_DISPLAY_ROTATION_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_FORCE_REFRESH, _in_render_mode(handle_force_refresh), schema=SERVICE_DEVICE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_CLEAR_DISPLAY, _in_render_mode(handle_clear_display), schema=SERVICE_DEVICE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SLEEP_DEVICE, _in_render_mode(handle_sleep_device), schema=SERVICE_SLEEP_DEVICE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_WAKE_DEVICE, _in_render_mode(handle_wake_device), schema=SERVICE_DEVICE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_QR_CODE, _in_render_mode(handle_send_qr_code), schema=SERVICE_SEND_QR_CODE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_CALENDAR, _in_render_mode(handle_send_calendar), schema=SERVICE_SEND_CALENDAR_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_WEATHER, _in_render_mode(handle_send_weather), schema=SERVICE_SEND_WEATHER_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_ENERGY_PANEL, _in_render_mode(handle_send_energy_panel), schema=SERVICE_SEND_ENERGY_PANEL_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_TODO_LIST, _in_render_mode(handle_send_todo_list), schema=SERVICE_SEND_TODO_LIST_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_CAMERA_SNAPSHOT, _in_render_mode(handle_send_camera_snapshot), schema=SERVICE_SEND_CAMERA_SNAPSHOT_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_STATUS_PANEL, _in_render_mode(handle_send_status_panel), schema=SERVICE_SEND_STATUS_PANEL_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_SENSOR_GRAPH, _in_render_mode(handle_send_sensor_graph), schema=SERVICE_SEND_SENSOR_GRAPH_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_RSS_FEED, _in_render_mode(handle_send_rss_feed), schema=SERVICE_SEND_RSS_FEED_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_KEYPAD, _in_render_mode(handle_send_keypad), schema=SERVICE_SEND_KEYPAD_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_CLEAR_WEB_CACHE, _in_render_mode(handle_clear_web_cache), schema=SERVICE_CLEAR_WEB_CACHE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_START_SLIDESHOW, _in_render_mode(handle_start_slideshow), schema=SERVICE_START_SLIDESHOW_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_IMAGE_URL, _in_render_mode(handle_send_image_url), schema=SERVICE_SEND_IMAGE_URL_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SET_SESSION_OPTIONS, _in_render_mode(handle_set_session_options), schema=SERVICE_SET_SESSION_OPTIONS_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_BUTTON_PANEL, _in_render_mode(handle_send_button_panel), schema=SERVICE_SEND_BUTTON_PANEL_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_SEND_CRYPTO, _in_render_mode(handle_send_crypto), schema=SERVICE_SEND_CRYPTO_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_READ_SAFE_DEVICE_CONFIG, _in_render_mode(handle_read_safe_device_config), schema=SERVICE_DEVICE_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_APPLY_SAFE_DEVICE_CONFIG, _in_render_mode(handle_apply_safe_device_config), schema=SERVICE_APPLY_SAFE_DEVICE_CONFIG_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_RESTORE_SAFE_DEVICE_CONFIG, _in_render_mode(handle_restore_safe_device_config), schema=SERVICE_DEVICE_SCHEMA)
 
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -5139,6 +5527,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         entry_data = hass.data.get(DOMAIN, {}).get(entry.entry_id) or {}
+        for panel in set((entry_data.get("live_status_panels") or {}).values()):
+            panel.async_stop()
+        if entry_data.get("prefetch") is not None:
+            entry_data["prefetch"].async_stop()
+        if entry_data.get("api") is not None:
+            await entry_data["api"].async_close()
         guard_persist = entry_data.get("guard_persist")
         if guard_persist is not None:
             try:
@@ -1,21 +1,24 @@
 import logging
 import asyncio
 import ipaddress
-import functools
 import time
 import json
 import base64
+import copy
 import hmac
 import hashlib
 import wsgiref.handlers
 import random
+import re
 from typing import Optional, Dict, List, Any
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
-import requests
-from requests.auth import HTTPBasicAuth
-from requests.exceptions import ConnectionError, RequestException, Timeout
+import aiohttp
 from homeassistant.components import persistent_notification
+from homeassistant.helpers.aiohttp_client import (
+    async_create_clientsession,
+    async_get_clientsession,
+)
 
 from .const import (
     IP_UNKNOWN, BATTERY_VOLTAGE_DIVIDER, API_PING, API_DEVICES,
@@ -26,17 +29,35 @@ from .const import (
     API_TCLV_LIST, API_TCLV_PARAM, TCLV_SLEEP_MODE_ID, API_SCREENSHOT,
     API_LIVE_IMAGE, API_DEVICE_STATUS,
 )
+from .cache import LruTtlCache
 
 _LOGGER = logging.getLogger(__name__)
 
+# Per-attempt timeout for a single VSS HTTP call (connect + response body).
+REQUEST_TIMEOUT_S = 15
+
+# Device UUID in session/device endpoints (single-device reads and writes).
+_ENDPOINT_UUID_RE = re.compile(r"^/api/(?:session|device|devicetclv|cmd/Param|devicestatus)/([^/?]+)")
+
+# Byte budgets for in-memory caches (HA often runs on small boxes).
+SESSION_CACHE_MAX_BYTES = 2 * 1024 * 1024
+# Expired session data younger than TTL + this window is served while a refresh runs.
+SESSION_CACHE_STALE_S = 900
+SCREENSHOT_CACHE_MAX_BYTES = 8 * 1024 * 1024
+_DEVICES_KEY = "all"
+
 class VisionectAPI:
-    """Class for communicating with the Visionect API using requests."""
+    """Class for communicating with the Visionect API over aiohttp."""
 
     def __init__(self, hass, api_url: str, username: str = None, password: str = None,
                  api_key: str = None, api_secret: str = None):
         """Initialize the API."""
         self.hass = hass
-        self.session = requests.Session()
+        # aiohttp session is resolved lazily (HA shared session, or a cookie session for login).
+        self._http_session: aiohttp.ClientSession | None = None
+        # True when _http_session is our own cookie session, not HA's shared one.
+        self._owns_http_session = False
+        self._basic_auth: aiohttp.BasicAuth | None = None
 
         # Normalize base URL and ensure default Visionect port 8081 if missing
         url = (api_url or "").strip()
@@ -70,23 +91,48 @@ class VisionectAPI:
         self.authenticated_by = None
 
         # Cache for session data to reduce API calls (session data rarely changes)
-        self._session_cache = {}
-        self._session_cache_ttl = 300  # 5 minutes cache TTL
+        self._session_cache = LruTtlCache(
+            "session",
+            ttl_s=300,
+            max_entries=256,
+            max_bytes=SESSION_CACHE_MAX_BYTES,
+            stale_s=SESSION_CACHE_STALE_S,
+            task_factory=hass.async_create_background_task,
+        )
 
         # Cache for device list and orphans (rarely change)
-        self._devices_cache = None
-        self._devices_cache_time = 0
-        self._devices_cache_ttl = 60  # 1 minute cache for device list
-        self._orphans_cache: dict[bool, dict[str, str]] = {}
-        self._orphans_cache_time: dict[bool, float] = {}
-        self._orphans_cache_ttl = 60  # 1 minute cache for orphans
+        self._devices_cache = LruTtlCache("devices", ttl_s=60, max_entries=1)
+        # Keys: "problems" (GET /api/orphans) and "all" (?all=true, includes deferred)
+        self._orphans_cache = LruTtlCache("orphans", ttl_s=60, max_entries=2)
+        # Single-flight: identical concurrent GETs share one in-flight request.
+        self._inflight_gets: dict[tuple[str, int], asyncio.Future] = {}
+        # Bumped around every write to a device/session: GETs started before a write
+        # are never joined by reads issued after it.
+        self._write_generation: dict[str, int] = {}
+        self._request_metrics: dict[str, int] = {
+            "get_issued": 0,
+            "get_coalesced": 0,
+        }
+        # Fleet snapshot: /api/device/ rows indexed by UUID, shared by all device coordinators.
+        # Per-device detail GETs are only needed when a row lacks fields the entities use.
+        self._fleet_index: dict[str, dict] = {}
+        self._fleet_index_time = 0.0
+        self._fleet_metrics: dict[str, int] = {
+            "fleet_list_fetches": 0,
+            "fleet_rows_used": 0,
+            "detail_fetches": 0,
+        }
         # Recently written session URLs (avoid repeated writes that do not change content)
-        self._recent_session_url_write: dict[str, tuple[str, float]] = {}
+        # uuid -> (url, monotonic write time); a day is far beyond any guard interval.
+        self._recent_session_url_write = LruTtlCache("url_writes", ttl_s=86400, max_entries=256)
         self._session_url_min_interval_s = 15.0
         # Battery guard: minimum spacing between different URL writes per device.
         # This protects e-ink tablets from excessive refresh churn caused by frequent automations.
         self._session_url_change_guard_s = 60.0
         self._device_refresh_profile: dict[str, str] = {}
+        # Last async_set_device_url outcome per device (put_success, skip_duplicate,
+        # skip_guard, skip_unchanged, failure) so parallel pushes can be told apart.
+        self._last_url_write_outcome: dict[str, str] = {}
         self._battery_guard_metrics: dict[str, int] = {
             "url_write_attempts": 0,
             "url_write_put_success": 0,
@@ -95,8 +141,10 @@ class VisionectAPI:
             "url_write_skip_unchanged": 0,
         }
         # Screenshot preview throttling (HA camera): reduce VSS /device/.../cached.png churn.
-        self._screenshot_last_mono: dict[str, float] = {}
-        self._screenshot_last_bytes: dict[str, bytes] = {}
+        # Entry age doubles as the throttle clock; the last image is the fallback on errors.
+        self._screenshot_cache = LruTtlCache(
+            "screenshots", ttl_s=3600, max_entries=64, max_bytes=SCREENSHOT_CACHE_MAX_BYTES
+        )
 
     def set_battery_guard_interval(self, seconds: int | float) -> None:
         """Update minimum spacing between different URL writes per device."""
@@ -116,24 +164,47 @@ class VisionectAPI:
         """Update API cache TTL values at runtime."""
         if session_cache_ttl_s is not None:
             try:
-                self._session_cache_ttl = max(60, int(float(session_cache_ttl_s)))
+                self._session_cache.set_ttl(max(60, int(float(session_cache_ttl_s))))
             except (TypeError, ValueError):
                 pass
         if devices_cache_ttl_s is not None:
             try:
-                self._devices_cache_ttl = max(15, int(float(devices_cache_ttl_s)))
+                self._devices_cache.set_ttl(max(15, int(float(devices_cache_ttl_s))))
             except (TypeError, ValueError):
                 pass
         if orphans_cache_ttl_s is not None:
             try:
-                self._orphans_cache_ttl = max(15, int(float(orphans_cache_ttl_s)))
+                self._orphans_cache.set_ttl(max(15, int(float(orphans_cache_ttl_s))))
             except (TypeError, ValueError):
                 pass
 
+    def get_cache_stats(self) -> dict[str, dict]:
+        """Return hit/miss/eviction counters and sizes of the in-memory caches."""
+        return {
+            cache.name: cache.stats()
+            for cache in (
+                self._session_cache,
+                self._devices_cache,
+                self._orphans_cache,
+                self._recent_session_url_write,
+                self._screenshot_cache,
+            )
+        }
+
+    async def async_close(self) -> None:
+        """Stop background work bound to this client and close its own session (config entry unload)."""
+        for cache in (self._session_cache, self._devices_cache, self._orphans_cache, self._screenshot_cache):
+            cache.close()
+        await self._async_close_http_session()
+
     def get_battery_guard_metrics(self) -> dict[str, int]:
         """Return copy of URL write guard metrics."""
         return dict(self._battery_guard_metrics)
 
+    def get_last_url_write_outcome(self, uuid: str) -> str | None:
+        """Outcome of the most recent async_set_device_url call for a device."""
+        return self._last_url_write_outcome.get(self._normalize_uuid(uuid))
+
     def set_device_refresh_profile(self, uuid: str, profile: str) -> None:
         """Set per-device adaptive refresh profile used by URL write guard."""
         nu = self._normalize_uuid(uuid)
@@ -161,6 +232,14 @@ class VisionectAPI:
             return max(5.0, min(base, 10.0))
         return base
 
+    def url_guard_remaining_s(self, uuid: str) -> float:
+        """Seconds until the battery guard lets a different URL through for ``uuid`` (0 = now)."""
+        nu = self._normalize_uuid(uuid)
+        recent = self._recent_session_url_write.get(nu)
+        if not recent:
+            return 0.0
+        return max(0.0, self._device_guard_interval(nu) - (time.monotonic() - recent[1]))
+
     @staticmethod
     def _normalize_url_for_battery_guard(url: str) -> str:
         """Ignore ?cb= cache-busters when deciding if URL changed (saves e-ink refreshes)."""
@@ -198,9 +277,102 @@ class VisionectAPI:
             "Authorization": auth,
         }
 
-    def _execute_request(self, method, endpoint, silent=False, **kwargs):
-        """Executes a synchronous HTTP request with improved error handling and exponential backoff."""
+    def _get_http_session(self) -> aiohttp.ClientSession:
+        """Return the aiohttp session used for VSS calls.
+
+        HMAC / API-key auth reuses Home Assistant's shared client session. Username/password
+        login relies on a session cookie, so it gets a dedicated session with its own jar
+        (``unsafe=True`` because VSS is usually addressed by bare IP).
+        """
+        if self._http_session is not None:
+            return self._http_session
+        if self.authenticated_by == "credentials" or (
+            self.username and self.password and not (self.api_key and self.api_secret)
+        ):
+            self._http_session = async_create_clientsession(
+                self.hass, cookie_jar=aiohttp.CookieJar(unsafe=True)
+            )
+            self._owns_http_session = True
+        else:
+            self._http_session = async_get_clientsession(self.hass)
+            self._owns_http_session = False
+        return self._http_session
+
+    async def _async_close_http_session(self) -> None:
+        """Drop the current session, closing it only when it is our dedicated one."""
+        session, self._http_session = self._http_session, None
+        if session is not None and self._owns_http_session and not session.closed:
+            await session.close()
+        self._owns_http_session = False
+
+    @staticmethod
+    def _endpoint_uuid(endpoint: str) -> str | None:
+        match = _ENDPOINT_UUID_RE.match(endpoint if endpoint.startswith("/") else "/" + endpoint)
+        return match.group(1).lower() if match else None
+
+    def _note_write(self, uuids: set[str]) -> None:
+        """Invalidate reads of ``uuids``: later GETs neither join older ones nor hit the cache."""
+        for uuid in uuids:
+            self._write_generation[uuid] = self._write_generation.get(uuid, 0) + 1
+            self._session_cache.pop(uuid)
+
+    async def _request(self, method, endpoint, silent=False, *, share=True, **kwargs):
+        """Send a request to VSS; identical concurrent GETs share one in-flight call.
+
+        Callers often mutate the decoded JSON, so every waiter of a shared GET
+        receives its own copy of dict/list payloads. A write to a device or session
+        starts a new generation for that UUID, so GETs issued after it never reuse
+        a response read before it. ``share=False`` always sends its own GET.
+        """
+        if str(method).lower() != "get":
+            written = {self._endpoint_uuid(endpoint)}
+            payload = kwargs.get("json")
+            if isinstance(payload, list):
+                # Batch endpoints (restart, reboot) take a list of UUIDs.
+                written.update(self._normalize_uuid(u) for u in payload if isinstance(u, str))
+            written.discard(None)
+            self._note_write(written)
+            try:
+                return await self._send_request(method, endpoint, silent, **kwargs)
+            finally:
+                # Reads started while the write was in flight are not reused either.
+                self._note_write(written)
+        if kwargs or not share:
+            return await self._send_request(method, endpoint, silent, **kwargs)
+
+        path = endpoint if endpoint.startswith("/") else "/" + endpoint
+        uuid = self._endpoint_uuid(path)
+        key = (path, self._write_generation.get(uuid, 0) if uuid else 0)
+        inflight = self._inflight_gets.get(key)
+        if inflight is None:
+            self._request_metrics["get_issued"] += 1
+            inflight = asyncio.ensure_future(self._send_request(method, path, silent))
+            self._inflight_gets[key] = inflight
+
+            def _release(fut: asyncio.Future, k: tuple[str, int] = key) -> None:
+                if self._inflight_gets.get(k) is fut:
+                    del self._inflight_gets[k]
+
+            inflight.add_done_callback(_release)
+        else:
+            self._request_metrics["get_coalesced"] += 1
+            _LOGGER.debug("Joining in-flight GET %s", path)
+
+        # shield: one caller being cancelled must not cancel the request for the others
+        result = await asyncio.shield(inflight)
+        if isinstance(result, (dict, list)):
+            return copy.deepcopy(result)
+        return result
+
+    def get_request_metrics(self) -> dict[str, int]:
+        """Return copy of GET single-flight counters (issued vs coalesced)."""
+        return dict(self._request_metrics)
+
+    async def _send_request(self, method, endpoint, silent=False, **kwargs):
+        """Send a request to VSS over aiohttp with exponential backoff on network errors."""
         headers = kwargs.pop("headers", {}) or {}
+        allow_redirects = kwargs.pop("allow_redirects", True)
+        auth = self._basic_auth
         retry_count = 0
 
         # Upewniamy się tylko, że ścieżka zaczyna się od ukośnika
@@ -209,91 +381,91 @@ class VisionectAPI:
 
         # Apply HMAC auth if configured
         if self.authenticated_by == "api_key_hmac" and self.api_key and self.api_secret:
-            json_body = None
             if "json" in kwargs:
-                try:
-                    payload = kwargs.pop("json")
-                except Exception:
-                    payload = None
-                json_body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
-                kwargs["data"] = json_body
-
-            hmac_headers = self._build_hmac_headers(method, endpoint)
-            self.session.auth = None
-            self.session.cookies.clear()
-            headers = {**hmac_headers, **headers}
-
+                payload = kwargs.pop("json")
+                kwargs["data"] = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+            headers = {**self._build_hmac_headers(method, endpoint), **headers}
+            auth = None
             # Do not follow redirects for HMAC-signed requests
-            kwargs.setdefault("allow_redirects", False)
+            allow_redirects = False
 
         url = f"{self.base_url}{endpoint}"
-        
+        try:
+            session = self._get_http_session()
+        except Exception as e:
+            if not silent:
+                _LOGGER.error(f"Could not create HTTP session for {url}: {e}")
+            return None
+
         while retry_count < MAX_RETRY_ATTEMPTS:
             try:
-                response = self.session.request(method, url, timeout=15, headers=headers, **kwargs)
-                
-                # Uważamy 3xx jako błąd autoryzacji
-                if 300 <= response.status_code < 400:
-                    location = response.headers.get("Location", "unknown")
-                    if not silent:
-                        _LOGGER.warning(
-                            f"Got redirect {response.status_code} from {url} to {location} – likely auth failure"
-                        )
-                    return None
-                    
-                if response.status_code >= 400:
-                    error_msg = (response.text or "").strip()[:500]
-                    if not silent:
-                        _LOGGER.error(
-                            "HTTP Error %s from %s: %s",
-                            response.status_code,
-                            url,
-                            error_msg or "(empty body)",
-                        )
-                    elif response.status_code == 400:
-                        _LOGGER.debug(
-                            "HTTP 400 from %s: %s",
-                            url,
-                            error_msg or "(empty body)",
-                        )
-                response.raise_for_status()
-                
-                if response.status_code == 204:
-                    return True
-                
-                content_type = response.headers.get('Content-Type', '')
-                if 'application/json' in content_type:
-                    return response.json()
-                if 'image/' in content_type:
-                    return response.content
-                return response.text
-                
-            except (ConnectionError, Timeout) as e:
+                async with session.request(
+                    method.upper(),
+                    url,
+                    headers=headers,
+                    auth=auth,
+                    allow_redirects=allow_redirects,
+                    timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_S),
+                    **kwargs,
+                ) as response:
+                    # Uważamy 3xx jako błąd autoryzacji
+                    if 300 <= response.status < 400:
+                        location = response.headers.get("Location", "unknown")
+                        if not silent:
+                            _LOGGER.warning(
+                                f"Got redirect {response.status} from {url} to {location} – likely auth failure"
+                            )
+                        return None
+
+                    if response.status >= 400:
+                        error_msg = (await response.text(errors="replace") or "").strip()[:500]
+                        if not silent:
+                            _LOGGER.error(
+                                "HTTP Error %s from %s: %s",
+                                response.status,
+                                url,
+                                error_msg or "(empty body)",
+                            )
+                        elif response.status == 400:
+                            _LOGGER.debug(
+                                "HTTP 400 from %s: %s",
+                                url,
+                                error_msg or "(empty body)",
+                            )
+                        return None
+
+                    if response.status == 204:
+                        return True
+
+                    content_type = response.headers.get("Content-Type", "")
+                    if "application/json" in content_type:
+                        return await response.json(content_type=None)
+                    if "image/" in content_type:
+                        return await response.read()
+                    return await response.text(errors="replace")
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
                 retry_count += 1
                 if not silent:
-                    _LOGGER.warning(f"{e.__class__.__name__} to {url} (attempt {retry_count}/{MAX_RETRY_ATTEMPTS}): {e}")
+                    _LOGGER.warning(
+                        f"{e.__class__.__name__} to {url} (attempt {retry_count}/{MAX_RETRY_ATTEMPTS}): {e}"
+                    )
                 if retry_count >= MAX_RETRY_ATTEMPTS:
                     if not silent:
                         _LOGGER.error(f"Failed to connect to {url} after {MAX_RETRY_ATTEMPTS} attempts")
                     return None
                 sleep_s = min(2 ** (retry_count - 1), 60) + random.uniform(0, 1)
-                time.sleep(sleep_s)
-            except RequestException as e:
+                await asyncio.sleep(sleep_s)
+            except (aiohttp.ClientError, ValueError) as e:
                 if not silent:
                     _LOGGER.error(f"Request error to {url}: {e}")
                 return None
-        
-        return None
+            except Exception as e:
+                if not silent:
+                    _LOGGER.error(f"Unexpected error in async request: {e}")
+                return None
 
-    async def _request(self, method, endpoint, silent=False, **kwargs):
-        """Asynchronous wrapper for _execute_request."""
-        try:
-            func = functools.partial(self._execute_request, method, endpoint, silent=silent, **kwargs)
-            return await self.hass.async_add_executor_job(func)
-        except Exception as e:
-            if not silent:
-                _LOGGER.error(f"Unexpected error in async request: {e}")
-            return None
+        return None
 
     def validate_image_url(self, url: str) -> bool:
         """Checks if the URL contains a supported image format."""
@@ -314,43 +486,61 @@ class VisionectAPI:
             self.authenticated_by = prev_mode
             
             _LOGGER.debug("HMAC didn't work, trying BasicAuth with API keys...")
-            self.session.auth = HTTPBasicAuth(self.api_key, self.api_secret)
+            self._basic_auth = aiohttp.BasicAuth(self.api_key, self.api_secret)
             if await self._request("get", API_PING, silent=True) is not None:
                 self.authenticated_by = "api_key"
                 _LOGGER.info("API key authentication successful with BasicAuth.")
                 return True
-            self.session.auth = None
+            self._basic_auth = None
 
         if self.username and self.password:
             _LOGGER.debug("Testing authentication with username and password...")
             login_url = f"{self.base_url}/login"
             data = {'username': self.username, 'password': self.password}
             try:
-                def _login():
-                    response = self.session.post(login_url, data=data, allow_redirects=False, timeout=10)
-                    return response.status_code in [200, 302]
-
-                if await self.hass.async_add_executor_job(_login):
-                    self.authenticated_by = "credentials"
+                # Login cookie must live in a dedicated jar, not HA's shared session.
+                await self._async_close_http_session()
+                self.authenticated_by = "credentials"
+                session = self._get_http_session()
+                async with session.post(
+                    login_url,
+                    data=data,
+                    allow_redirects=False,
+                    timeout=aiohttp.ClientTimeout(total=10),
+                ) as response:
+                    login_ok = response.status in [200, 302]
+
+                if login_ok:
                     _LOGGER.info("Login credential authentication successful.")
                     return True
                 else:
+                    self.authenticated_by = None
                     _LOGGER.error("Login error, server did not accept credentials.")
             except Exception as e:
+                self.authenticated_by = None
                 _LOGGER.error(f"Communication error during login: {e}")
 
         _LOGGER.error("Authentication failed with all available methods.")
         return False
 
-    async def async_get_device_data(self, uuid: str, fetch_session: bool = True) -> Optional[Dict]:
+    async def async_get_device_data(
+        self, uuid: str, fetch_session: bool = True, prefer_fleet: bool = False
+    ) -> Optional[Dict]:
         """Fetches detailed device data and merges it with session data.
 
         Args:
             uuid: Device UUID
             fetch_session: Whether to fetch session data (default True). Set to False for status-only updates.
+            prefer_fleet: Use the row from the shared /api/device/ snapshot when it is complete,
+                falling back to GET /api/device/{uuid} otherwise.
         """
         normalized_uuid = self._normalize_uuid(uuid)
-        device_data = await self._request("get", API_DEVICE_DETAIL.format(uuid=normalized_uuid))
+        device_data = None
+        if prefer_fleet:
+            device_data = await self.async_get_fleet_row(normalized_uuid)
+        if device_data is None:
+            self._fleet_metrics["detail_fetches"] += 1
+            device_data = await self._request("get", API_DEVICE_DETAIL.format(uuid=normalized_uuid))
         if not device_data or not isinstance(device_data, dict):
             return None
 
@@ -361,7 +551,7 @@ class VisionectAPI:
 
         # Only fetch session data if requested (session data rarely changes)
         if fetch_session:
-            session_data = await self._get_cached_session_data(normalized_uuid)
+            session_data = await self._get_cached_session_data(normalized_uuid, allow_stale=True)
 
             if session_data:
                 if "Backend" in session_data and "Fields" in session_data["Backend"]:
@@ -392,76 +582,123 @@ class VisionectAPI:
 
         return device_data
 
-    async def async_get_session_data(self, uuid: str) -> Optional[Dict]:
-        """Fetches device session data using the detailed session endpoint."""
-        return await self._get_cached_session_data(self._normalize_uuid(uuid))
+    async def async_get_session_data(self, uuid: str, allow_stale: bool = False) -> Optional[Dict]:
+        """Fetches device session data using the detailed session endpoint.
+
+        allow_stale=True (read-only callers such as coordinators): expired-but-recent
+        data is returned at once and refreshed in the background. Writers keep the
+        default so they never build a PUT on top of stale session fields.
+        """
+        return await self._get_cached_session_data(self._normalize_uuid(uuid), allow_stale=allow_stale)
 
-    async def _get_cached_session_data(self, uuid: str) -> Optional[Dict]:
+    async def _get_cached_session_data(self, uuid: str, allow_stale: bool = False) -> Optional[Dict]:
         """Fetches device session data with caching to reduce API calls."""
         normalized_uuid = self._normalize_uuid(uuid)
-        current_time = time.time()
+
+        if allow_stale:
+            # Invalidated entries (after writes) are gone from the cache, so this is a fresh read.
+            return await self._session_cache.async_get_or_load(
+                normalized_uuid, lambda: self._async_read_session(normalized_uuid)
+            )
 
         # Check cache
-        if normalized_uuid in self._session_cache:
-            cached_data, cached_time = self._session_cache[normalized_uuid]
-            if current_time - cached_time < self._session_cache_ttl:
-                _LOGGER.debug("Using cached session data for %s", normalized_uuid)
-                return cached_data
+        cached_data = self._session_cache.get(normalized_uuid)
+        if cached_data is not None:
+            _LOGGER.debug("Using cached session data for %s", normalized_uuid)
+            return cached_data
 
         # Fetch fresh data
-        session_data = await self._request("get", API_SESSION_DETAIL.format(uuid=normalized_uuid))
+        session_data = await self._async_read_session(normalized_uuid)
 
         # Update cache
-        if session_data and isinstance(session_data, dict):
-            self._session_cache[normalized_uuid] = (session_data, current_time)
-            # Clean old cache entries periodically
-            if len(self._session_cache) > 50:
-                self._clean_session_cache(current_time)
+        if session_data is not None:
+            self._session_cache.set(normalized_uuid, session_data)
 
         return session_data
 
-    def _clean_session_cache(self, current_time: float) -> None:
-        """Remove expired entries from session cache."""
-        expired_keys = [
-            uuid for uuid, (_, cached_time) in self._session_cache.items()
-            if current_time - cached_time >= self._session_cache_ttl
-        ]
-        for key in expired_keys:
-            del self._session_cache[key]
-        if expired_keys:
-            _LOGGER.debug("Cleaned %d expired session cache entries", len(expired_keys))
+    async def _async_read_session(self, normalized_uuid: str, *, share: bool = True) -> Optional[Dict]:
+        """GET the session; read again (unshared) when a write to it landed meanwhile."""
+        endpoint = API_SESSION_DETAIL.format(uuid=normalized_uuid)
+        generation = self._write_generation.get(normalized_uuid, 0)
+        data = await self._request("get", endpoint, share=share)
+        if self._write_generation.get(normalized_uuid, 0) != generation:
+            data = await self._request("get", endpoint, share=False)
+        return data if data and isinstance(data, dict) else None
 
     def _invalidate_session_cache(self, uuid: str) -> None:
         """Invalidate cache entry for a specific device after session modification."""
         normalized_uuid = self._normalize_uuid(uuid)
-        if normalized_uuid in self._session_cache:
-            del self._session_cache[normalized_uuid]
+        if self._session_cache.pop(normalized_uuid) is not None:
             _LOGGER.debug("Invalidated session cache for %s", normalized_uuid)
 
     async def async_get_all_devices(self) -> Optional[List[Dict]]:
         """Fetches all devices with caching to reduce API calls."""
-        current_time = time.time()
-
         # Check cache
-        if self._devices_cache is not None and (current_time - self._devices_cache_time) < self._devices_cache_ttl:
+        cached = self._devices_cache.get(_DEVICES_KEY)
+        if cached is not None:
             _LOGGER.debug("Using cached device list")
-            return self._devices_cache
+            return cached
 
         # Fetch fresh data
         devices = await self._request("get", API_DEVICES)
 
         # Update cache
         if devices is not None:
-            self._devices_cache = devices
-            self._devices_cache_time = current_time
+            self._devices_cache.set(_DEVICES_KEY, devices)
 
         return devices
 
     def _invalidate_devices_cache(self) -> None:
         """Invalidate device list cache after device modification."""
-        self._devices_cache = None
+        self._devices_cache.pop(_DEVICES_KEY)
+        self._fleet_index = {}
+        self._fleet_index_time = 0.0
         _LOGGER.debug("Invalidated device list cache")
 
+    @staticmethod
+    def _is_complete_fleet_row(row) -> bool:
+        """True when a /api/device/ row carries everything the entities read from the detail GET."""
+        return (
+            isinstance(row, dict)
+            and isinstance(row.get("Status"), dict)
+            and isinstance(row.get("Options"), dict)
+            and "State" in row
+            and "Displays" in row
+        )
+
+    async def async_get_fleet_snapshot(self) -> dict[str, dict]:
+        """Return /api/device/ rows indexed by normalized UUID.
+
+        The list is fetched at most once per device-list cache TTL; every per-device
+        coordinator tick inside that window reads from the same snapshot.
+        """
+        devices = await self.async_get_all_devices()
+        if devices is None:
+            return self._fleet_index
+        list_time = self._devices_cache.stored_at(_DEVICES_KEY) or 0.0
+        if self._fleet_index_time != list_time or not self._fleet_index:
+            index: dict[str, dict] = {}
+            for row in devices if isinstance(devices, list) else []:
+                if isinstance(row, dict) and row.get("Uuid"):
+                    index[self._normalize_uuid(str(row["Uuid"]))] = row
+            self._fleet_index = index
+            self._fleet_index_time = list_time
+            self._fleet_metrics["fleet_list_fetches"] += 1
+        return self._fleet_index
+
+    async def async_get_fleet_row(self, uuid: str) -> Optional[Dict]:
+        """Copy of the fleet snapshot row for one device, or None when missing/incomplete."""
+        row = (await self.async_get_fleet_snapshot()).get(self._normalize_uuid(uuid))
+        if not self._is_complete_fleet_row(row):
+            return None
+        self._fleet_metrics["fleet_rows_used"] += 1
+        # Callers mutate the result (Config/Status normalisation), keep the snapshot pristine.
+        return copy.deepcopy(row)
+
+    def get_fleet_metrics(self) -> dict[str, int]:
+        """Return copy of fleet snapshot counters (list fetches vs per-device detail GETs)."""
+        return dict(self._fleet_metrics)
+
     async def _post_command(self, endpoint_template: str, uuid: str, command_name: str, silent: bool = False) -> bool:
         normalized_uuid = self._normalize_uuid(uuid)
         response = await self._request("post", endpoint_template.format(uuid=normalized_uuid), silent=silent)
@@ -576,6 +813,7 @@ class VisionectAPI:
         normalized_uuid = self._normalize_uuid(uuid)
         if not self._is_valid_session_url(url):
             _LOGGER.error("Invalid session URL for %s: %s", normalized_uuid, url)
+            self._last_url_write_outcome[normalized_uuid] = "failure"
             return False
         self._battery_guard_metrics["url_write_attempts"] += 1
 
@@ -593,6 +831,7 @@ class VisionectAPI:
             recent_norm = self._normalize_url_for_battery_guard(recent_url)
             if url_norm == recent_norm and (now_m - recent_ts) < self._session_url_min_interval_s:
                 self._battery_guard_metrics["url_write_skip_duplicate"] += 1
+                self._last_url_write_outcome[normalized_uuid] = "skip_duplicate"
                 _LOGGER.debug(
                     "Skipping duplicate URL write for %s (%.1fs since last write).",
                     normalized_uuid,
@@ -606,6 +845,7 @@ class VisionectAPI:
                 and (now_m - recent_ts) < guard_interval_s
             ):
                 self._battery_guard_metrics["url_write_skip_guard"] += 1
+                self._last_url_write_outcome[normalized_uuid] = "skip_guard"
                 _LOGGER.info(
                     "Battery guard: skipping rapid URL change for %s (%.1fs < %.0fs).",
                     normalized_uuid,
@@ -617,6 +857,7 @@ class VisionectAPI:
         _LOGGER.debug(f"Fetching session data for {normalized_uuid} to change URL.")
         session_data = await self.async_get_session_data(normalized_uuid)
         if not session_data:
+            self._last_url_write_outcome[normalized_uuid] = "failure"
             return False
 
         if "Backend" not in session_data: session_data["Backend"] = {}
@@ -627,8 +868,9 @@ class VisionectAPI:
         current_url = str(session_data["Backend"]["Fields"].get("url", "")).strip()
         if self._normalize_url_for_battery_guard(current_url) == url_norm:
             self._battery_guard_metrics["url_write_skip_unchanged"] += 1
+            self._last_url_write_outcome[normalized_uuid] = "skip_unchanged"
             _LOGGER.debug("Session URL for %s already set, skipping PUT.", normalized_uuid)
-            self._recent_session_url_write[normalized_uuid] = (url, now_m)
+            self._recent_session_url_write.set(normalized_uuid, (url, now_m))
             return True
 
         session_data["Backend"]["Fields"]["url"] = url
@@ -640,6 +882,7 @@ class VisionectAPI:
             "put", API_SESSION_DETAIL.format(uuid=normalized_uuid), json=put_body
         )
         if response is None:
+            self._last_url_write_outcome[normalized_uuid] = "failure"
             return False
 
         # Invalidate cache after successful modification
@@ -651,9 +894,10 @@ class VisionectAPI:
             expected_reload_timeout="604800",
             expected_backend_name="HTML",
         )
+        self._last_url_write_outcome[normalized_uuid] = "put_success" if verified else "failure"
         if verified:
             self._battery_guard_metrics["url_write_put_success"] += 1
-            self._recent_session_url_write[normalized_uuid] = (url, now_m)
+            self._recent_session_url_write.set(normalized_uuid, (url, now_m))
         return verified
 
     async def async_set_display_rotation(self, uuid: str, display_rotation: str) -> bool:
@@ -681,6 +925,7 @@ class VisionectAPI:
             "put", API_DEVICE_DETAIL.format(uuid=nu), json=self._device_payload_for_put(device_data, nu)
         )
         if response is not None:
+            self._invalidate_devices_cache()
             return True
         return False
 
@@ -826,7 +1071,11 @@ class VisionectAPI:
         expected_backend_name: str | None = None,
     ) -> bool:
         """Verify session config was really persisted by VSS after PUT."""
-        session_data = await self.async_get_session_data(uuid)
+        # Own GET: a shared or cached read may predate the PUT being verified.
+        normalized_uuid = self._normalize_uuid(uuid)
+        session_data = await self._async_read_session(normalized_uuid, share=False)
+        if session_data:
+            self._session_cache.set(normalized_uuid, session_data)
         if not session_data:
             _LOGGER.error("Session verification failed for %s: no session data returned.", uuid)
             return False
@@ -1107,6 +1356,7 @@ class VisionectAPI:
 
         if response is not None:
             _LOGGER.info(f"Options for {nu} updated successfully.")
+            self._invalidate_devices_cache()
             
             # Jeśli wyłączyliśmy uśpienie (Always Online), to globalnego managera wyłączamy PO aktualizacji urządzenia
             if target_sleep_manager is False:
@@ -1244,22 +1494,17 @@ class VisionectAPI:
         """Fetches the device screenshot as binary data, gracefully handling 500 errors from VSS."""
         try:
             nu = self._normalize_uuid(uuid)
-            now_m = time.monotonic()
-            min_gap = self._screenshot_min_interval_s(nu)
-            last_m = self._screenshot_last_mono.get(nu, 0.0)
-            if now_m - last_m < min_gap:
-                cached = self._screenshot_last_bytes.get(nu)
-                if cached:
-                    return cached
-                return None
+            cached = self._screenshot_cache.get_with_age(nu)
+            if cached is not None and cached[1] < self._screenshot_min_interval_s(nu):
+                return cached[0]
             data = await self._request("get", API_SCREENSHOT.format(uuid=nu), silent=True)
             if data:
-                self._screenshot_last_bytes[nu] = data
-                self._screenshot_last_mono[nu] = time.monotonic()
+                self._screenshot_cache.set(nu, data)
             return data
         except Exception as e:
             _LOGGER.debug(f"Could not fetch screenshot for {uuid}: {e}")
-            return self._screenshot_last_bytes.get(self._normalize_uuid(uuid))
+            cached = self._screenshot_cache.get_with_age(self._normalize_uuid(uuid), count=False)
+            return cached[0] if cached is not None else None
 
     async def async_get_device_live_image(self, uuid: str) -> bytes | None:
         """Fetches the current LIVE image from device (not cached server-side).
@@ -1347,7 +1592,6 @@ class VisionectAPI:
     def invalidate_orphans_cache(self) -> None:
         """Drop cached /api/orphans responses (e.g. before manual health check)."""
         self._orphans_cache.clear()
-        self._orphans_cache_time.clear()
 
     def orphan_error_for_uuid(self, orphans: dict[str, str] | None, uuid: str) -> str | None:
         """Return orphan error message for a device UUID, if any."""
@@ -1366,16 +1610,12 @@ class VisionectAPI:
         include_deferred=False (default): only real problems — used for Health Status.
         include_deferred=True: also deferred (online without session yet) per VSS API.
         """
-        current_time = time.time()
-        cache_key = bool(include_deferred)
+        cache_key = "all" if include_deferred else "problems"
 
-        if (
-            not force
-            and cache_key in self._orphans_cache
-            and (current_time - self._orphans_cache_time.get(cache_key, 0)) < self._orphans_cache_ttl
-        ):
+        cached = None if force else self._orphans_cache.get(cache_key)
+        if cached is not None:
             _LOGGER.debug("Using cached orphans list (include_deferred=%s)", include_deferred)
-            return self._orphans_cache[cache_key]
+            return cached
 
         # Default (health): GET /api/orphans — real problems only.
         # include_deferred=True adds ?all=true (online devices without session yet).
@@ -1384,8 +1624,7 @@ class VisionectAPI:
         try:
             response = await self._request("get", endpoint, silent=True)
             orphans_dict = self._normalize_orphans_response(response)
-            self._orphans_cache[cache_key] = orphans_dict
-            self._orphans_cache_time[cache_key] = current_time
+            self._orphans_cache.set(cache_key, orphans_dict)
             return orphans_dict
         except Exception as e:
             _LOGGER.error(f"Failed to fetch orphans: {e}")
@@ -0,0 +1,227 @@
+"""Bounded in-memory LRU + TTL cache used by the VSS client.
+
+One small component instead of ad-hoc dicts: entry and byte budgets with LRU
+eviction, per-cache TTL, optional stale-while-revalidate window and counters
+that diagnostics can show.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Coroutine, Hashable
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate byte size of a cached value (exact for bytes/str, recursive for JSON)."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class LruTtlCache:
+    """LRU cache with TTL, entry/byte budgets and stale-while-revalidate.
+
+    ``stale_s`` > 0 keeps expired entries around for that long; ``async_get_or_load``
+    then returns the stale value immediately and refreshes it in the background.
+    Refreshes are started with ``task_factory(coro, name)`` when given (the owner's
+    tracked background tasks), else on the running loop; ``close`` cancels them.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        ttl_s: float,
+        max_entries: int = 256,
+        max_bytes: int | None = None,
+        stale_s: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+        task_factory: Callable[[Coroutine[Any, Any, None], str], asyncio.Task] | None = None,
+    ) -> None:
+        self.name = name
+        self._ttl_s = float(ttl_s)
+        self._max_entries = max(1, int(max_entries))
+        self._max_bytes = int(max_bytes) if max_bytes else None
+        self._stale_s = max(0.0, float(stale_s))
+        self._clock = clock
+        self._task_factory = task_factory
+        # key -> (value, stored_at, size)
+        self._entries: OrderedDict[Hashable, tuple[Any, float, int]] = OrderedDict()
+        self._bytes = 0
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+        self._stats: dict[str, int] = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "revalidations": 0,
+        }
+
+    @property
+    def ttl_s(self) -> float:
+        return self._ttl_s
+
+    def set_ttl(self, ttl_s: float) -> None:
+        self._ttl_s = float(ttl_s)
+
+    def set_stale_window(self, stale_s: float) -> None:
+        self._stale_s = max(0.0, float(stale_s))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get_with_age(key, count=False) is not None
+
+    def _drop(self, key: Hashable) -> None:
+        _value, _ts, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _lookup(self, key: Hashable) -> tuple[Any, float] | None:
+        """(value, age) for a non-expired or still-stale-usable entry, dropping dead ones."""
+        row = self._entries.get(key)
+        if row is None:
+            return None
+        value, stored_at, _size = row
+        age = self._clock() - stored_at
+        if age >= self._ttl_s + self._stale_s:
+            self._drop(key)
+            self._stats["expirations"] += 1
+            return None
+        self._entries.move_to_end(key)
+        return value, age
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Fresh value for ``key`` or ``default``."""
+        found = self._lookup(key)
+        if found is None or found[1] >= self._ttl_s:
+            self._stats["misses"] += 1
+            return default
+        self._stats["hits"] += 1
+        return found[0]
+
+    def get_with_age(self, key: Hashable, *, count: bool = True) -> tuple[Any, float] | None:
+        """(value, age_s) including entries past TTL but inside the stale window."""
+        found = self._lookup(key)
+        if count:
+            self._stats["hits" if found is not None else "misses"] += 1
+        return found
+
+    def stored_at(self, key: Hashable) -> float | None:
+        """Clock value when ``key`` was last written (no stats, no LRU touch)."""
+        row = self._entries.get(key)
+        return row[1] if row is not None else None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        size = estimate_size(value)
+        if key in self._entries:
+            self._drop(key)
+        if self._max_bytes is not None and size > self._max_bytes:
+            _LOGGER.debug("Cache %s: value for %s exceeds byte budget, not stored", self.name, key)
+            return
+        self._entries[key] = (value, self._clock(), size)
+        self._bytes += size
+        while len(self._entries) > self._max_entries or (
+            self._max_bytes is not None and self._bytes > self._max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self._stats["evictions"] += 1
+
+    def pop(self, key: Hashable) -> Any:
+        if key not in self._entries:
+            return None
+        value = self._entries[key][0]
+        self._drop(key)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    async def async_get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        *,
+        force: bool = False,
+    ) -> Any:
+        """Return a cached value, loading it on miss.
+
+        Fresh hit: cached value. Stale hit: cached value now, ``loader`` re-run in
+        the background (once per key). ``force`` skips the cache entirely.
+        ``None`` results are never cached.
+        """
+        if not force:
+            found = self._lookup(key)
+            if found is not None:
+                value, age = found
+                if age < self._ttl_s:
+                    self._stats["hits"] += 1
+                    return value
+                self._stats["stale_hits"] += 1
+                self._schedule_revalidate(key, loader)
+                return value
+        self._stats["misses"] += 1
+        value = await loader()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def _schedule_revalidate(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> None:
+        if key in self._refreshing:
+            return
+        stored_before = self.stored_at(key)
+
+        async def _revalidate() -> None:
+            try:
+                value = await loader()
+                # An explicit write/invalidation during the refresh wins over our result.
+                if value is not None and self.stored_at(key) == stored_before:
+                    self.set(key, value)
+                    self._stats["revalidations"] += 1
+            except Exception as err:
+                _LOGGER.debug("Cache %s: background refresh of %s failed: %s", self.name, key, err)
+            finally:
+                self._refreshing.pop(key, None)
+
+        name = f"visionect_joan_{self.name}_revalidate"
+        if self._task_factory is not None:
+            self._refreshing[key] = self._task_factory(_revalidate(), name)
+        else:
+            self._refreshing[key] = asyncio.get_running_loop().create_task(_revalidate(), name=name)
+
+    def close(self) -> None:
+        """Cancel background refreshes still running (owner shutting down)."""
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        self._refreshing.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self._max_entries,
+            "max_bytes": self._max_bytes,
+            "ttl_s": self._ttl_s,
+            "stale_s": self._stale_s,
+            **self._stats,
+        }
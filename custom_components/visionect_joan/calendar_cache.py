@@ -0,0 +1,177 @@
+"""Calendar events for send_calendar, cached per calendar entity.
+
+``calendar.get_events`` goes to the calendar backend (CalDAV, Google, ...) on
+every call, so frequent refreshes of multi-calendar views kept re-querying the
+same days. ``CalendarEventCache`` fetches a day-aligned window (today's midnight
+up to one day past the requested range) once and serves every request inside it
+from the stored, already-normalized events. A calendar is re-read only when:
+
+* the requested range runs past the cached window (the window moved),
+* the calendar entity's state or attributes changed since the fetch (its next
+  event changed, or the integration refreshed with new data), or
+* the fetch is older than ``CALENDAR_MAX_AGE_S`` (edits to later events that do
+  not show up in the entity state).
+
+All calendar styles (list, weather calendar, monthly grid) read through it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+CALENDAR_MAX_AGE_S = 900.0
+# Idle windows (calendar no longer pushed) are dropped after this long
+CALENDAR_CACHE_IDLE_S = 6 * 3600.0
+
+
+def normalize_event_time(val: Any) -> datetime | None:
+    """Event start/end (datetime, date, ISO string or Google-style dict) as an aware datetime."""
+    if isinstance(val, dict):
+        val = val.get("dateTime") or val.get("date")
+    if isinstance(val, datetime):
+        dt_out = val
+    elif isinstance(val, date):
+        dt_out = datetime.combine(val, datetime.min.time())
+    elif isinstance(val, str) and val:
+        dt_out = dt_util.parse_datetime(val)
+        if dt_out is None:
+            d = dt_util.parse_date(val)
+            dt_out = datetime.combine(d, datetime.min.time()) if d else None
+    else:
+        return None
+    if dt_out is not None and dt_out.tzinfo is None:
+        dt_out = dt_out.replace(tzinfo=timezone.utc)
+    return dt_out
+
+
+def normalize_events(raw_events: list[Any]) -> list[dict[str, Any]]:
+    """Events with start/end normalized; events without a usable start are dropped."""
+    parsed = []
+    for event in raw_events:
+        if not isinstance(event, dict):
+            continue
+        try:
+            start = normalize_event_time(event.get("start"))
+            end = normalize_event_time(event.get("end"))
+        except (TypeError, ValueError):
+            continue
+        if start is not None:
+            parsed.append({**event, "start": start, "end": end})
+    return parsed
+
+
+def _overlaps(event: dict[str, Any], start: datetime, end: datetime) -> bool:
+    """Same selection ``calendar.get_events`` makes for a [start, end) range."""
+    if event["start"] >= end:
+        return False
+    return event["end"] > start if event["end"] is not None else event["start"] >= start
+
+
+@dataclass
+class _Window:
+    start: datetime
+    end: datetime
+    state_token: tuple[Any, ...] | None
+    fetched_ts: float
+    used_ts: float
+    events: list[dict[str, Any]]
+
+
+class CalendarEventCache:
+    """Normalized events per calendar entity over a day-aligned window."""
+
+    def __init__(self, hass: HomeAssistant, *, max_age_s: float = CALENDAR_MAX_AGE_S) -> None:
+        self._hass = hass
+        self._max_age_s = max_age_s
+        self._windows: dict[str, _Window] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._stats = {"hits": 0, "fetches": 0, "window_moves": 0, "state_changes": 0, "errors": 0}
+
+    def _state_token(self, cal_entity: str) -> tuple[Any, ...] | None:
+        state = self._hass.states.get(cal_entity)
+        if state is None:
+            return None
+        return (state.state, state.last_updated)
+
+    async def async_get_events(
+        self, cal_entity: str, duration_days: int, *, raise_on_error: bool = False
+    ) -> list[dict[str, Any]]:
+        """Events of ``cal_entity`` from now to ``duration_days`` ahead (start/end aware datetimes).
+
+        A failed fetch gives no events, or re-raises with ``raise_on_error``.
+        """
+        now = dt_util.utcnow()
+        until = now + timedelta(days=duration_days)
+        lock = self._locks.setdefault(cal_entity, asyncio.Lock())
+        async with lock:
+            window = self._current_window(cal_entity, now, until)
+            if window is None:
+                try:
+                    window = await self._async_fetch(cal_entity, now, until)
+                except Exception:
+                    if raise_on_error:
+                        raise
+                    return []
+            else:
+                self._stats["hits"] += 1
+        window.used_ts = time.monotonic()
+        # Copies: renderers get their own dicts, the cached ones stay untouched.
+        return [dict(event) for event in window.events if _overlaps(event, now, until)]
+
+    def _current_window(self, cal_entity: str, now: datetime, until: datetime) -> _Window | None:
+        window = self._windows.get(cal_entity)
+        if window is None:
+            return None
+        if now < window.start or until > window.end:
+            self._stats["window_moves"] += 1
+            return None
+        if self._state_token(cal_entity) != window.state_token:
+            self._stats["state_changes"] += 1
+            return None
+        if time.monotonic() - window.fetched_ts > self._max_age_s:
+            return None
+        return window
+
+    async def _async_fetch(self, cal_entity: str, now: datetime, until: datetime) -> _Window:
+        local_midnight = dt_util.start_of_local_day(dt_util.as_local(now))
+        start = dt_util.as_utc(local_midnight)
+        end = dt_util.as_utc(dt_util.start_of_local_day(dt_util.as_local(until)) + timedelta(days=1))
+        # Taken before the call so a state change during the fetch invalidates it.
+        token = self._state_token(cal_entity)
+        self._stats["fetches"] += 1
+        try:
+            response = await self._hass.services.async_call(
+                "calendar", "get_events",
+                {"entity_id": cal_entity, "start_date_time": start.isoformat(), "end_date_time": end.isoformat()},
+                blocking=True, return_response=True,
+            )
+        except Exception as err:
+            self._stats["errors"] += 1
+            _LOGGER.error("Failed to fetch events from %s: %s", cal_entity, err)
+            raise
+        raw_events = ((response or {}).get(cal_entity) or {}).get("events") or []
+        events = normalize_events(raw_events)
+        _LOGGER.debug("Fetched %d events from %s (%s .. %s)", len(events), cal_entity, start, end)
+        mono = time.monotonic()
+        window = _Window(start, end, token, mono, mono, events)
+        self._windows[cal_entity] = window
+        self._expire(mono)
+        return window
+
+    def _expire(self, mono: float) -> None:
+        for cal_entity in [c for c, w in self._windows.items() if mono - w.used_ts > CALENDAR_CACHE_IDLE_S]:
+            del self._windows[cal_entity]
+            self._locks.pop(cal_entity, None)
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._stats, "calendars": len(self._windows)}
@@ -94,6 +94,7 @@ class VisionectJoanConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     ) -> tuple[Dict[str, str], int | None]:
         """Test VSS connectivity; return (errors, device_count)."""
         errors: Dict[str, str] = {}
+        api: VisionectAPI | None = None
         try:
             api = VisionectAPI(
                 self.hass,
@@ -110,6 +111,10 @@ class VisionectJoanConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         except Exception as ex:
             _LOGGER.error("Error during VSS connection test: %s", str(ex))
             return {"base": "cannot_connect"}, None
+        finally:
+            # The probe's login session is not reused by the entry.
+            if api is not None:
+                await api.async_close()
 
     def _connection_schema(
         self,
@@ -20,6 +20,8 @@ CONF_OLLAMA_MODEL = "ollama_model"
 CONF_OLLAMA_INTERVAL_MIN = "ollama_interval_min"
 CONF_CLEANUP_MAX_AGE = "cleanup_max_age_hours"
 CONF_CLEANUP_INTERVAL = "cleanup_interval_hours"
+# Publishes to www/ trigger a background sweep at most this often (seconds).
+MEDIA_CLEANUP_MIN_INTERVAL_S = 600
 CONF_TABLET_LANGUAGE = "tablet_language"
 # Secret query param for /api/visionect_joan/recovery (Joan / VSS Default URL fallback page).
 CONF_RECOVERY_PAGE_TOKEN = "recovery_page_token"
@@ -208,6 +210,44 @@ POLL_INTERVAL_ALERT = timedelta(minutes=5)
 SESSION_REFRESH_EVERY_TICKS_ECO = 6
 SESSION_REFRESH_EVERY_TICKS_NORMAL = 4
 SESSION_REFRESH_EVERY_TICKS_ALERT = 2
+
+# Discovery refresh: bounded parallel fetch of device details (options / YAML, no UI field)
+CONF_DISCOVERY_CONCURRENCY = "discovery_concurrency"
+CONF_DISCOVERY_DEVICE_TIMEOUT_SEC = "discovery_device_timeout_sec"
+# 32 covers a 60-tablet fleet in two rounds; the cap keeps VSS from being flooded
+DISCOVERY_CONCURRENCY_DEFAULT = 32
+DISCOVERY_CONCURRENCY_MAX = 64
+DISCOVERY_DEVICE_TIMEOUT_DEFAULT_SEC = 30
+
+# Multi-tablet service calls: parallel session pushes (each = session GET + PUT + verify GET)
+CONF_PUSH_CONCURRENCY = "push_concurrency"
+PUSH_CONCURRENCY_DEFAULT = 4
+
+# Generated screens served from RAM by /api/visionect_joan/screen/ (0 MB = legacy /local/ files)
+CONF_SCREEN_MEMORY_MB = "screen_memory_mb"
+CONF_SCREEN_GZIP = "screen_gzip"
+SCREEN_MEMORY_MB_DEFAULT = 16
+
+# Deterministic rendering: no timestamp inside pages, cache-busting only in the URL
+CONF_DETERMINISTIC_RENDER = "deterministic_render"
+
+# send_status_panel live_update: coalesce displayed-value changes within this window
+STATUS_PANEL_DEBOUNCE_DEFAULT_S = 5
+
+# Optional local rasterization (none / auto / wkhtmltoimage / chromium) and panel gray levels
+CONF_RASTER_BACKEND = "raster_backend"
+CONF_RASTER_GRAY_LEVELS = "raster_gray_levels"
+RASTER_GRAY_LEVELS_DEFAULT = 16
+
+# send_sensor_graph: windows this long or longer read recorder statistics (0 = always raw states)
+CONF_GRAPH_STATISTICS_AFTER_HOURS = "graph_statistics_after_hours"
+GRAPH_STATISTICS_AFTER_HOURS_DEFAULT = 48
+
+# send_sensor_graph renderer: auto = matplotlib PNG when installed, else inline SVG
+GRAPH_RENDERER_AUTO = "auto"
+GRAPH_RENDERER_MATPLOTLIB = "matplotlib"
+GRAPH_RENDERER_SVG = "svg"
+GRAPH_RENDERERS = [GRAPH_RENDERER_AUTO, GRAPH_RENDERER_MATPLOTLIB, GRAPH_RENDERER_SVG]
 BATTERY_VOLTAGE_DIVIDER = 1000
 
 # Endpointy API Visionect (kolekcje z / na końcu; szczegóły {uuid} bez — zgodnie z VSS na LAN)
@@ -0,0 +1,69 @@
+"""Content fingerprints of pushed screens (visual-diff push suppression).
+
+Two renders that differ only in cache-busters or render timestamps look the same
+on e-ink, so they should not wake the tablet. Pages are hashed in a canonical
+form: ``<!-- cb:... -->`` markers and ``cb=`` URL parameters are dropped, and
+text inside ``data-vj-volatile`` spans (e.g. "updated 12:05") is blanked.
+Images are hashed by pixel data when Pillow is available, else by their bytes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import re
+from collections.abc import Callable
+
+VOLATILE_ATTR = "data-vj-volatile"
+
+_CB_COMMENT_RE = re.compile(r"<!--\s*cb:\d+\s*-->")
+_CB_PARAM_RE = re.compile(r"([?&]|&amp;)cb=\d+")
+_VOLATILE_RE = re.compile(rf"(<span {VOLATILE_ATTR}>)[^<]*(</span>)")
+_MEDIA_REF_RE = re.compile(r"\b([0-9a-f]{32}\.(?:png|jpg))\b")
+
+
+def volatile_span(text: str) -> str:
+    """Wrap render-time text that must not count as a visual change."""
+    return f"<span {VOLATILE_ATTR}>{text}</span>"
+
+
+def canonical_html(
+    html: str, media_fingerprint: Callable[[str], str | None] | None = None
+) -> str:
+    """``html`` with cache-busters and volatile text removed.
+
+    ``media_fingerprint`` maps a referenced image name (``<md5>.png``) to its pixel
+    fingerprint, so a re-encoded but identical graph does not change the page.
+    """
+    text = _CB_COMMENT_RE.sub("", html)
+    text = _CB_PARAM_RE.sub("", text)
+    text = _VOLATILE_RE.sub(r"\1\2", text)
+    if media_fingerprint is not None:
+        text = _MEDIA_REF_RE.sub(
+            lambda m: f"px:{media_fingerprint(m.group(1)) or m.group(1)}", text
+        )
+    return text
+
+
+def fingerprint_html(
+    html: str, media_fingerprint: Callable[[str], str | None] | None = None
+) -> str:
+    return hashlib.sha1(
+        canonical_html(html, media_fingerprint).encode("utf-8")
+    ).hexdigest()
+
+
+def fingerprint_image(data: bytes) -> str:
+    """Pixel-data digest (blocking: decodes the image; run in the executor)."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return hashlib.sha1(data).hexdigest()
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.load()
+            digest = hashlib.sha1(f"{img.mode}:{img.size}".encode())
+            digest.update(img.tobytes())
+            return digest.hexdigest()
+    except Exception:
+        return hashlib.sha1(data).hexdigest()
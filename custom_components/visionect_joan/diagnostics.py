@@ -23,6 +23,14 @@ async def async_get_config_entry_diagnostics(
 
     coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id, {}).get("coordinator")
     api = hass.data.get(DOMAIN, {}).get(entry.entry_id, {}).get("api")
+    publish_store = hass.data.get(DOMAIN, {}).get("publish_store")
+    screen_store = hass.data.get(DOMAIN, {}).get("screen_store")
+    history_cache = hass.data.get(DOMAIN, {}).get("history_cache")
+    feed_fetcher = hass.data.get(DOMAIN, {}).get("feed_fetcher")
+    market_data = hass.data.get(DOMAIN, {}).get("market_data")
+    calendar_cache = hass.data.get(DOMAIN, {}).get("calendar_cache")
+    snapshot_ring = hass.data.get(DOMAIN, {}).get("snapshot_ring")
+    prefetch = hass.data.get(DOMAIN, {}).get(entry.entry_id, {}).get("prefetch")
     devices = {}
     if coordinator and coordinator.data:
         # Uproszczony widok urządzeń (bez binariów), zredagowany
@@ -52,4 +60,15 @@ async def async_get_config_entry_diagnostics(
         "device_count": len(devices),
         "devices": devices,
         "battery_guard_metrics": (api.get_battery_guard_metrics() if api else {}),
+        "fleet_metrics": (api.get_fleet_metrics() if api else {}),
+        "request_metrics": (api.get_request_metrics() if api else {}),
+        "cache_stats": (api.get_cache_stats() if api else {}),
+        "publish_store": (publish_store.stats() if publish_store else {}),
+        "screen_store": (screen_store.stats() if screen_store else {}),
+        "history_cache": (history_cache.stats() if history_cache else {}),
+        "feed_fetcher": (feed_fetcher.stats() if feed_fetcher else {}),
+        "market_data": (market_data.stats() if market_data else {}),
+        "calendar_cache": (calendar_cache.stats() if calendar_cache else {}),
+        "snapshot_ring": (snapshot_ring.stats() if snapshot_ring else {}),
+        "prefetch": (prefetch.stats() if prefetch else {}),
     }
\ No newline at end of file
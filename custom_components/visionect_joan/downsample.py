@@ -0,0 +1,209 @@
+"""History downsampling for sensor graphs.
+
+A 600 px wide e-ink plot cannot show more than ~2 points per pixel column, yet a
+week of a 1 Hz sensor is hundreds of thousands of states. Series are reduced
+before plotting: min/max bucketing (keeps spikes, 2 points per bucket) or LTTB
+(keeps visual shape). NumPy is used when installed, with a pure-Python fallback.
+
+Input rows may be recorder ``State`` objects or long-term statistics rows
+(mappings with ``start`` and ``mean``/``state``), so long windows can be drawn
+from hourly means instead of raw states. Statistics rows also carry the period's
+``min``/``max``; read with ``extremes=True`` each row becomes those two points, so
+min/max bucketing over many periods keeps a spike the hourly mean smoothed away.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timezone
+from typing import Any
+
+from .const import UNKNOWN_STRINGS
+
+_LOGGER = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised on installs without numpy
+    np = None
+
+METHOD_MINMAX = "minmax"
+METHOD_LTTB = "lttb"
+
+
+def _to_float(raw: Any) -> float | None:
+    if raw is None or raw in UNKNOWN_STRINGS:
+        return None
+    try:
+        return float(str(raw).replace(",", ".").strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_epoch(raw: Any) -> float | None:
+    if isinstance(raw, datetime):
+        return raw.timestamp()
+    if isinstance(raw, (int, float)):
+        return float(raw)
+    return None
+
+
+def series_from_rows(rows: Iterable[Any], *, extremes: bool = False) -> tuple[list[float], list[float]]:
+    """(epoch seconds, values) from State objects or statistics rows, skipping non-numeric.
+
+    ``extremes`` emits a statistics row's ``min`` and ``max`` (both at its start) instead
+    of its mean, for min/max downsampling; rows without them fall back to the mean.
+    """
+    ts: list[float] = []
+    values: list[float] = []
+    for row in rows:
+        if isinstance(row, Mapping):
+            low, high = _to_float(row.get("min")), _to_float(row.get("max"))
+            epoch = _to_epoch(row.get("start"))
+            if extremes and low is not None and high is not None and epoch is not None:
+                ts += [epoch, epoch]
+                values += [low, high]
+                continue
+            value = row.get("mean")
+            if value is None:
+                value = row.get("state")
+            value = _to_float(value)
+        else:
+            value = _to_float(getattr(row, "state", None))
+            epoch = _to_epoch(getattr(row, "last_updated", None))
+        if value is None or epoch is None:
+            continue
+        ts.append(epoch)
+        values.append(value)
+    return ts, values
+
+
+def to_datetimes(ts: Iterable[float]) -> list[datetime]:
+    return [datetime.fromtimestamp(t, tz=timezone.utc) for t in ts]
+
+
+def downsample(
+    ts: list[float],
+    values: list[float],
+    target_points: int,
+    method: str = METHOD_MINMAX,
+) -> tuple[list[float], list[float]]:
+    """Reduce a time-sorted series to about ``target_points`` points."""
+    n = len(ts)
+    target_points = max(4, int(target_points))
+    if n <= target_points:
+        return list(ts), list(values)
+    if method == METHOD_LTTB:
+        if np is not None:
+            return _lttb_numpy(ts, values, target_points)
+        return _lttb_python(ts, values, target_points)
+    if np is not None:
+        return _minmax_numpy(ts, values, target_points // 2)
+    return _minmax_python(ts, values, target_points // 2)
+
+
+def _minmax_python(ts: list[float], values: list[float], buckets: int) -> tuple[list[float], list[float]]:
+    t0, t1 = ts[0], ts[-1]
+    span = (t1 - t0) or 1.0
+    out_t: list[float] = []
+    out_v: list[float] = []
+    current = -1
+    lo = hi = 0
+    for i, t in enumerate(ts):
+        b = min(buckets - 1, int((t - t0) / span * buckets))
+        if b != current:
+            if current >= 0:
+                _emit_minmax(ts, values, lo, hi, out_t, out_v)
+            current, lo, hi = b, i, i
+            continue
+        if values[i] < values[lo]:
+            lo = i
+        if values[i] > values[hi]:
+            hi = i
+    _emit_minmax(ts, values, lo, hi, out_t, out_v)
+    return out_t, out_v
+
+
+def _emit_minmax(ts, values, lo, hi, out_t, out_v) -> None:
+    for i in sorted({lo, hi}):
+        out_t.append(ts[i])
+        out_v.append(values[i])
+
+
+def _minmax_numpy(ts: list[float], values: list[float], buckets: int) -> tuple[list[float], list[float]]:
+    t = np.asarray(ts, dtype=float)
+    v = np.asarray(values, dtype=float)
+    span = (t[-1] - t[0]) or 1.0
+    bucket = np.minimum(((t - t[0]) / span * buckets).astype(np.int64), buckets - 1)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    keep = np.unique(np.concatenate([
+        _first_index_of(v, np.fmin.reduceat(v, starts), starts),
+        _first_index_of(v, np.fmax.reduceat(v, starts), starts),
+    ]))
+    return t[keep].tolist(), v[keep].tolist()
+
+
+def _first_index_of(v, extremes, starts):
+    """Per bucket, the first index whose value equals the bucket's extreme (bucket start if none)."""
+    n = len(v)
+    counts = np.diff(np.r_[starts, n])
+    hits = np.where(v == np.repeat(extremes, counts), np.arange(n), n)
+    first = np.minimum.reduceat(hits, starts)
+    return np.where(first < n, first, starts)
+
+
+def _lttb_edges(n: int, threshold: int) -> list[int]:
+    """Bucket boundaries: first/last point fixed, ``threshold - 2`` buckets between."""
+    every = (n - 2) / (threshold - 2)
+    edges = [int(k * every) + 1 for k in range(threshold - 1)]
+    edges[-1] = n - 1
+    return edges
+
+
+def _lttb_python(ts: list[float], values: list[float], threshold: int) -> tuple[list[float], list[float]]:
+    n = len(ts)
+    edges = _lttb_edges(n, threshold)
+    out_t, out_v = [ts[0]], [values[0]]
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        nxt_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_len = nxt_end - end
+        avg_t = sum(ts[end:nxt_end]) / avg_len
+        avg_v = sum(values[end:nxt_end]) / avg_len
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(
+                (ts[a] - avg_t) * (values[j] - values[a])
+                - (ts[a] - ts[j]) * (avg_v - values[a])
+            )
+            if area > best_area:
+                best, best_area = j, area
+        out_t.append(ts[best])
+        out_v.append(values[best])
+        a = best
+    out_t.append(ts[-1])
+    out_v.append(values[-1])
+    return out_t, out_v
+
+
+def _lttb_numpy(ts: list[float], values: list[float], threshold: int) -> tuple[list[float], list[float]]:
+    t = np.asarray(ts, dtype=float)
+    v = np.asarray(values, dtype=float)
+    n = len(t)
+    edges = np.asarray(_lttb_edges(n, threshold), dtype=np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        nxt_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_t = t[end:nxt_end].mean()
+        avg_v = v[end:nxt_end].mean()
+        area = np.abs(
+            (t[a] - avg_t) * (v[start:end] - v[a]) - (t[a] - t[start:end]) * (avg_v - v[a])
+        )
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return t[keep].tolist(), v[keep].tolist()
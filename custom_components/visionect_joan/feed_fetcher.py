@@ -0,0 +1,119 @@
+"""RSS/Atom fetching for send_rss_feed.
+
+Feeds are downloaded on Home Assistant's shared aiohttp session with a timeout
+(``feedparser.parse(url)`` downloaded synchronously, without one, in an executor
+thread). ETag / Last-Modified of every feed are kept, so an unchanged feed costs
+one conditional GET answered with 304 and is not parsed again; parsed items are
+reused without any request for ``FEED_RECHECK_S``. A failed download, or a body
+that does not parse into any entry, keeps the last good items.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+import feedparser
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+_LOGGER = logging.getLogger(__name__)
+
+FEED_TIMEOUT_S = 15
+FEED_RECHECK_S = 300
+FEED_MAX_FEEDS = 32
+FEED_MAX_ITEMS = 50
+
+
+@dataclass
+class _Feed:
+    items: list[dict[str, Any]] = field(default_factory=list)
+    etag: str | None = None
+    last_modified: str | None = None
+    checked_ts: float = 0.0
+
+
+class FeedFetcher:
+    """Conditional-GET feed downloads with a parsed-item cache per feed URL."""
+
+    def __init__(self, hass: HomeAssistant, *, recheck_s: float = FEED_RECHECK_S) -> None:
+        self._hass = hass
+        self._recheck_s = recheck_s
+        self._feeds: OrderedDict[str, _Feed] = OrderedDict()
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._stats = {"cache_hits": 0, "not_modified": 0, "downloads": 0, "errors": 0}
+
+    async def async_get_items(self, feed_url: str, max_items: int) -> list[dict[str, Any]]:
+        """Up to ``max_items`` entries (``{"title": ...}``); last good items on errors."""
+        lock = self._locks.setdefault(feed_url, asyncio.Lock())
+        async with lock:
+            feed = await self._async_refresh(feed_url)
+            if feed is None and self._locks.get(feed_url) is lock:
+                # Never fetched successfully: nothing is kept for this URL, not even its lock.
+                del self._locks[feed_url]
+        return feed.items[:max_items] if feed else []
+
+    async def _async_refresh(self, feed_url: str) -> _Feed | None:
+        feed = self._feeds.get(feed_url)
+        now = time.monotonic()
+        if feed is not None:
+            self._feeds.move_to_end(feed_url)
+            if now - feed.checked_ts < self._recheck_s:
+                self._stats["cache_hits"] += 1
+                return feed
+
+        headers: dict[str, str] = {}
+        if feed is not None and feed.etag:
+            headers["If-None-Match"] = feed.etag
+        if feed is not None and feed.last_modified:
+            headers["If-Modified-Since"] = feed.last_modified
+
+        session = async_get_clientsession(self._hass)
+        try:
+            async with session.get(
+                feed_url, headers=headers, timeout=aiohttp.ClientTimeout(total=FEED_TIMEOUT_S)
+            ) as resp:
+                if resp.status == 304 and feed is not None:
+                    self._stats["not_modified"] += 1
+                    feed.checked_ts = now
+                    return feed
+                resp.raise_for_status()
+                body = await resp.read()
+                response_headers = {k.lower(): v for k, v in resp.headers.items()}
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self._stats["errors"] += 1
+            _LOGGER.warning("RSS feed %s could not be fetched: %s", feed_url, err)
+            return feed
+
+        self._stats["downloads"] += 1
+        parsed = await self._hass.async_add_executor_job(
+            lambda: feedparser.parse(body, response_headers=response_headers)
+        )
+        if parsed.bozo and not parsed.entries:
+            self._stats["errors"] += 1
+            _LOGGER.warning("RSS feed %s could not be parsed: %s", feed_url, parsed.get("bozo_exception"))
+            return feed
+        items = [
+            {"title": entry.get("title")}
+            for entry in parsed.entries[:FEED_MAX_ITEMS]
+            if entry.get("title")
+        ]
+        if feed is None:
+            feed = self._feeds[feed_url] = _Feed()
+            while len(self._feeds) > FEED_MAX_FEEDS:
+                stale_url, _ = self._feeds.popitem(last=False)
+                self._locks.pop(stale_url, None)
+        feed.items = items
+        feed.etag = response_headers.get("etag")
+        feed.last_modified = response_headers.get("last-modified")
+        feed.checked_ts = now
+        return feed
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._stats, "feeds": len(self._feeds)}
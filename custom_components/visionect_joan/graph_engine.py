@@ -0,0 +1,200 @@
+"""Matplotlib rendering engine for send_sensor_graph PNGs.
+
+matplotlib is imported (and switched to Agg) once, and one Figure + Agg canvas is
+kept per graph layout (screen size x orientation) and cleared between renders
+instead of being rebuilt with every call. matplotlib is not thread-safe and
+style contexts touch global rcParams, so renders are serialized by a lock; they
+run in the executor.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+LINE_STYLES = ['-', '--', ':', '-.']
+BAR_COLORS = ['#222222', '#666666', '#999999', '#BBBBBB']
+
+# (label, timestamps, values) for one plotted entity
+GraphSeries = tuple[str, list[datetime], list[float]]
+
+
+def time_axis_format(span: timedelta) -> str:
+    """strftime format for time-axis labels: hours for up to two days, dates beyond."""
+    return "%H:%M" if span <= timedelta(hours=48) else "%d.%m"
+
+
+class GraphEngine:
+    """Warm matplotlib once and reuse one figure/canvas per layout."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._mpl: dict[str, Any] | None = None
+        self._figures: dict[tuple, tuple[Any, Any]] = {}
+        self.stats = {"renders": 0, "figures_created": 0}
+
+    @property
+    def warmed(self) -> bool:
+        return self._mpl is not None
+
+    def warm(self) -> bool:
+        """Import matplotlib/pyplot (blocking). False when matplotlib is missing."""
+        with self._lock:
+            return self._ensure_mpl()
+
+    def _ensure_mpl(self) -> bool:
+        if self._mpl is not None:
+            return True
+        try:
+            import matplotlib
+            matplotlib.use("Agg")
+            import matplotlib.dates as mdates
+            import matplotlib.pyplot as plt
+            from cycler import cycler
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+        except ImportError:
+            _LOGGER.debug("matplotlib not installed; history graph disabled")
+            return False
+        self._mpl = {
+            "plt": plt,
+            "mdates": mdates,
+            "cycler": cycler,
+            "Figure": Figure,
+            "FigureCanvasAgg": FigureCanvasAgg,
+        }
+        return True
+
+    def _figure_for(self, layout: dict) -> tuple[Any, Any]:
+        key = (tuple(layout["png_figsize"]), layout["is_portrait"], layout["is_joan13"])
+        found = self._figures.get(key)
+        if found is None:
+            fig = self._mpl["Figure"](
+                figsize=layout["png_figsize"], dpi=100, constrained_layout=False, facecolor="white"
+            )
+            found = (fig, self._mpl["FigureCanvasAgg"](fig))
+            self._figures[key] = found
+            self.stats["figures_created"] += 1
+        return found
+
+    def render(
+        self,
+        series: list[GraphSeries],
+        layout: dict,
+        graph_type: str,
+        show_points: bool,
+    ) -> bytes | None:
+        """PNG bytes of ``series`` drawn for ``layout`` (blocking: run in the executor)."""
+        if not series:
+            return None
+        with self._lock:
+            if not self._ensure_mpl():
+                return None
+            self.stats["renders"] += 1
+            return self._render_locked(series, layout, graph_type, show_points)
+
+    def _render_locked(
+        self,
+        series: list[GraphSeries],
+        layout: dict,
+        graph_type: str,
+        show_points: bool,
+    ) -> bytes:
+        plt = self._mpl["plt"]
+        mdates = self._mpl["mdates"]
+        is_joan13 = layout["is_joan13"]
+        is_portrait = layout["is_portrait"]
+        legend_font_size = layout["png_legend_font_size"]
+        # --- CONFIG SCALED BY SCREEN SIZE ---
+        my_params = {
+            'font.size': layout["png_font_size"],
+            'axes.titlesize': 22 if not is_joan13 else 30,
+            'axes.labelsize': 18 if not is_joan13 else 24,
+            'xtick.labelsize': 14 if not is_joan13 else 20,
+            'ytick.labelsize': 16 if not is_joan13 else 22,
+            'lines.linewidth': 4,
+            'lines.markersize': 10,
+            'figure.facecolor': 'white', 'axes.facecolor': 'white',
+            'savefig.facecolor': 'white', 'text.color': 'black', 'axes.labelcolor': 'black',
+            'xtick.color': 'black', 'ytick.color': 'black', 'axes.edgecolor': 'black',
+            'legend.fontsize': legend_font_size
+        }
+
+        fig, canvas = self._figure_for(layout)
+        fig.clear()
+        # Kontekst izolujący style
+        with plt.style.context(('grayscale', my_params)):
+            ax = fig.add_subplot(111)
+            ax.set_prop_cycle(self._mpl["cycler"]('linestyle', LINE_STYLES))
+            num_entities = len(series)
+
+            for i, (label, timestamps, values) in enumerate(series):
+                plot_args = {'label': label}
+                if graph_type == 'bar':
+                    # Węższe słupki (0.5 h), żeby się mniej stykały
+                    total_bar_width = timedelta(hours=0.5)
+                    bar_width = total_bar_width / max(1, num_entities)
+                    offset = (i - (num_entities - 1) / 2) * bar_width
+                    bar_timestamps = [ts + offset for ts in timestamps]
+                    plot_args['color'] = BAR_COLORS[i % len(BAR_COLORS)]
+                    # alpha + obwódka: widać słupki "z tyłu"
+                    ax.bar(bar_timestamps, values, width=bar_width, alpha=0.6, edgecolor='black', **plot_args)
+                else:
+                    if show_points:
+                        plot_args['marker'] = 'o'
+                    if graph_type == 'step':
+                        ax.step(timestamps, values, where='post', **plot_args)
+                    else:
+                        ax.plot(timestamps, values, **plot_args)
+
+            # Siatka i osie
+            ax.grid(True, which='major', linestyle='--', linewidth=1.5)
+            all_ts = [ts for _label, timestamps, _values in series for ts in timestamps]
+            ax.xaxis.set_major_formatter(mdates.DateFormatter(time_axis_format(max(all_ts) - min(all_ts))))
+
+            if is_portrait:
+                fig.autofmt_xdate(rotation=45, ha='right')
+            else:
+                fig.autofmt_xdate(rotation=0, ha='center')
+
+            # --- LEGENDA I MARGINESY ---
+            handles, labels = ax.get_legend_handles_labels()
+
+            if len(labels) >= 1:
+                fig.legend(
+                    handles, labels,
+                    loc='upper left',
+                    bbox_to_anchor=(0.02, 0.99),
+                    ncol=1,
+                    frameon=False,
+                    handlelength=1.8,
+                    handletextpad=0.6,
+                    borderaxespad=0.0,
+                    prop={"size": legend_font_size, "weight": "bold"},
+                )
+
+                approx_line_count = sum(max(1, str(lbl).count("\n") + 1) for lbl in labels)
+                top_margin = 0.96 - (layout["png_per_line_margin"] * approx_line_count)
+                top_margin = max(top_margin, layout["png_min_top"])
+
+                if is_portrait:
+                    fig.subplots_adjust(top=top_margin, bottom=0.08, left=0.14, right=0.98)
+                else:
+                    fig.subplots_adjust(top=top_margin, bottom=0.15, left=0.10, right=0.98)
+            else:
+                if is_portrait:
+                    fig.subplots_adjust(top=0.95, bottom=0.08, left=0.14, right=0.98)
+                else:
+                    fig.subplots_adjust(top=0.95, bottom=0.12, left=0.16, right=0.95)
+
+            buf = io.BytesIO()
+            canvas.print_png(buf)
+        return buf.getvalue()
+
+
+GRAPH_ENGINE = GraphEngine()
@@ -0,0 +1,289 @@
+"""History source for send_sensor_graph.
+
+Short windows read raw states (``history.get_significant_states``). Windows of
+``statistics_after_hours`` or longer read recorder long-term statistics instead:
+5-minute means up to a week (the recorder keeps short-term statistics for about
+10 days), hourly means beyond that. Query cost then depends on the window, not on
+how often the sensor reports. Entities without statistics (no ``state_class``)
+still fall back to raw states.
+
+Rows are returned per entity as the recorder gives them (``State`` objects or
+statistics mappings); ``downsample.series_from_rows`` reads both.
+
+``HistoryWindowCache`` keeps fetched rows per (entity, source) so repeated or
+overlapping requests only query the recorder for samples newer than the last
+fetch; a wider window than anything cached is fetched in full once. It holds at
+most ``HISTORY_CACHE_MAX_ROWS`` rows; least recently used windows go first, so a
+window too large for the budget is simply fetched in full each time.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any
+
+from homeassistant.components.recorder import get_instance, history
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTICS_SHORT_TERM_MAX = timedelta(days=7)
+
+SOURCE_STATES = "states"
+# Delta fetches overlap the previous end so rows committed late by the recorder are not missed
+HISTORY_DELTA_OVERLAP_S = 10.0
+HISTORY_MIN_REFETCH_S = 5.0
+HISTORY_CACHE_IDLE_S = 3600.0
+# About two days of a 1 Hz sensor; State objects are the bulk of the cache's memory
+HISTORY_CACHE_MAX_ROWS = 200_000
+
+# fetch(hass, entity_ids, start, end, initial) -> rows per entity
+HistoryFetcher = Callable[
+    [HomeAssistant, list[str], datetime, datetime, bool], Awaitable[dict[str, list[Any]]]
+]
+
+
+def row_epoch(row: Any) -> float:
+    """Timestamp of a State object or statistics row."""
+    if isinstance(row, Mapping):
+        raw = row.get("start")
+        return raw.timestamp() if isinstance(raw, datetime) else float(raw)
+    return row.last_updated.timestamp()
+
+
+def _row_at(row: Any, ts: float) -> dict[str, Any]:
+    """``row`` moved to ``ts`` (the state in force at the start of a window)."""
+    if isinstance(row, Mapping):
+        return {**row, "start": ts}
+    return {"start": ts, "state": row.state}
+
+
+def _utc(ts: float) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+@dataclass
+class _Window:
+    start_ts: float
+    end_ts: float
+    span_s: float
+    rows: list[Any]
+    row_ts: list[float]
+    used_ts: float
+
+
+class HistoryWindowCache:
+    """Rows already read from the recorder, per entity and source, extended by deltas."""
+
+    def __init__(
+        self, *, idle_s: float = HISTORY_CACHE_IDLE_S, max_rows: int = HISTORY_CACHE_MAX_ROWS
+    ) -> None:
+        self._idle_s = idle_s
+        self._max_rows = max(0, int(max_rows))
+        # Least recently used first
+        self._windows: OrderedDict[tuple[str, str], _Window] = OrderedDict()
+        self._stats = {"hits": 0, "delta_fetches": 0, "full_fetches": 0, "evictions": 0}
+
+    async def async_get(
+        self,
+        hass: HomeAssistant,
+        source: str,
+        entity_ids: list[str],
+        start_ts: float,
+        end_ts: float,
+        fetch: HistoryFetcher,
+    ) -> dict[str, list[Any]]:
+        """Rows from ``start_ts`` to ``end_ts`` per entity, fetching only what is missing."""
+        self._expire()
+        # Held locally: a concurrent call may expire or evict them while this one awaits the recorder.
+        windows: dict[str, _Window] = {}
+        full: list[str] = []
+        deltas: dict[float, list[str]] = {}
+        for entity_id in entity_ids:
+            window = self._windows.get((entity_id, source))
+            if window is None or window.start_ts > start_ts:
+                full.append(entity_id)
+                continue
+            windows[entity_id] = window
+            if end_ts - window.end_ts >= HISTORY_MIN_REFETCH_S:
+                # From the last cached sample: statistics rows appear only once their period is compiled.
+                last_ts = window.row_ts[-1] if window.row_ts else window.end_ts
+                delta_from = min(window.end_ts - HISTORY_DELTA_OVERLAP_S, last_ts)
+                deltas.setdefault(delta_from, []).append(entity_id)
+            else:
+                self._stats["hits"] += 1
+
+        if full:
+            self._stats["full_fetches"] += 1
+            fetched = await fetch(hass, full, _utc(start_ts), _utc(end_ts), True)
+            for entity_id in full:
+                rows = list(fetched.get(entity_id) or [])
+                windows[entity_id] = _Window(
+                    start_ts, end_ts, end_ts - start_ts, rows, [row_epoch(r) for r in rows], time.time()
+                )
+        for delta_from, group in deltas.items():
+            self._stats["delta_fetches"] += 1
+            fetched = await fetch(hass, group, _utc(delta_from), _utc(end_ts), False)
+            for entity_id in group:
+                self._extend(windows[entity_id], fetched.get(entity_id) or [], end_ts)
+
+        result: dict[str, list[Any]] = {}
+        for entity_id in entity_ids:
+            window = windows[entity_id]
+            window.used_ts = time.time()
+            window.span_s = max(window.span_s, end_ts - start_ts)
+            self._trim(window, end_ts - window.span_s)
+            rows = self._slice(window, start_ts, source)
+            if rows:
+                result[entity_id] = rows
+            self._windows[(entity_id, source)] = window
+            self._windows.move_to_end((entity_id, source))
+        self._evict()
+        return result
+
+    @staticmethod
+    def _extend(window: _Window, rows: list[Any], end_ts: float) -> None:
+        last_ts = window.row_ts[-1] if window.row_ts else float("-inf")
+        for row in rows:
+            ts = row_epoch(row)
+            if ts > last_ts:
+                window.rows.append(row)
+                window.row_ts.append(ts)
+                last_ts = ts
+        window.end_ts = end_ts
+
+    @staticmethod
+    def _trim(window: _Window, keep_from_ts: float) -> None:
+        # Keep one row before the cut: it is the state in force at the window start.
+        cut = max(0, bisect_left(window.row_ts, keep_from_ts) - 1)
+        if cut:
+            del window.rows[:cut]
+            del window.row_ts[:cut]
+        window.start_ts = max(window.start_ts, keep_from_ts)
+
+    @staticmethod
+    def _slice(window: _Window, start_ts: float, source: str) -> list[Any]:
+        i = bisect_left(window.row_ts, start_ts)
+        rows = window.rows[i:]
+        if i and source == SOURCE_STATES:
+            rows.insert(0, _row_at(window.rows[i - 1], start_ts))
+        return rows
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self._idle_s
+        for key in [k for k, w in self._windows.items() if w.used_ts < cutoff]:
+            del self._windows[key]
+
+    def _evict(self) -> None:
+        total = sum(len(w.rows) for w in self._windows.values())
+        while total > self._max_rows and self._windows:
+            _key, window = self._windows.popitem(last=False)
+            total -= len(window.rows)
+            self._stats["evictions"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **self._stats,
+            "windows": len(self._windows),
+            "rows": sum(len(w.rows) for w in self._windows.values()),
+        }
+
+
+def statistics_period_for(window: timedelta, statistics_after_hours: float) -> str | None:
+    """Statistics period for a window (``5minute`` / ``hour``), None = raw states."""
+    if statistics_after_hours <= 0 or window < timedelta(hours=statistics_after_hours):
+        return None
+    return "5minute" if window <= STATISTICS_SHORT_TERM_MAX else "hour"
+
+
+async def async_get_graph_history(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    start_time: datetime,
+    *,
+    statistics_after_hours: float,
+    cache: HistoryWindowCache | None = None,
+) -> dict[str, list[Any]]:
+    """Rows per entity for ``start_time``..now, from statistics or raw states."""
+    cache = cache or HistoryWindowCache()
+    now = dt_util.utcnow()
+    start_ts, end_ts = start_time.timestamp(), now.timestamp()
+    period = statistics_period_for(now - start_time, statistics_after_hours)
+    result: dict[str, list[Any]] = {}
+    if period is not None:
+        try:
+            result = await cache.async_get(
+                hass, period, entity_ids, start_ts, end_ts, partial(_async_fetch_statistics, period=period)
+            )
+        except Exception as err:  # noqa: BLE001 - raw states are always a valid fallback
+            _LOGGER.debug("Statistics query failed, using raw states: %s", err)
+        for entity_id, rows in result.items():
+            # Statistics stop at the last compiled period; the live state extends the line to now.
+            current = hass.states.get(entity_id)
+            if current is not None:
+                rows.append({"start": end_ts, "state": current.state})
+        _LOGGER.debug(
+            "Graph history from %s statistics for %s, raw states for the rest",
+            period,
+            sorted(result),
+        )
+    missing = [entity_id for entity_id in entity_ids if entity_id not in result]
+    if missing:
+        result.update(
+            await cache.async_get(hass, SOURCE_STATES, missing, start_ts, end_ts, _async_fetch_states)
+        )
+    return result
+
+
+async def _async_fetch_states(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    start_time: datetime,
+    end_time: datetime,
+    initial: bool,
+) -> dict[str, list[Any]]:
+    """Raw states; the initial fetch includes the state in force at ``start_time``."""
+    return await get_instance(hass).async_add_executor_job(
+        partial(
+            history.get_significant_states,
+            hass,
+            start_time,
+            end_time,
+            entity_ids=entity_ids,
+            significant_changes_only=False,
+            include_start_time_state=initial,
+            no_attributes=True,
+        )
+    ) or {}
+
+
+async def _async_fetch_statistics(
+    hass: HomeAssistant,
+    entity_ids: list[str],
+    start_time: datetime,
+    end_time: datetime,
+    initial: bool,
+    *,
+    period: str,
+) -> dict[str, list[Any]]:
+    """Long-term statistics rows (mean/min/max, or state for total sensors)."""
+    from homeassistant.components.recorder.statistics import statistics_during_period
+
+    return await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        start_time,
+        end_time,
+        set(entity_ids),
+        period,
+        None,
+        {"mean", "min", "max", "state"},
+    ) or {}
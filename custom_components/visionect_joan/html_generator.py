@@ -10,6 +10,10 @@ import base64
 import qrcode
 import calendar
 import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
 from pathlib import Path
 
 # matplotlib is optional - imported lazily inside graph functions
@@ -36,6 +40,11 @@ from homeassistant.util import dt as dt_util
 from homeassistant.const import UnitOfPower, UnitOfEnergy
 
 from .const import UNKNOWN_STRINGS, DOMAIN, resolve_tablet_content_lang
+from .content_fingerprint import volatile_span
+from .downsample import METHOD_LTTB, downsample, series_from_rows, to_datetimes
+from .graph_engine import GRAPH_ENGINE, time_axis_format
+from .svg_path import bars_path, dots_path, drop_collinear, quantize, relative_path, step_points
+from .icon_index import IconIndex, icon_css_class
 from .html_i18n import (
     tr,
     format_long_date as _i18n_format_long_date,
@@ -77,6 +86,33 @@ THEMED_FONTS = {
 GOOGLE_FONTS_IMPORT_URL = "https://fonts.googleapis.com/css2?family=Archivo+Black&family=Arbutus&family=Asimovian&family=Bangers&family=Blaka&family=Bungee&family=Bungee+Shade&family=Cherry+Bomb+One&family=Cinzel+Decorative:wght@400;700;900&family=Damion&family=Diplomata+SC&family=Fascinate&family=Joti+One&family=Libertinus+Keyboard&family=MedievalSharp&family=Michroma&family=New+Rocker&family=Rubik+Wet+Paint&family=Spicy+Rice&family=Story+Script&display=swap"
 
 ICON_CACHE = {}
+# Built once by async_setup_icon_index; until then icons are loaded lazily (ICON_CACHE).
+_ICON_INDEX: IconIndex | None = None
+
+# Deterministic mode: pages carry no render timestamp, so unchanged content hashes to
+# the same published file and URL. Cache-busting is then left to the URL (?cb=),
+# which urls_equivalent() ignores, so an unchanged screen is skipped before any PUT.
+# A context variable, not a module flag: each config entry renders in its own mode.
+_DETERMINISTIC_RENDER: ContextVar[bool] = ContextVar(
+    "visionect_joan_deterministic_render", default=True
+)
+
+
+@contextmanager
+def render_mode(*, deterministic: bool) -> Iterator[None]:
+    """Pages generated inside this block use the given deterministic_render setting."""
+    token = _DETERMINISTIC_RENDER.set(bool(deterministic))
+    try:
+        yield
+    finally:
+        _DETERMINISTIC_RENDER.reset(token)
+
+
+def _cache_buster_comment() -> str:
+    """Per-render marker in the page body (empty in deterministic mode)."""
+    if _DETERMINISTIC_RENDER.get():
+        return ""
+    return f'<!-- cb:{int(time.time())} -->'
 
 def _get_attr_as_float(attributes, key, default=0.0):
     val = attributes.get(key)
@@ -111,9 +147,20 @@ def _get_lang(hass) -> str:
     except Exception:
         return "en"
 
+async def async_setup_icon_index(hass) -> IconIndex:
+    """Scan and preload all bundled icons once (called from integration setup)."""
+    global _ICON_INDEX
+    if _ICON_INDEX is None:
+        _ICON_INDEX = await hass.async_add_executor_job(IconIndex.build, Path(__file__).parent)
+        _LOGGER.debug("Icon index built: %s icons", len(_ICON_INDEX))
+    return _ICON_INDEX
+
+
 async def async_get_icon_as_base64(hass, icon_name: str) -> str:
     if not icon_name:
         return ""
+    if _ICON_INDEX is not None:
+        return _ICON_INDEX.data_url(icon_name)
     
     cache_key = f"icon::{icon_name}"
     if cache_key in ICON_CACHE:
@@ -157,9 +204,18 @@ async def async_get_icon_as_base64(hass, icon_name: str) -> str:
 
 async def _get_icon_filename_for_entity(state) -> str:
     device_class = state.attributes.get("device_class")
-    domain = state.domain
-    entity_id = state.entity_id.lower()
     is_on_state = state.state in ["on", "open", "unlocked", "armed", "armed_away", "armed_home", "playing"]
+    return icon_name_for_entity(
+        state.entity_id.lower(),
+        state.domain,
+        device_class if isinstance(device_class, str) else None,
+        is_on_state,
+    )
+
+
+@lru_cache(maxsize=4096)
+def icon_name_for_entity(entity_id: str, domain: str, device_class: str | None, is_on_state: bool) -> str:
+    """Icon file for an entity (pure rules, memoized: the same entities repeat every render)."""
     if device_class == "door":
         return "door-open.svg" if is_on_state else "door-closed.svg"
     if device_class == "window":
@@ -515,6 +571,32 @@ async def _add_interactive_layer_to_url(
         _LOGGER.error(f"Failed to add interactive layer to URL: {e}")
         return data_url
 
+STATUS_ACTIVE_STATES = ["on", "open", "unlocked", "problem", "detected", "arming", "armed", "armed_away", "armed_home"]
+
+
+def status_panel_row(state, translations: dict) -> tuple[str, str, str]:
+    """(name, displayed state, css class) of one status panel row, as rendered."""
+    name = state.attributes.get('friendly_name', state.entity_id)
+    unit = state.attributes.get('unit_of_measurement', '')
+    raw = state.state
+
+    try:
+        val = float(raw)
+        if float(val).is_integer():
+            fmt_val = f"{int(val)}"
+        else:
+            fmt_val = f"{val:.1f}"
+        display_state_val = f"{fmt_val} {unit}" if unit else fmt_val
+    except (ValueError, TypeError):
+        low = str(raw).lower() if isinstance(raw, str) else raw
+        display_state_val = translations.get(low, raw)
+        if unit:
+            display_state_val = f"{display_state_val} {unit}"
+
+    state_class = "state-active" if state.state in STATUS_ACTIVE_STATES else ""
+    return str(name), str(display_state_val), state_class
+
+
 async def create_status_panel_url(hass, title: str, entity_ids: list[str], lang: str, orientation: str, screen_size: str = "joan6") -> str:
     translations = state_translations(lang)
     
@@ -523,37 +605,28 @@ async def create_status_panel_url(hass, title: str, entity_ids: list[str], lang:
     
     style_css = f""" body {{ font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif; background-color: white; color: black; margin: 0; padding: 30px; box-sizing: border-box; }} .header {{ text-align: center; font-size: {header_fs}; font-weight: bold; border-bottom: 3px solid black; padding-bottom: 20px; margin-bottom: 25px; }} .grid {{ display: grid; grid-template-columns: auto 1fr auto; gap: 20px 15px; align-items: center; font-size: {grid_fs}; }} .icon {{ width: 1.5em; height: 1.5em; }} .name {{ text-align: left; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }} .state {{ text-align: right; font-weight: bold; }} .state-active {{ color: #d32f2f; }} """
     items_html = ""
+    used_icons: set[str] = set()
     for entity_id in entity_ids:
         state = hass.states.get(entity_id)
         if not state:
             continue
 
-        name = state.attributes.get('friendly_name', entity_id)
         icon_filename = await _get_icon_filename_for_entity(state)
-        icon_data_url = await async_get_icon_as_base64(hass, icon_filename)
-
-        unit = state.attributes.get('unit_of_measurement', '')
-        raw = state.state
-
-        display_state_val = None
-        try:
-            val = float(raw)
-            if float(val).is_integer():
-                fmt_val = f"{int(val)}"
-            else:
-                fmt_val = f"{val:.1f}"
-            display_state_val = f"{fmt_val} {unit}" if unit else fmt_val
-        except (ValueError, TypeError):
-            low = str(raw).lower() if isinstance(raw, str) else raw
-            display_state_val = translations.get(low, raw)
-            if unit:
-                display_state_val = f"{display_state_val} {unit}"
-
-        state_class = "state-active" if state.state in ["on", "open", "unlocked", "problem", "detected", "arming", "armed", "armed_away", "armed_home"] else ""
-        items_html += f""" <img src="{icon_data_url}" class="icon" /> <div class="name">{html.escape(name)}</div> <div class="state {state_class}">{html.escape(str(display_state_val))}</div> """
+        if _ICON_INDEX is not None:
+            # Sprite: each distinct SVG is embedded once in the CSS, rows only reference it.
+            used_icons.add(icon_filename)
+            icon_html = f'<span class="icon {icon_css_class(icon_filename)}"></span>'
+        else:
+            icon_data_url = await async_get_icon_as_base64(hass, icon_filename)
+            icon_html = f'<img src="{icon_data_url}" class="icon" />'
+        name, display_state_val, state_class = status_panel_row(state, translations)
+        items_html += f""" {icon_html} <div class="name">{html.escape(name)}</div> <div class="state {state_class}">{html.escape(str(display_state_val))}</div> """
+    if used_icons:
+        style_css += " span.icon { display: inline-block; background-size: contain; background-repeat: no-repeat; background-position: center; } "
+        style_css += _ICON_INDEX.css_sheet(used_icons)
 
     html_body = f""" <div class="header">{html.escape(title)}</div> <div class="grid">{items_html}</div> """
-    cache_buster_comment = f'<!-- cb:{int(time.time())} -->'
+    cache_buster_comment = _cache_buster_comment()
     html_content = f'<!DOCTYPE html><html><head><meta charset="UTF-8"><style>{style_css}</style></head><body>{html_body}{cache_buster_comment}</body></html>'
     encoded = urllib.parse.quote(html_content, safe='')
     return f"data:text/html,{encoded}"
@@ -672,7 +745,7 @@ def create_text_message_url(message: str, text_color: str = "black", background_
             </div>
         """
 
-    cache_buster_comment = f'<!-- cb:{int(time.time())} -->'
+    cache_buster_comment = _cache_buster_comment()
     html_content = f'<!DOCTYPE html><html><head><meta charset="UTF-8"><style>{style_css}</style></head><body>{body_html}{cache_buster_comment}</body></html>'
     encoded = urllib.parse.quote(html_content, safe='')
     return f"data:text/html,{encoded}"
@@ -820,7 +893,7 @@ async def create_todo_list_url(
     {script_js}
     """
 
-    cache_buster_comment = f'<!-- cb:{int(time.time())} -->'
+    cache_buster_comment = _cache_buster_comment()
     html_content = f'<!DOCTYPE html><html><head><meta charset="UTF-8"><title>{html.escape(title)}</title><style>{style_css}</style></head><body>{html_body}{cache_buster_comment}</body></html>'
     encoded = urllib.parse.quote(html_content, safe='')
     return f"data:text/html,{encoded}"
@@ -950,7 +1023,7 @@ async def create_rss_feed_url(hass, title: str, items: list, lang: str, screen_s
     </script>
     """
 
-    cache_buster_comment = f'<!-- cb:{int(time.time())} -->'
+    cache_buster_comment = _cache_buster_comment()
     html_content = f'<!DOCTYPE html><html><head><meta charset="UTF-8"><style>{style_css}</style></head><body>{html_body}{cache_buster_comment}</body></html>'
     encoded = urllib.parse.quote(html_content, safe='')
     return f"data:text/html,{encoded}"
@@ -1052,7 +1125,7 @@ async def create_energy_panel_url(hass, states: dict[str], orientation: str, lan
             daily_stats_html = f'<div class="daily-stats">{"".join(daily_cards)}</div>'
 
         html_body = f"{main_stats_html}{'' if is_portrait else '<div class=divider></div>'}{daily_stats_html}"
-        cache_buster_comment = f'<!-- cb:{int(time.time())} -->'
+        cache_buster_comment = _cache_buster_comment()
         html_content = f'<!DOCTYPE html><html><head><meta charset="UTF-8"><title>{panel_title}</title><style>{style_css}</style></head><body>{html_body}{cache_buster_comment}</body></html>'
         encoded = urllib.parse.quote(html_content, safe='')
         return f"data:text/html,{encoded}"
@@ -1215,7 +1288,7 @@ async def create_energy_panel_url(hass, states: dict[str], orientation: str, lan
     c_br = corner_div(ic_home,   fmt_kwh(cons), consumption_lbl) if has_cons else ""
 
     # Pasek dolny budujemy ZAWSZE – niezależnie od encji
-    info_parts = [dt_str]
+    info_parts = [volatile_span(dt_str)]
     if has_prod or has_imp:
         info_parts.append(f"{self_suf_lbl}: {self_suf_pct}%")
     if has_prod or has_imp:
@@ -1269,7 +1342,7 @@ body {{
 """
 
 
-    cache_buster_comment = f'<!-- cb:{int(time.time())} -->'
+    cache_buster_comment = _cache_buster_comment()
     html_content = (
         f'<!DOCTYPE html><html><head><meta charset="UTF-8">'
         f'<title>{panel_title}</title>'
@@ -1532,7 +1605,7 @@ body {{
   {spark_html}
 </div>"""
 
-    cache_buster = f'<!-- cb:{int(time.time())} -->'
+    cache_buster = _cache_buster_comment()
     html_content = (
         f'<!DOCTYPE html><html><head><meta charset="UTF-8">'
         f'<title>{html.escape(title_text)}</title>'
@@ -1544,7 +1617,7 @@ body {{
         
     html_content += (
         f'<div class="rows">{rows_html}</div>'
-        f'<div class="info-bar">{updated_text}: {now_str}</div>'
+        f'<div class="info-bar">{updated_text}: {volatile_span(now_str)}</div>'
         f'{cache_buster}</body></html>'
     )
     encoded = urllib.parse.quote(html_content, safe='')
@@ -1741,7 +1814,7 @@ body {{
   {spark_html}
 </div>"""
 
-    cache_buster = f'<!-- cb:{int(time.time())} -->'
+    cache_buster = _cache_buster_comment()
     html_content = (
         f'<!DOCTYPE html><html><head><meta charset="UTF-8">'
         f'<title>{html.escape(title)}</title>'
@@ -1753,7 +1826,7 @@ body {{
         
     html_content += (
         f'<div class="rows">{rows_html}</div>'
-        f'<div class="info-bar">{updated_text}: {now_str}</div>'
+        f'<div class="info-bar">{updated_text}: {volatile_span(now_str)}</div>'
         f'{cache_buster}</body></html>'
     )
     encoded = urllib.parse.quote(html_content, safe='')
@@ -1779,7 +1852,7 @@ def create_qr_code_url(qr_data: str, message: str = "", qr_message_text_size: in
         message_margin = "margin-top: 20px;" if qr_message_position == "below" else "margin-bottom: 20px;"
         message_html = f'<div style="{message_margin} font-size: {scaled_text}px; font-family: sans-serif;">{escaped_message}</div>' if message else ""
         flex_direction = "column-reverse" if qr_message_position == "above" else "column"
-        cache_buster_comment = f'<!-- cb:{int(time.time())} -->'
+        cache_buster_comment = _cache_buster_comment()
         html_content = f"""
         <!DOCTYPE html>
         <html>
@@ -1927,7 +2000,7 @@ def create_calendar_url(events: list, style: str = "modern", lang: str = "en", s
             .no-events {{ text-align: center; font-size: 1.4em; padding-top: 20%; grid-column: 1 / -1; }}
         """
     html_body_content = create_calendar_list_view_html(events, style, add_back_button=False, lang=lang)
-    cache_buster_comment = f'<!-- cb:{int(time.time())} -->'
+    cache_buster_comment = _cache_buster_comment()
     html_content = f'<!DOCTYPE html><html><head><meta charset="UTF-8"><title>{calendar_title}</title><style>{style_css}</style></head><body>{html_body_content}{cache_buster_comment}</body></html>'
     encoded = urllib.parse.quote(html_content, safe='')
     return f"data:text/html,{encoded}"
@@ -2406,7 +2479,7 @@ def create_monthly_calendar_url(year: int, month: int, events: list, lang: str =
             monthly_view_html += f'<a href="#" onclick="showView(\'{view_id}\'); return false;" class="{" ".join(class_list)}">{day_number_html}</a>'
         monthly_view_html += '</div>'
     monthly_view_html += '</div></div>'
-    cache_buster_comment = f'<!-- cb:{int(time.time())} -->'
+    cache_buster_comment = _cache_buster_comment()
     html_content = f'<!DOCTYPE html><html><head><meta charset="UTF-8"><title>{calendar_title}</title><style>{style_css}</style><script>{js_script}</script></head><body>{monthly_view_html}{daily_views_html}{cache_buster_comment}</body></html>'
     encoded = urllib.parse.quote(html_content, safe='')
     return f"data:text/html,{encoded}"
@@ -2587,25 +2660,24 @@ def create_sensor_graph_svg_data_url(
     screen_size: str = "joan6",
     graph_type: str = "line",
     image_rotation: int = 0,
+    show_points: bool = False,
 ) -> str | None:
-    """Generate SVG history graph as data URL (matplotlib-free fallback)."""
+    """Generate SVG history graph as data URL (matplotlib-free; line, step or bar)."""
     if not history_data:
         return None
 
     palette = ["#111111", "#3a3a3a", "#666666", "#8a8a8a", "#aaaaaa"]
     series: list[tuple[str, list[tuple[datetime, float]]]] = []
 
+    target_points = _get_sensor_graph_layout(screen_size, orientation)["svg_size"][0] * 2
+    if graph_type == "bar":
+        # Bars narrower than a few pixels are unreadable on e-ink.
+        target_points //= 8
     for entity_id in entity_ids:
-        states = history_data.get(entity_id) or []
-        pts: list[tuple[datetime, float]] = []
-        for state in states:
-            try:
-                if state.state in UNKNOWN_STRINGS:
-                    continue
-                val = float(str(state.state).replace(",", ".").strip())
-                pts.append((state.last_updated, val))
-            except (TypeError, ValueError):
-                continue
+        ts, values = downsample(
+            *series_from_rows(history_data.get(entity_id) or []), target_points, METHOD_LTTB
+        )
+        pts: list[tuple[datetime, float]] = list(zip(to_datetimes(ts), values))
         if pts:
             name = hass.states.get(entity_id).name if hass.states.get(entity_id) else entity_id
             series.append((str(name), pts))
@@ -2663,31 +2735,37 @@ def create_sensor_graph_svg_data_url(
     legend_cursor_y = legend_base_y
     for idx, (name, pts) in enumerate(series):
         color = palette[idx % len(palette)]
-        coords = []
-        for ts, val in pts:
-            x = pad_left + ((ts - min_t).total_seconds() / span_s) * inner_w
-            y = pad_top + (1.0 - ((val - min_v) / span_v)) * inner_h
-            coords.append((x, y))
+        # Whole pixels only: e-ink has nothing finer and the path stays short.
+        coords = quantize(
+            (
+                pad_left + ((ts - min_t).total_seconds() / span_s) * inner_w,
+                pad_top + (1.0 - ((val - min_v) / span_v)) * inner_h,
+            )
+            for ts, val in pts
+        )
         if len(coords) < 1:
             continue
         if graph_type == "bar":
             n_series = max(1, len(series))
             bar_total_w = inner_w / max(8, len(coords))
-            bar_w = max(2.0, min(24.0, (bar_total_w * 0.72) / n_series))
-            for x, y in coords:
-                # center bars around timestamp; offset per series to avoid full overlap
-                x_center = x - (n_series * bar_w) / 2 + idx * bar_w + bar_w / 2
-                h = (pad_top + inner_h) - y
-                bars_svg.append(
-                    f'<rect x="{x_center - bar_w/2:.2f}" y="{y:.2f}" width="{bar_w:.2f}" height="{max(1.0, h):.2f}" '
-                    f'fill="{color}" fill-opacity="0.65" stroke="#111" stroke-width="0.8"/>'
-                )
+            bar_w = round(max(2.0, min(24.0, (bar_total_w * 0.72) / n_series)))
+            # center bars around timestamp; offset per series to avoid full overlap
+            offset = round((idx - (n_series - 1) / 2) * bar_w)
+            bars_svg.append(
+                f'<path d="{bars_path(coords, round(pad_top + inner_h), bar_w, offset)}" '
+                f'fill="{color}" fill-opacity="0.65" stroke="#111" stroke-width="0.8"/>'
+            )
         else:
-            if len(coords) >= 2:
+            line_pts = step_points(coords) if graph_type == "step" else coords
+            if len(line_pts) >= 2:
+                lines_svg.append(
+                    f'<path fill="none" stroke="{color}" stroke-width="4" stroke-linejoin="round" '
+                    f'd="{relative_path(drop_collinear(line_pts))}"/>'
+                )
+            if show_points:
                 lines_svg.append(
-                    f'<polyline fill="none" stroke="{color}" stroke-width="4" points="'
-                    + " ".join(f"{x:.2f},{y:.2f}" for x, y in coords)
-                    + '"/>'
+                    f'<path fill="none" stroke="{color}" stroke-width="10" stroke-linecap="round" '
+                    f'd="{dots_path(coords)}"/>'
                 )
         wrapped = wrapped_names[idx]
         mark_y = legend_cursor_y + ((len(wrapped) * legend_line_h) / 2)
@@ -2712,11 +2790,12 @@ def create_sensor_graph_svg_data_url(
         y_labels.append(f'<text x="{pad_left-10}" y="{y+5:.2f}" text-anchor="end" font-size="{axis_fs}" fill="#333">{val:.1f}</text>')
 
     x_labels = []
+    axis_fmt = time_axis_format(max_t - min_t)
     for i in range(5):
         x = pad_left + (i / 4) * inner_w
         ts = min_t + timedelta(seconds=span_s * (i / 4))
         axis_fs = layout["axis_font"]
-        x_labels.append(f'<text x="{x:.2f}" y="{height-20}" text-anchor="middle" font-size="{axis_fs}" fill="#333">{ts.strftime("%H:%M")}</text>')
+        x_labels.append(f'<text x="{x:.2f}" y="{height-20}" text-anchor="middle" font-size="{axis_fs}" fill="#333">{ts.strftime(axis_fmt)}</text>')
 
     cx = width / 2
     cy = height / 2
@@ -2803,142 +2882,28 @@ def _generate_graph_image(
         _LOGGER.warning(f"No historical data provided for entities: {entity_ids}")
         return None
 
-    if not _check_matplotlib():
-        _LOGGER.debug("matplotlib not installed; history graph disabled")
-        return None
-
-    import matplotlib
-    matplotlib.use("Agg")
-    import matplotlib.pyplot as plt
-    import matplotlib.dates as mdates
-    from cycler import cycler
-    from matplotlib.figure import Figure
-    from matplotlib.backends.backend_agg import FigureCanvasAgg
-
     layout = _get_sensor_graph_layout(screen_size, orientation)
-    is_joan13 = layout["is_joan13"]
-    is_portrait = layout["is_portrait"]
-    font_size = layout["png_font_size"]
-    legend_font_size = layout["png_legend_font_size"]
-    # --- CONFIG SCALED BY SCREEN SIZE ---
-    my_params = {
-        'font.size': font_size,
-        'axes.titlesize': 22 if not is_joan13 else 30,
-        'axes.labelsize': 18 if not is_joan13 else 24,
-        'xtick.labelsize': 14 if not is_joan13 else 20,
-        'ytick.labelsize': 16 if not is_joan13 else 22,
-        'lines.linewidth': 4,
-        'lines.markersize': 10,
-        'figure.facecolor': 'white', 'axes.facecolor': 'white',
-        'savefig.facecolor': 'white', 'text.color': 'black', 'axes.labelcolor': 'black',
-        'xtick.color': 'black', 'ytick.color': 'black', 'axes.edgecolor': 'black',
-        'legend.fontsize': legend_font_size
-    }
-
-    line_cycler = (cycler('linestyle', ['-', '--', ':', '-.']))
-    bar_colors = ['#222222', '#666666', '#999999', '#BBBBBB']
-
-    figsize = layout["png_figsize"]
-
-    # Kontekst izolujący style
-    with plt.style.context(('grayscale', my_params)):
-        fig = Figure(figsize=figsize, dpi=100, constrained_layout=False)
-        canvas = FigureCanvasAgg(fig)
-        ax = fig.add_subplot(111)
-        
-        has_data = False
-        ax.set_prop_cycle(line_cycler)
-        num_entities = len(entity_ids)
-
-        for i, entity_id in enumerate(entity_ids):
-            if entity_id not in history_data: continue
-            states = history_data[entity_id]
-            timestamps, values = [], []
-            for state in states:
-                try:
-                    if state.state not in UNKNOWN_STRINGS:
-                        val_str = str(state.state).replace(',', '.').strip()
-                        values.append(float(val_str))
-                        timestamps.append(state.last_updated)
-                except (ValueError, TypeError): continue
-            if not values: continue
-            has_data = True
-            
-            entity_state = hass.states.get(entity_id)
-            entity_name_raw = str(entity_state.name if entity_state else entity_id)
-            wrap_chars = layout["wrap_chars"] + (2 if is_portrait else 0)
-            entity_name = "\n".join(textwrap.wrap(entity_name_raw, width=wrap_chars) or [entity_name_raw])
-            
-            plot_args = {'label': entity_name}
-            
-            if graph_type == 'line':
-                if show_points: plot_args['marker'] = 'o'
-                ax.plot(timestamps, values, **plot_args)
-                
-            elif graph_type == 'bar':
-                # ZMIANA: Zmniejszono szerokość z 0.8 na 0.5 (żeby się mniej stykały)
-                total_bar_width = timedelta(hours=0.5)
-                bar_width = total_bar_width / max(1, num_entities)
-                offset = (i - (num_entities - 1) / 2) * bar_width
-                bar_timestamps = [ts + offset for ts in timestamps]
-                plot_args['color'] = bar_colors[i % len(bar_colors)]
-                
-                # ZMIANA: Dodano alpha=0.6 (przezroczystość) i edgecolor (obwódkę)
-                # Dzięki temu widać słupki "z tyłu"
-                ax.bar(bar_timestamps, values, width=bar_width, alpha=0.6, edgecolor='black', **plot_args)
-                
-            else:
-                if show_points: plot_args['marker'] = 'o'
-                ax.plot(timestamps, values, **plot_args)
-
-        if not has_data: return None
-
-        # Siatka i osie
-        ax.grid(True, which='major', linestyle='--', linewidth=1.5)
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
-        
-        if is_portrait:
-            fig.autofmt_xdate(rotation=45, ha='right')
-        else:
-            fig.autofmt_xdate(rotation=0, ha='center')
-
-        # --- LEGENDA I MARGINESY ---
-        handles, labels = ax.get_legend_handles_labels()
-        
-        if len(labels) >= 1:
-            fig.legend(
-                handles, labels,
-                loc='upper left',
-                bbox_to_anchor=(0.02, 0.99),
-                ncol=1,
-                frameon=False,
-                handlelength=1.8,
-                handletextpad=0.6,
-                borderaxespad=0.0,
-                prop={"size": legend_font_size, "weight": "bold"},
-            )
-            
-            approx_line_count = sum(max(1, str(lbl).count("\n") + 1) for lbl in labels)
-            per_line_margin = layout["png_per_line_margin"]
-            top_margin = 0.96 - (per_line_margin * approx_line_count)
-            min_top = layout["png_min_top"]
-            if top_margin < min_top:
-                top_margin = min_top
-
-            if is_portrait:
-                fig.subplots_adjust(top=top_margin, bottom=0.08, left=0.14, right=0.98)
-            else:
-                fig.subplots_adjust(top=top_margin, bottom=0.15, left=0.10, right=0.98)
-        else:
-            if is_portrait:
-                fig.subplots_adjust(top=0.95, bottom=0.08, left=0.14, right=0.98)
-            else:
-                fig.subplots_adjust(top=0.95, bottom=0.12, left=0.16, right=0.95)
+    wrap_chars = layout["wrap_chars"] + (2 if layout["is_portrait"] else 0)
+    # ~2 points per pixel column of the rendered figure (dpi 100).
+    target_points = int(layout["png_figsize"][0] * 100) * 2
+    series = []
+    for entity_id in entity_ids:
+        if entity_id not in history_data: continue
+        rows = history_data[entity_id]
+        # Too many periods to draw each one: bucket their min/max so spikes survive.
+        ts, values = downsample(*series_from_rows(rows, extremes=len(rows) > target_points), target_points)
+        if not values: continue
+        timestamps = to_datetimes(ts)
+
+        entity_state = hass.states.get(entity_id)
+        entity_name_raw = str(entity_state.name if entity_state else entity_id)
+        entity_name = "\n".join(textwrap.wrap(entity_name_raw, width=wrap_chars) or [entity_name_raw])
+        series.append((entity_name, timestamps, values))
 
-        buf = io.BytesIO()
-        canvas.print_png(buf)
-        buf.seek(0)
-        return buf.getvalue()
+    if not series:
+        return None
+    # Shared engine: matplotlib warmed once, one reusable figure per layout.
+    return GRAPH_ENGINE.render(series, layout, graph_type, show_points)
 
 async def create_weather_url(
     hass, 
@@ -3219,7 +3184,7 @@ async def create_weather_url(
                 """
             html_body += '</div>'
 
-    cache_buster_comment = f'<!-- cb:{int(time.time())} -->'
+    cache_buster_comment = _cache_buster_comment()
     html_content = f'<!DOCTYPE html><html><head><meta charset="UTF-8"><title>{weather_title}</title><style>{style_css}</style></head><body>{html_body}{cache_buster_comment}</body></html>'
     encoded = urllib.parse.quote(html_content, safe='')
     return f"data:text/html,{encoded}"
@@ -3468,7 +3433,7 @@ async def create_button_panel_url(hass, title: str, buttons: list[dict], screen_
 
     header_html = f'<div class="header">{html.escape(title)}</div>' if title else ""
 
-    cache_buster_comment = f'<!-- cb:{int(time.time())} -->'
+    cache_buster_comment = _cache_buster_comment()
     html_body = f"""
     <div class="container">
         {header_html}
@@ -0,0 +1,71 @@
+"""Icon index for the HTML generators, built once at setup.
+
+Maps every bundled icon (``svg_button/`` wins over ``svg/``, the same order the
+generators always probed) to a preloaded base64 data URL, so rendering a panel
+never touches the filesystem. ``IconIndex.css_sheet`` turns a set of icons into
+CSS classes, letting a page embed each distinct SVG once instead of once per row.
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+import re
+from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+ICON_DIRS = ("svg_button", "svg")
+DEFAULT_ICON = "default.svg"
+
+
+def icon_css_class(icon_name: str) -> str:
+    stem = icon_name.rsplit(".", 1)[0]
+    return "ic-" + re.sub(r"[^a-zA-Z0-9_-]", "_", stem)
+
+
+class IconIndex:
+    """name -> data URL for all bundled icons."""
+
+    def __init__(self, data_urls: dict[str, str]) -> None:
+        self._data_urls = data_urls
+
+    @classmethod
+    def build(cls, base_dir: Path) -> IconIndex:
+        """Scan and encode the icon directories (blocking: run in the executor)."""
+        data_urls: dict[str, str] = {}
+        for dir_name in ICON_DIRS:
+            directory = base_dir / dir_name
+            if not directory.is_dir():
+                continue
+            for path in sorted(directory.glob("*.svg")):
+                if path.name in data_urls:
+                    continue
+                try:
+                    encoded = base64.b64encode(path.read_bytes()).decode("ascii")
+                except OSError as err:
+                    _LOGGER.error("Error encoding icon %s: %s", path.name, err)
+                    continue
+                data_urls[path.name] = f"data:image/svg+xml;base64,{encoded}"
+        return cls(data_urls)
+
+    def __len__(self) -> int:
+        return len(self._data_urls)
+
+    def __contains__(self, icon_name: str) -> bool:
+        return icon_name in self._data_urls
+
+    def data_url(self, icon_name: str) -> str:
+        """Data URL for ``icon_name`` (default icon when unknown, "" if that is missing too)."""
+        found = self._data_urls.get(icon_name)
+        if found is None:
+            _LOGGER.warning("Icon file not found: %s, using default.", icon_name)
+            found = self._data_urls.get(DEFAULT_ICON, "")
+        return found
+
+    def css_sheet(self, icon_names: list[str] | set[str]) -> str:
+        """One CSS rule per distinct icon (use with ``icon_css_class``)."""
+        return "".join(
+            f".{icon_css_class(name)}{{background-image:url('{self.data_url(name)}');}}"
+            for name in sorted(set(icon_names))
+        )
@@ -0,0 +1,153 @@
+"""Subscription-driven status panels (send_status_panel with live_update).
+
+The panel's entities are tracked with a state-change listener. Each event is
+formatted the way the panel would show it; only when a displayed row actually
+changes (e.g. ``21.3 °C`` -> ``21.4 °C``) is a re-render scheduled. Changes
+within ``debounce_s`` of the first one are coalesced into a single render + push.
+
+The rows count as displayed only once every tablet took the push. A push the
+battery guard held back (``skipped_guard``) is retried when the guard window
+ends (``retry_delay``), a failed one after ``LIVE_PANEL_RETRY_S``; the latest
+rows are rendered then, so no change is lost. Anything else pushed to a tablet
+(another service, sleep/wake, the low-battery screen) detaches it from its panel
+first (``async_detach_tablets``), so a later entity change cannot push over it.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import Event, callback
+from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+
+from .profile_tuning import normalize_device_uuid
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+LIVE_PANEL_RETRY_S = 60.0
+# Push results after which the tablet shows the rendered rows.
+_SHOWN_RESULTS = frozenset({"success", "skipped_unchanged"})
+
+
+class LiveStatusPanel:
+    """Per-panel model of displayed rows plus the listener that keeps it current."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entity_ids: list[str],
+        uuids: list[str],
+        *,
+        debounce_s: float,
+        format_row: Callable[[str], Hashable],
+        render: Callable[[], Awaitable[dict[str, str] | None]],
+        retry_delay: Callable[[list[str]], float] | None = None,
+    ) -> None:
+        self._hass = hass
+        self.entity_ids = list(entity_ids)
+        self.uuids = list(uuids)
+        self._debounce_s = max(0.0, float(debounce_s))
+        self._format_row = format_row
+        self._render = render
+        self._retry_delay = retry_delay
+        # Rows on the tablets vs. rows as the states are now.
+        self._model: dict[str, Hashable] = {}
+        self._latest: dict[str, Hashable] = {}
+        self._unsub_state: Callable[[], None] | None = None
+        self._unsub_timer: Callable[[], None] | None = None
+        self._stats = {"events": 0, "unchanged": 0, "renders": 0, "retries": 0}
+
+    @callback
+    def async_start(self, *, pushed: dict[str, str] | None = None) -> None:
+        """Snapshot the current rows and subscribe.
+
+        ``pushed`` is the outcome of the initial push; tablets that did not take it
+        get the rows again once the guard allows.
+        """
+        self._latest = {eid: self._format_row(eid) for eid in self.entity_ids}
+        self._model = dict(self._latest)
+        self._unsub_state = async_track_state_change_event(
+            self._hass, self.entity_ids, self._async_state_changed
+        )
+        if pushed and not self._all_shown(pushed):
+            self._model = {}
+            self._schedule_retry(pushed)
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_state is not None:
+            self._unsub_state()
+            self._unsub_state = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        self._stats["events"] += 1
+        entity_id = event.data["entity_id"]
+        row = self._format_row(entity_id)
+        if self._latest.get(entity_id) == row:
+            self._stats["unchanged"] += 1
+            return
+        self._latest[entity_id] = row
+        self._schedule(self._debounce_s)
+
+    @callback
+    def _schedule(self, delay: float) -> None:
+        if self._unsub_timer is None and self._unsub_state is not None:
+            self._unsub_timer = async_call_later(self._hass, delay, self._async_render_now)
+
+    @staticmethod
+    def _all_shown(results: dict[str, str]) -> bool:
+        return all(result in _SHOWN_RESULTS for result in results.values())
+
+    @callback
+    def _schedule_retry(self, results: dict[str, str]) -> None:
+        self._stats["retries"] += 1
+        held = [uuid for uuid, result in results.items() if result == "skipped_guard"]
+        if held and self._retry_delay is not None:
+            delay = max(self._debounce_s, self._retry_delay(held) + 1.0)
+        else:
+            delay = max(self._debounce_s, LIVE_PANEL_RETRY_S)
+        self._schedule(delay)
+
+    async def _async_render_now(self, _now=None) -> None:
+        self._unsub_timer = None
+        if self._latest == self._model:
+            return
+        rows = dict(self._latest)
+        self._stats["renders"] += 1
+        try:
+            results = await self._render() or {}
+        except Exception as err:
+            _LOGGER.warning("Live status panel render for %s failed: %s", self.uuids, err)
+            results = {uuid: "failure" for uuid in self.uuids}
+        if not self._all_shown(results):
+            self._schedule_retry(results)
+            return
+        self._model = rows
+        if self._latest != self._model:
+            # Changed again while the push was running.
+            self._schedule(self._debounce_s)
+
+    def stats(self) -> dict[str, Any]:
+        return {"entities": len(self.entity_ids), "tablets": len(self.uuids), **self._stats}
+
+
+@callback
+def async_detach_tablets(panels: dict[str, LiveStatusPanel], uuids: Iterable[str]) -> None:
+    """Stop live updates to ``uuids`` (keyed by normalized uuid); a panel left without tablets stops."""
+    for device_uuid in uuids:
+        key = normalize_device_uuid(device_uuid)
+        panel = panels.pop(key, None)
+        if panel is None:
+            continue
+        panel.uuids = [u for u in panel.uuids if normalize_device_uuid(u) != key]
+        if not panel.uuids:
+            panel.async_stop()
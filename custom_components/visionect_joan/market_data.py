@@ -0,0 +1,131 @@
+"""CryptoCompare market data for send_crypto (prices + hourly sparkline history).
+
+Price snapshots (``pricemultifull``) are reused for ``PRICE_SNAPSHOT_TTL_S`` so
+several tablet groups refreshed in a row share one request. Hourly closes
+(``histohour``) are cached per (symbol, currency); a refresh only asks for the
+hours since the last cached candle (the open candle is re-read, its close still
+moves). History requests for all coins run concurrently, at most
+``HISTORY_CONCURRENCY`` at a time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+_LOGGER = logging.getLogger(__name__)
+
+CRYPTOCOMPARE_API = "https://min-api.cryptocompare.com/data"
+REQUEST_TIMEOUT_S = 15
+PRICE_SNAPSHOT_TTL_S = 60
+HISTORY_REFRESH_S = 300
+HISTORY_CONCURRENCY = 4
+HISTORY_MAX_HOURS = 168
+HOUR_S = 3600
+
+
+class MarketData:
+    """Cached CryptoCompare price snapshots and hourly close history."""
+
+    def __init__(self, hass: HomeAssistant, *, concurrency: int = HISTORY_CONCURRENCY) -> None:
+        self._hass = hass
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        # currency -> symbol -> (fetched_ts, RAW entry)
+        self._prices: dict[str, dict[str, tuple[float, dict[str, Any]]]] = {}
+        # (symbol, currency) -> (fetched_ts, {hour_ts: close})
+        self._history: dict[tuple[str, str], tuple[float, dict[int, float]]] = {}
+        self._stats = {"price_requests": 0, "price_hits": 0, "history_requests": 0, "history_hits": 0}
+
+    async def _async_get_json(self, url: str) -> dict[str, Any] | None:
+        session = async_get_clientsession(self._hass)
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_S)) as resp:
+            if resp.status != 200:
+                _LOGGER.warning("send_crypto: CryptoCompare returned HTTP %s", resp.status)
+                return None
+            return await resp.json()
+
+    async def async_prices(self, symbols: list[str], currency: str) -> dict[str, dict[str, Any]]:
+        """RAW ``pricemultifull`` entry per symbol; fresh snapshots are not re-requested."""
+        now = time.monotonic()
+        snapshot = self._prices.setdefault(currency, {})
+        missing = [
+            sym for sym in symbols
+            if sym not in snapshot or now - snapshot[sym][0] > PRICE_SNAPSHOT_TTL_S
+        ]
+        if not missing:
+            self._stats["price_hits"] += 1
+        else:
+            self._stats["price_requests"] += 1
+            try:
+                data = await self._async_get_json(
+                    f"{CRYPTOCOMPARE_API}/pricemultifull?fsyms={','.join(missing)}&tsyms={currency}"
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as exc:
+                _LOGGER.error("send_crypto: price fetch failed: %s", exc)
+                data = None
+            for sym, per_currency in ((data or {}).get("RAW") or {}).items():
+                entry = (per_currency or {}).get(currency)
+                if entry:
+                    snapshot[sym] = (now, entry)
+        return {sym: snapshot[sym][1] for sym in symbols if sym in snapshot}
+
+    async def async_histories(
+        self, symbols: list[str], currency: str, hours: int
+    ) -> dict[str, list[float]]:
+        """Hourly closes for the last ``hours`` hours per symbol (oldest first)."""
+        if hours <= 0:
+            return {}
+        results = await asyncio.gather(
+            *(self._async_history(sym, currency, hours) for sym in symbols)
+        )
+        return dict(zip(symbols, results))
+
+    async def _async_history(self, sym: str, currency: str, hours: int) -> list[float]:
+        hours = min(hours, HISTORY_MAX_HOURS)
+        now = time.monotonic()
+        current_hour = int(time.time()) // HOUR_S * HOUR_S
+        window_start = current_hour - hours * HOUR_S
+        fetched_ts, closes = self._history.get((sym, currency), (0.0, {}))
+
+        if closes and min(closes) <= window_start:
+            last_hour = max(closes)
+            if last_hour >= current_hour and now - fetched_ts < HISTORY_REFRESH_S:
+                self._stats["history_hits"] += 1
+                limit = 0
+            else:
+                # Re-read the last cached (possibly still open) candle plus the new hours.
+                limit = max(1, (current_hour - last_hour) // HOUR_S)
+        else:
+            limit = hours
+
+        if limit:
+            async with self._semaphore:
+                self._stats["history_requests"] += 1
+                try:
+                    data = await self._async_get_json(
+                        f"{CRYPTOCOMPARE_API}/v2/histohour?fsym={sym}&tsym={currency}&limit={limit}"
+                    )
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as exc:
+                    _LOGGER.debug("send_crypto: history fetch for %s failed: %s", sym, exc)
+                    data = None
+            rows = ((data or {}).get("Data") or {}).get("Data") or []
+            if rows:
+                closes = dict(closes)
+                for row in rows:
+                    if row.get("time") is not None and row.get("close") is not None:
+                        closes[int(row["time"])] = float(row["close"])
+                oldest = current_hour - HISTORY_MAX_HOURS * HOUR_S
+                closes = {t: c for t, c in closes.items() if t >= oldest}
+                self._history[(sym, currency)] = (now, closes)
+
+        return [closes[t] for t in sorted(closes) if t >= window_start]
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._stats, "history_series": len(self._history)}
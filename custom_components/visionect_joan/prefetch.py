@@ -0,0 +1,142 @@
+"""Background prefetch of panel inputs for recurring pushes.
+
+A service call with ``prefetch_minutes`` says "this panel is pushed again in N
+minutes". Its data loaders (forecasts, calendar events, feeds, market data) are
+then re-run ``PREFETCH_LEAD_S`` before that time and their results kept, so the
+next call renders from warm data and its latency is mostly the VSS push. Each
+call re-arms its panel's timer; when the automation stops calling, the panel
+prefetches once more and goes quiet.
+
+Values are only served while younger than ``PREFETCH_FRESH_S``; otherwise (or
+without prefetching) loaders run inline exactly as before. Concurrent loads of
+the same key share one request. Loaders raise on failure, so only real data is
+kept; an inline caller passes the ``default`` it renders with instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+PREFETCH_LEAD_S = 45
+PREFETCH_FRESH_S = 180
+
+Loader = Callable[[], Awaitable[Any]]
+
+_RAISE = object()
+
+
+class PrefetchScheduler:
+    """Warm-data store plus per-panel timers that refresh it ahead of the next push."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        *,
+        lead_s: float = PREFETCH_LEAD_S,
+        fresh_s: float = PREFETCH_FRESH_S,
+    ) -> None:
+        self._hass = hass
+        self._lead_s = lead_s
+        self._fresh_s = fresh_s
+        self._values: dict[Hashable, tuple[float, Any]] = {}
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._timers: dict[str, CALLBACK_TYPE] = {}
+        self._stats = {"warm_hits": 0, "inline_loads": 0, "prefetch_runs": 0, "prefetch_errors": 0}
+
+    async def async_get(self, key: Hashable, loader: Loader, *, default: Any = _RAISE) -> Any:
+        """Prefetched value for ``key`` when still fresh, else the loader's result.
+
+        A failing loader raises unless ``default`` is given, which is returned instead.
+        """
+        found = self._values.get(key)
+        if found is not None and time.monotonic() - found[0] <= self._fresh_s:
+            self._stats["warm_hits"] += 1
+            return found[1]
+        self._stats["inline_loads"] += 1
+        try:
+            return await self._async_load(key, loader, keep=False)
+        except Exception as err:
+            if default is _RAISE:
+                raise
+            _LOGGER.debug("Loading %s failed: %s", key, err)
+            return default
+
+    async def _async_load(self, key: Hashable, loader: Loader, *, keep: bool) -> Any:
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = self._hass.loop.create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except Exception as err:
+            future.set_exception(err)
+            future.exception()  # retrieved: waiters re-raise it, nobody else has to
+            raise
+        else:
+            future.set_result(value)
+            if keep:
+                self._values[key] = (time.monotonic(), value)
+            return value
+        finally:
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(key, None)
+
+    @callback
+    def async_schedule(self, panel_id: str, interval_s: float, loaders: dict[Hashable, Loader]) -> None:
+        """(Re)arm ``panel_id`` to run ``loaders`` ``lead_s`` before the next push."""
+        self._cancel(panel_id)
+        self._expire()
+        if interval_s <= 0 or not loaders:
+            return
+
+        @callback
+        def _fire(_now: Any) -> None:
+            self._timers.pop(panel_id, None)
+            self._hass.async_create_background_task(
+                self._async_prefetch(panel_id, loaders), f"visionect_joan_prefetch_{panel_id}"
+            )
+
+        self._timers[panel_id] = async_call_later(
+            self._hass, max(1.0, interval_s - self._lead_s), _fire
+        )
+
+    async def _async_prefetch(self, panel_id: str, loaders: dict[Hashable, Loader]) -> None:
+        self._stats["prefetch_runs"] += 1
+        results = await asyncio.gather(
+            *(self._async_load(key, loader, keep=True) for key, loader in loaders.items()),
+            return_exceptions=True,
+        )
+        for key, result in zip(loaders, results):
+            if isinstance(result, Exception):
+                self._stats["prefetch_errors"] += 1
+                _LOGGER.debug("Prefetch %s: %s failed: %s", panel_id, key, result)
+
+    def _cancel(self, panel_id: str) -> None:
+        unsub = self._timers.pop(panel_id, None)
+        if unsub is not None:
+            unsub()
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self._fresh_s
+        for key in [k for k, (ts, _v) in self._values.items() if ts < cutoff]:
+            del self._values[key]
+
+    @callback
+    def async_stop(self) -> None:
+        for panel_id in list(self._timers):
+            self._cancel(panel_id)
+        self._values.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._stats, "scheduled_panels": len(self._timers), "warm_values": len(self._values)}
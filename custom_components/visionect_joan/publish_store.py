@@ -0,0 +1,218 @@
+"""Content-addressed store for generated tablet pages (<md5>.html).
+
+Pages go to the in-memory ``ScreenStore`` when one is attached (served by
+``screen_http``), otherwise to www/visionect_cache. An in-memory index remembers
+what was already published, so re-publishing a known page costs no I/O, and tags
+(e.g. ``low_battery``) answer classification questions without re-reading it.
+Each page also carries a canonical content fingerprint (see ``content_fingerprint``)
+used to skip pushes that would not change what the tablet shows.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import time
+import urllib.parse
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .content_fingerprint import fingerprint_html
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+    from .screen_http import ScreenStore
+
+_LOGGER = logging.getLogger(__name__)
+
+TAG_LOW_BATTERY = "low_battery"
+INDEX_MAX_ENTRIES = 2048
+_PAGE_NAME_RE = re.compile(r"^([0-9a-f]{32})\.html$")
+
+
+@dataclass
+class PublishedPage:
+    """Index row for one published page."""
+
+    content_hash: str
+    size: int
+    created: float
+    last_published: float
+    service: str | None = None
+    tags: set[str] = field(default_factory=set)
+    fingerprint: str | None = None
+
+    @property
+    def filename(self) -> str:
+        return f"{self.content_hash}.html"
+
+
+def content_hash_for(html: str) -> str:
+    return hashlib.md5(html.encode("utf-8")).hexdigest()
+
+
+class PublishStore:
+    """Write-once HTML pages keyed by content hash, with an in-memory index."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        cache_dir: Path,
+        max_entries: int = INDEX_MAX_ENTRIES,
+        screens: ScreenStore | None = None,
+    ) -> None:
+        self._hass = hass
+        self._cache_dir = cache_dir
+        self.screens = screens
+        self._max_entries = max(1, int(max_entries))
+        self._index: OrderedDict[str, PublishedPage] = OrderedDict()
+        # Pixel fingerprints of published images, keyed by file name (<md5>.png).
+        self._media_fingerprints: OrderedDict[str, str] = OrderedDict()
+        self._dir_ready = False
+        self._stats = {"published": 0, "index_hits": 0, "files_written": 0}
+
+    @property
+    def cache_dir(self) -> Path:
+        return self._cache_dir
+
+    def get(self, content_hash: str) -> PublishedPage | None:
+        return self._index.get(content_hash)
+
+    def _remember(self, page: PublishedPage) -> None:
+        self._index[page.content_hash] = page
+        self._index.move_to_end(page.content_hash)
+        while len(self._index) > self._max_entries:
+            self._index.popitem(last=False)
+
+    async def async_publish(
+        self,
+        html: str,
+        *,
+        service: str | None = None,
+        tags: Iterable[str] = (),
+    ) -> str:
+        """Publish ``html`` and return its filename inside the cache dir."""
+        content_hash = content_hash_for(html)
+        now = time.time()
+        self._stats["published"] += 1
+        page = self._index.get(content_hash)
+        # Memory tier may have expired the page since; then it is re-put below.
+        if page is not None and (self.screens is None or self.screens.has(page.filename)):
+            self._stats["index_hits"] += 1
+            page.last_published = now
+            page.tags.update(tags)
+            self._index.move_to_end(content_hash)
+            return page.filename
+
+        data = html.encode("utf-8")
+        filename = f"{content_hash}.html"
+        fingerprint = fingerprint_html(html, self.media_fingerprint)
+        if self.screens is not None:
+            self.screens.put(filename, data)
+            self._remember_new(content_hash, len(data), now, service, tags, fingerprint)
+            return filename
+
+        file_path = self._cache_dir / filename
+        make_dir = not self._dir_ready
+
+        def _write_file() -> bool:
+            if make_dir:
+                self._cache_dir.mkdir(parents=True, exist_ok=True)
+            if file_path.exists():
+                return False
+            file_path.write_bytes(data)
+            return True
+
+        if await self._hass.async_add_executor_job(_write_file):
+            self._stats["files_written"] += 1
+        self._dir_ready = True
+        self._remember_new(content_hash, len(data), now, service, tags, fingerprint)
+        return filename
+
+    def _remember_new(
+        self,
+        content_hash: str,
+        size: int,
+        now: float,
+        service: str | None,
+        tags: Iterable[str],
+        fingerprint: str | None,
+    ) -> None:
+        page = self._index.get(content_hash)
+        if page is not None:
+            page.last_published = now
+            page.tags.update(tags)
+            page.fingerprint = page.fingerprint or fingerprint
+            self._index.move_to_end(content_hash)
+            return
+        self._remember(
+            PublishedPage(
+                content_hash=content_hash,
+                size=size,
+                created=now,
+                last_published=now,
+                service=service,
+                tags=set(tags),
+                fingerprint=fingerprint,
+            )
+        )
+
+    def note_media(self, name: str, fingerprint: str) -> None:
+        """Remember the pixel fingerprint of a published image."""
+        self._media_fingerprints[name] = fingerprint
+        self._media_fingerprints.move_to_end(name)
+        while len(self._media_fingerprints) > self._max_entries:
+            self._media_fingerprints.popitem(last=False)
+
+    def media_fingerprint(self, name: str) -> str | None:
+        return self._media_fingerprints.get(name)
+
+    def page_for_url(self, url: str) -> PublishedPage | None:
+        """Index row of the published page ``url`` points at (any base URL / ?cb=)."""
+        path = urllib.parse.urlparse(url or "").path
+        match = _PAGE_NAME_RE.match(path.rsplit("/", 1)[-1])
+        return self._index.get(match.group(1)) if match else None
+
+    def fingerprint_for_url(self, url: str) -> str | None:
+        page = self.page_for_url(url)
+        return page.fingerprint if page is not None else None
+
+    def touch_url(self, url: str) -> None:
+        """Mark the page behind ``url`` as still in use (kept by cleanup)."""
+        page = self.page_for_url(url)
+        if page is not None:
+            page.last_published = time.time()
+
+    def record_existing(
+        self, content_hash: str, size: int, *, tags: Iterable[str] = ()
+    ) -> PublishedPage:
+        """Index a page found on disk (e.g. written before a restart)."""
+        page = self._index.get(content_hash)
+        if page is None:
+            now = time.time()
+            page = PublishedPage(content_hash, size, now, now)
+            self._remember(page)
+        page.tags.update(tags)
+        return page
+
+    def recently_published(self, since_ts: float) -> set[str]:
+        """Filenames re-published at or after ``since_ts`` (protected from cleanup)."""
+        return {p.filename for p in self._index.values() if p.last_published >= since_ts}
+
+    def forget(self, filenames: Iterable[str]) -> None:
+        """Drop index rows for files that were deleted from disk."""
+        for name in filenames:
+            if name.endswith(".html"):
+                self._index.pop(name[: -len(".html")], None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "indexed": len(self._index),
+            "indexed_bytes": sum(p.size for p in self._index.values()),
+            **self._stats,
+        }
@@ -0,0 +1,131 @@
+"""Optional local rasterization of generated pages (HTML -> grayscale PNG).
+
+VSS normally lays out and rasterizes every HTML page in its own WebKit before
+dithering it for e-ink. With a raster backend configured, the page is rendered
+here at the tablet's exact resolution, reduced to the panel's gray levels with
+Floyd-Steinberg dithering and published as a PNG inside a tiny image-only page.
+
+Backends are external headless browsers found on PATH (``wkhtmltoimage`` or
+Chromium); nothing is bundled. Gray-level pre-dithering needs Pillow and is
+skipped (PNG passed through) when it is not installed.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+_LOGGER = logging.getLogger(__name__)
+
+RASTER_BACKEND_NONE = "none"
+RASTER_BACKEND_AUTO = "auto"
+RASTER_TIMEOUT_S = 30
+
+# backend name -> executables tried in order
+_BACKEND_EXECUTABLES = {
+    "wkhtmltoimage": ("wkhtmltoimage",),
+    "chromium": ("chromium", "chromium-browser", "google-chrome", "headless_shell"),
+}
+
+
+@dataclass(frozen=True)
+class RasterBackend:
+    """A headless browser able to screenshot a local HTML file."""
+
+    name: str
+    executable: str
+
+    def _argv(self, html_path: Path, png_path: Path, width: int, height: int) -> list[str]:
+        if self.name == "wkhtmltoimage":
+            return [
+                self.executable, "--quiet", "--format", "png",
+                "--width", str(width), "--height", str(height),
+                str(html_path), str(png_path),
+            ]
+        return [
+            self.executable, "--headless", "--disable-gpu", "--no-sandbox",
+            "--hide-scrollbars", f"--window-size={width},{height}",
+            f"--screenshot={png_path}", html_path.as_uri(),
+        ]
+
+    def render(self, html: str, width: int, height: int) -> bytes:
+        """Screenshot ``html`` at ``width`` x ``height`` (blocking: run in the executor)."""
+        with tempfile.TemporaryDirectory(prefix="visionect_raster_") as tmp:
+            html_path = Path(tmp) / "page.html"
+            png_path = Path(tmp) / "page.png"
+            html_path.write_text(html, encoding="utf-8")
+            subprocess.run(
+                self._argv(html_path, png_path, width, height),
+                check=True,
+                capture_output=True,
+                timeout=RASTER_TIMEOUT_S,
+            )
+            return png_path.read_bytes()
+
+
+def is_static_page(html: str) -> bool:
+    """True when a screenshot is equivalent to the page (no scripts, links or handlers)."""
+    lowered = html.lower()
+    return not any(marker in lowered for marker in ("<script", "onclick", "<a ", "<form"))
+
+
+def find_raster_backend(preference: str) -> RasterBackend | None:
+    """Backend for an option value (``none`` / ``auto`` / backend name), if installed."""
+    preference = (preference or RASTER_BACKEND_NONE).strip().lower()
+    if preference == RASTER_BACKEND_NONE:
+        return None
+    names = list(_BACKEND_EXECUTABLES) if preference == RASTER_BACKEND_AUTO else [preference]
+    for name in names:
+        for executable in _BACKEND_EXECUTABLES.get(name, ()):
+            path = shutil.which(executable)
+            if path:
+                return RasterBackend(name, path)
+    _LOGGER.warning("Raster backend %r not found on PATH; publishing HTML", preference)
+    return None
+
+
+def dither_gray(gray, levels: int):
+    """Floyd-Steinberg dither of a Pillow ``L`` image to ``levels`` evenly spaced grays."""
+    from PIL import Image
+
+    levels = max(2, min(256, int(levels)))
+    palette_img = Image.new("P", (1, 1))
+    ramp: list[int] = []
+    for i in range(levels):
+        v = round(i * 255 / (levels - 1))
+        ramp.extend((v, v, v))
+    palette_img.putpalette(ramp + [0, 0, 0] * (256 - levels))
+    return gray.convert("RGB").quantize(
+        palette=palette_img, dither=Image.Dither.FLOYDSTEINBERG
+    ).convert("L")
+
+
+def predither_gray(png: bytes, width: int, height: int, levels: int) -> bytes:
+    """Fit ``png`` to the panel and dither it to ``levels`` grays (Pillow; else unchanged)."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return png
+    with Image.open(io.BytesIO(png)) as img:
+        gray = img.convert("L")
+        if gray.size != (width, height):
+            gray = gray.resize((width, height), Image.LANCZOS)
+        dithered = dither_gray(gray, levels)
+        out = io.BytesIO()
+        dithered.save(out, format="PNG", optimize=True)
+        return out.getvalue()
+
+
+def image_page_html(image_url: str, width: int, height: int) -> str:
+    """Image-only wrapper page VSS shows instead of the original HTML."""
+    return (
+        '<!DOCTYPE html><html><head><meta charset="UTF-8"><style>'
+        "html,body{margin:0;padding:0;background:#fff;overflow:hidden;}"
+        f"img{{display:block;width:{width}px;height:{height}px;}}"
+        f'</style></head><body><img src="{image_url}" alt=""/></body></html>'
+    )
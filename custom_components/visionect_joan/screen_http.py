@@ -0,0 +1,309 @@
+"""In-memory serving of generated screens (HTML pages, graph PNGs, snapshot JPEGs).
+
+Tablets fetch ``/api/visionect_joan/screen/<md5>.<ext>`` straight from RAM, so the
+common case costs no SD-card writes. Names are content hashes, which makes the
+ETag free and lets 304 answers skip the body entirely. Entries pushed out of the
+byte budget (or too large for it) spill over to ``www/visionect_cache`` and are
+still served from there; on shutdown the memory tier is flushed to disk so
+screens survive a restart.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+SCREEN_URL_PREFIX = "/api/visionect_joan/screen"
+GZIP_MIN_BYTES = 1024
+# Access-time bookkeeping for spilled files (protects them from cleanup while served).
+DISK_ACCESS_MAX_ENTRIES = 1024
+
+CONTENT_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+}
+_NAME_RE = re.compile(r"^[0-9a-f]{32}\.(html|png|jpg)$")
+
+
+@dataclass
+class ScreenBlob:
+    """One served file: raw bytes plus a lazily built gzip variant."""
+
+    data: bytes
+    content_type: str
+    touched: float
+    gzipped: bytes | None = None
+
+    async def async_gzip_body(self, hass: HomeAssistant) -> bytes:
+        """gzip variant, compressed in the executor on first use and kept."""
+        if self.gzipped is None:
+            self.gzipped = await hass.async_add_executor_job(
+                partial(gzip.compress, self.data, compresslevel=6)
+            )
+        return self.gzipped
+
+
+def screen_name_for(data: bytes, ext: str) -> str:
+    return f"{hashlib.md5(data).hexdigest()}.{ext}"
+
+
+def is_screen_name(name: str) -> bool:
+    return bool(_NAME_RE.match(name or ""))
+
+
+class ScreenStore:
+    """Byte-bounded LRU of served files with a disk spill-over tier."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        spill_dir: Path,
+        *,
+        max_bytes: int,
+        gzip_enabled: bool = True,
+    ) -> None:
+        self._hass = hass
+        self._spill_dir = spill_dir
+        self._max_bytes = max(1, int(max_bytes))
+        self.gzip_enabled = gzip_enabled
+        self._memory: OrderedDict[str, ScreenBlob] = OrderedDict()
+        self._bytes = 0
+        # Evicted blobs stay readable here until their executor write finishes.
+        self._spilling: dict[str, ScreenBlob] = {}
+        self._on_disk: set[str] = set()
+        self._disk_access: OrderedDict[str, float] = OrderedDict()
+        self._stats = {
+            "puts": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "not_found": 0,
+            "not_modified": 0,
+            "gzip_responses": 0,
+            "spilled": 0,
+        }
+
+    @property
+    def spill_dir(self) -> Path:
+        return self._spill_dir
+
+    def configure(self, *, max_bytes: int | None = None, gzip_enabled: bool | None = None) -> None:
+        if max_bytes is not None:
+            self._max_bytes = max(1, int(max_bytes))
+            self._enforce_budget()
+        if gzip_enabled is not None:
+            self.gzip_enabled = gzip_enabled
+
+    def has(self, name: str) -> bool:
+        return name in self._memory or name in self._spilling or name in self._on_disk
+
+    def put(self, name: str, data: bytes) -> None:
+        """Store ``data`` under a content-addressed ``name`` (no I/O unless it spills)."""
+        self._stats["puts"] += 1
+        now = time.time()
+        blob = self._memory.get(name)
+        if blob is not None:
+            blob.touched = now
+            self._memory.move_to_end(name)
+            return
+        ext = name.rsplit(".", 1)[-1]
+        blob = ScreenBlob(data, CONTENT_TYPES.get(ext, "application/octet-stream"), now)
+        if len(data) > self._max_bytes:
+            self._spill(name, blob)
+            return
+        self._memory[name] = blob
+        self._bytes += len(data)
+        self._enforce_budget()
+
+    def _enforce_budget(self) -> None:
+        while self._bytes > self._max_bytes and self._memory:
+            name, blob = self._memory.popitem(last=False)
+            self._bytes -= len(blob.data)
+            self._spill(name, blob)
+
+    def _spill(self, name: str, blob: ScreenBlob) -> None:
+        if name in self._on_disk or name in self._spilling:
+            return
+        self._spilling[name] = blob
+        self._stats["spilled"] += 1
+        path = self._spill_dir / name
+
+        def _write() -> None:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+            if not path.exists():
+                path.write_bytes(blob.data)
+
+        def _done(fut) -> None:
+            self._spilling.pop(name, None)
+            if fut.cancelled() or fut.exception() is not None:
+                _LOGGER.warning("Visionect screen %s could not be spilled to disk", name)
+                return
+            self._on_disk.add(name)
+
+        self._hass.async_add_executor_job(_write).add_done_callback(_done)
+
+    async def async_get(self, name: str) -> ScreenBlob | None:
+        now = time.time()
+        blob = self._memory.get(name)
+        if blob is not None:
+            self._stats["memory_hits"] += 1
+            blob.touched = now
+            self._memory.move_to_end(name)
+            return blob
+        blob = self._spilling.get(name)
+        if blob is not None:
+            self._stats["memory_hits"] += 1
+            return blob
+
+        path = self._spill_dir / name
+
+        def _read() -> bytes | None:
+            try:
+                return path.read_bytes()
+            except FileNotFoundError:
+                return None
+
+        data = await self._hass.async_add_executor_job(_read)
+        if data is None:
+            self._on_disk.discard(name)
+            self._stats["not_found"] += 1
+            return None
+        self._stats["disk_hits"] += 1
+        self._on_disk.add(name)
+        self._disk_access[name] = now
+        self._disk_access.move_to_end(name)
+        while len(self._disk_access) > DISK_ACCESS_MAX_ENTRIES:
+            self._disk_access.popitem(last=False)
+        ext = name.rsplit(".", 1)[-1]
+        return ScreenBlob(data, CONTENT_TYPES.get(ext, "application/octet-stream"), now)
+
+    def recently_used(self, since_ts: float) -> set[str]:
+        """Names put or served at or after ``since_ts`` (protected from cleanup)."""
+        used = {n for n, b in self._memory.items() if b.touched >= since_ts}
+        used.update(n for n, ts in self._disk_access.items() if ts >= since_ts)
+        return used
+
+    def expire(self, older_than_ts: float, keep: Iterable[str] = ()) -> list[str]:
+        """Drop memory entries not touched since ``older_than_ts`` (no disk write)."""
+        keep = set(keep)
+        dropped = [
+            n for n, b in self._memory.items() if b.touched < older_than_ts and n not in keep
+        ]
+        for name in dropped:
+            self._bytes -= len(self._memory.pop(name).data)
+        return dropped
+
+    def forget_disk(self, names: Iterable[str]) -> None:
+        for name in names:
+            self._on_disk.discard(name)
+            self._disk_access.pop(name, None)
+
+    async def async_flush(self) -> None:
+        """Write the memory tier to disk (HA shutdown) so pushed URLs keep resolving."""
+        pending = {n: b.data for n, b in self._memory.items() if n not in self._on_disk}
+        if not pending:
+            return
+        spill_dir = self._spill_dir
+
+        def _write_all() -> None:
+            spill_dir.mkdir(parents=True, exist_ok=True)
+            for name, data in pending.items():
+                path = spill_dir / name
+                if not path.exists():
+                    path.write_bytes(data)
+
+        await self._hass.async_add_executor_job(_write_all)
+        self._on_disk.update(pending)
+
+    def count(self, key: str) -> None:
+        self._stats[key] += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "gzip_enabled": self.gzip_enabled,
+            "known_on_disk": len(self._on_disk),
+            **self._stats,
+        }
+
+
+def _etag_matches(header: str | None, etags: tuple[str, ...]) -> bool:
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in etags:
+            return True
+    return False
+
+
+class VisionectJoanScreenView(HomeAssistantView):
+    """Unauthenticated GET for generated screens (same exposure as /local/)."""
+
+    url = SCREEN_URL_PREFIX + "/{name}"
+    name = "api:visionect_joan:screen"
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+
+    async def get(self, request: web.Request, name: str) -> web.StreamResponse:
+        store: ScreenStore | None = self.hass.data.get(DOMAIN, {}).get("screen_store")
+        if store is None or not is_screen_name(name):
+            return web.Response(status=404, text="Not found.", content_type="text/plain")
+
+        blob = await store.async_get(name)
+        if blob is None:
+            return web.Response(status=404, text="Not found.", content_type="text/plain")
+
+        stem = name.rsplit(".", 1)[0]
+        use_gzip = (
+            store.gzip_enabled
+            and blob.content_type.startswith("text/")
+            and len(blob.data) >= GZIP_MIN_BYTES
+            and "gzip" in (request.headers.get("Accept-Encoding") or "").lower()
+        )
+        etag = f'"{stem}-gz"' if use_gzip else f'"{stem}"'
+        headers = {
+            "ETag": etag,
+            # Content-addressed: a name never changes its bytes.
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(request.headers.get("If-None-Match"), (f'"{stem}"', f'"{stem}-gz"')):
+            store.count("not_modified")
+            return web.Response(status=304, headers=headers)
+
+        body = blob.data
+        if use_gzip:
+            body = await blob.async_gzip_body(self.hass)
+            headers["Content-Encoding"] = "gzip"
+            store.count("gzip_responses")
+        headers["Content-Type"] = blob.content_type
+        return web.Response(body=body, headers=headers)
@@ -74,3 +74,34 @@ def infer_screen_size_from_device(device_details: dict | None) -> str:
             return "joan13"
 
     return "joan6"
+
+
+# Native panel resolution per size class (landscape), used when Displays[] has no size.
+SCREEN_RESOLUTIONS = {
+    "joan6": (1024, 758),
+    "joan13": (1600, 1200),
+}
+
+
+def device_resolution(device_details: dict | None, rotation: str | int = "0") -> tuple[int, int]:
+    """(width, height) in px the tablet shows a page at, honouring ``DisplayRotation``.
+
+    ``rotation`` is the VSS code (``DISPLAY_ROTATIONS``): "0"/"2" portrait,
+    "1"/"3" landscape, the same split the page generators use.
+    """
+    width = height = 0
+    if isinstance(device_details, dict):
+        displays = device_details.get("Displays")
+        if isinstance(displays, list) and displays and isinstance(displays[0], dict):
+            d0 = displays[0]
+            try:
+                width = int(d0.get("Width") or d0.get("NativeWidth") or 0)
+                height = int(d0.get("Height") or d0.get("NativeHeight") or 0)
+            except (TypeError, ValueError):
+                width = height = 0
+    if width <= 0 or height <= 0:
+        width, height = SCREEN_RESOLUTIONS[infer_screen_size_from_device(device_details)]
+    long_side, short_side = max(width, height), min(width, height)
+    if str(rotation) in ("0", "2"):
+        return short_side, long_side
+    return long_side, short_side
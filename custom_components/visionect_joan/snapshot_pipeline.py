@@ -0,0 +1,116 @@
+"""Camera frames prepared for e-ink before they are published (send_camera_snapshot).
+
+Cameras hand out full-resolution JPEGs (often 2-4K, several MB) while a Joan
+panel shows 1024x758 or 1600x1200 grays. ``prepare_snapshot`` decodes the frame
+at reduced size (JPEG draft mode), fits it into the tablet's box, converts it to
+grayscale and either re-encodes it as a small JPEG or, when asked, dithers it to
+the panel's gray levels as a PNG. Without Pillow the frame is passed through.
+
+``SnapshotRing`` is the legacy ``www/`` publishing path (memory tier off): each
+camera and fit box writes into a fixed ring of ``SNAPSHOT_RING_SIZE`` files
+instead of a new uniquely named file per call, so disk use stays bounded and
+nothing has to be swept after every snapshot. The box is part of the file name:
+a call fitting the frame for several panel sizes never overwrites a frame another
+tablet's page still points to. An unchanged frame reuses its slot.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import logging
+import re
+from collections import OrderedDict
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+from .raster_render import dither_gray
+
+_LOGGER = logging.getLogger(__name__)
+
+SNAPSHOT_RING_SIZE = 3
+SNAPSHOT_JPEG_QUALITY = 85
+SNAPSHOT_FILE_PREFIX = "visionect_snapshot_"
+
+
+def prepare_snapshot(
+    image: bytes, width: int, height: int, gray_levels: int | None = None
+) -> tuple[bytes, str]:
+    """Frame fitted into ``width`` x ``height`` in grayscale -> (bytes, extension).
+
+    Blocking: run in the executor. ``gray_levels`` dithers to that many grays (PNG);
+    otherwise the result is a grayscale JPEG. Never upscales.
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return image, "jpg"
+    try:
+        with Image.open(io.BytesIO(image)) as img:
+            # JPEG decoders can scale by 1/2..1/8 while decoding: a 4K frame is
+            # never expanded to full size just to be shrunk again.
+            img.draft("L", (width, height))
+            frame = ImageOps.exif_transpose(img).convert("L")
+    except Exception as err:
+        _LOGGER.debug("Camera frame not decodable, publishing as is: %s", err)
+        return image, "jpg"
+    frame.thumbnail((max(1, width), max(1, height)), Image.LANCZOS)
+    out = io.BytesIO()
+    if gray_levels:
+        dither_gray(frame, gray_levels).save(out, format="PNG", optimize=True)
+        return out.getvalue(), "png"
+    frame.save(out, format="JPEG", quality=SNAPSHOT_JPEG_QUALITY, optimize=True)
+    return out.getvalue(), "jpg"
+
+
+class SnapshotRing:
+    """Fixed set of ``www/`` files per camera and fit box, rewritten round-robin."""
+
+    def __init__(self, hass: HomeAssistant, directory: Path, *, size: int = SNAPSHOT_RING_SIZE) -> None:
+        self._hass = hass
+        self._directory = directory
+        self._size = max(1, int(size))
+        # (camera, box) -> slot file name -> content digest, oldest first
+        self._rings: dict[tuple[str, tuple[int, int]], OrderedDict[str, str]] = {}
+        self._stats = {"written": 0, "reused": 0}
+
+    def _slot_names(self, camera_entity_id: str, box: tuple[int, int], ext: str) -> list[str]:
+        slug = re.sub(r"[^a-z0-9]+", "_", camera_entity_id.lower()).strip("_")
+        return [f"{SNAPSHOT_FILE_PREFIX}{slug}_{box[0]}x{box[1]}_{i}.{ext}" for i in range(self._size)]
+
+    async def async_write(
+        self, camera_entity_id: str, box: tuple[int, int], data: bytes, ext: str
+    ) -> tuple[str, str]:
+        """Store ``data`` fitted into ``box`` in its ring -> (file name, short content digest)."""
+        digest = hashlib.md5(data).hexdigest()[:12]
+        ring = self._rings.setdefault((camera_entity_id, box), OrderedDict())
+        for name, known in list(ring.items()):
+            # The periodic media cleanup may have removed a slot nobody rewrote for a day.
+            if known == digest and name.endswith(f".{ext}") and await self._hass.async_add_executor_job(
+                (self._directory / name).is_file
+            ):
+                ring.move_to_end(name)
+                self._stats["reused"] += 1
+                return name, digest
+
+        free = [n for n in self._slot_names(camera_entity_id, box, ext) if n not in ring]
+        name = free[0] if free else next(iter(ring))
+        path = self._directory / name
+
+        def _write() -> None:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_bytes(data)
+            tmp.replace(path)
+
+        await self._hass.async_add_executor_job(_write)
+        ring.pop(name, None)
+        ring[name] = digest
+        while len(ring) > self._size:
+            ring.popitem(last=False)
+        self._stats["written"] += 1
+        return name, digest
+
+    def stats(self) -> dict[str, int]:
+        return {**self._stats, "cameras": len({camera for camera, _box in self._rings}), "rings": len(self._rings)}
@@ -0,0 +1,98 @@
+"""Compact SVG path building for the matplotlib-free sensor graph.
+
+Points are snapped to whole pixels (an e-ink panel has nothing finer), repeated
+and collinear points are dropped, and the rest is written as relative path
+commands (``h``/``v``/``l``) so a graph of a few hundred points stays a few KB
+inside the data URL.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+Point = tuple[int, int]
+
+
+def quantize(points: Iterable[tuple[float, float]]) -> list[Point]:
+    """Round to integer pixels, dropping consecutive duplicates."""
+    out: list[Point] = []
+    for x, y in points:
+        p = (round(x), round(y))
+        if not out or out[-1] != p:
+            out.append(p)
+    return out
+
+
+def drop_collinear(points: list[Point]) -> list[Point]:
+    """Remove points lying on a straight run between their neighbours.
+
+    Only points continuing in the same direction go; a reversal (a min/max spike
+    inside one pixel column) is kept.
+    """
+    if len(points) < 3:
+        return list(points)
+    out = [points[0]]
+    for i in range(1, len(points) - 1):
+        (x0, y0), (x1, y1), (x2, y2) = out[-1], points[i], points[i + 1]
+        cross = (x1 - x0) * (y2 - y0) - (y1 - y0) * (x2 - x0)
+        forward = (x1 - x0) * (x2 - x1) + (y1 - y0) * (y2 - y1)
+        if cross != 0 or forward <= 0:
+            out.append(points[i])
+    out.append(points[-1])
+    return out
+
+
+def step_points(points: list[Point]) -> list[Point]:
+    """Hold each value until the next sample (post step)."""
+    out: list[Point] = []
+    for i, (x, y) in enumerate(points):
+        if i:
+            out.append((x, points[i - 1][1]))
+        out.append((x, y))
+    return out
+
+
+def _pair(dx: int, dy: int) -> str:
+    return f"{dx}{'' if dy < 0 else ' '}{dy}"
+
+
+def relative_path(points: list[Point]) -> str:
+    """``d`` attribute: absolute move, then relative h/v/l; repeated ``l`` letters omitted."""
+    if not points:
+        return ""
+    x, y = points[0]
+    parts = [f"M{_pair(x, y)}"]
+    last_cmd = "M"
+    for nx, ny in points[1:]:
+        dx, dy = nx - x, ny - y
+        if dy == 0:
+            parts.append(f"h{dx}")
+            last_cmd = "h"
+        elif dx == 0:
+            parts.append(f"v{dy}")
+            last_cmd = "v"
+        elif last_cmd == "l":
+            parts.append(f"{'' if dx < 0 else ' '}{_pair(dx, dy)}")
+        else:
+            parts.append(f"l{_pair(dx, dy)}")
+            last_cmd = "l"
+        x, y = nx, ny
+    return "".join(parts)
+
+
+def dots_path(points: list[Point]) -> str:
+    """Zero-length segments: drawn as dots with ``stroke-linecap="round"``."""
+    return "".join(f"M{_pair(x, y)}h0" for x, y in points)
+
+
+def bars_path(points: list[Point], baseline: int, width: int, offset: int = 0) -> str:
+    """One closed rectangle per point from ``baseline`` up to the value."""
+    width = max(1, width)
+    parts = []
+    for x, y in points:
+        left = x + offset - width // 2
+        height = baseline - y
+        if height <= 0:
+            height = 1
+        parts.append(f"M{_pair(left, baseline)}v{-height}h{width}v{height}z")
+    return "".join(parts)
@@ -0,0 +1,78 @@
+"""Shared fakes for the integration tests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+from unittest.mock import MagicMock
+
+import aiohttp
+import pytest
+
+# respond(url, request headers) -> (status, bytes body or JSON payload, response headers)
+Responder = Callable[[str, dict[str, str]], tuple[int, Any, dict[str, str]]]
+
+
+class FakeResponse:
+    """``session.get(...)`` context manager with a fixed status, body and headers."""
+
+    def __init__(self, session: FakeSession, status: int, body: Any, headers: dict[str, str]) -> None:
+        self._session = session
+        self.status = status
+        self._body = body
+        self.headers = headers
+
+    async def __aenter__(self) -> FakeResponse:
+        self._session.in_flight += 1
+        self._session.max_in_flight = max(self._session.max_in_flight, self._session.in_flight)
+        return self
+
+    async def __aexit__(self, *exc) -> bool:
+        self._session.in_flight -= 1
+        return False
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(MagicMock(), (), status=self.status)
+
+    async def read(self) -> bytes:
+        await asyncio.sleep(self._session.delay_s)
+        return self._body
+
+    async def json(self) -> Any:
+        await asyncio.sleep(self._session.delay_s)
+        return self._body
+
+
+class FakeSession:
+    """aiohttp session stand-in: records GETs, answers them with ``respond``, tracks concurrency."""
+
+    def __init__(self) -> None:
+        self.respond: Responder = lambda url, headers: (404, b"", {})
+        self.delay_s = 0.0
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def get(self, url: str, headers: dict[str, str] | None = None, timeout: Any = None) -> FakeResponse:
+        request_headers = dict(headers or {})
+        self.requests.append((url, request_headers))
+        return FakeResponse(self, *self.respond(url, request_headers))
+
+
+@pytest.fixture
+def fake_http() -> FakeSession:
+    return FakeSession()
+
+
+@pytest.fixture
+def executor_hass() -> MagicMock:
+    """MagicMock hass whose executor jobs run inline."""
+
+    async def run_in_executor(func, *args):
+        return func(*args)
+
+    hass = MagicMock()
+    hass.async_add_executor_job = run_in_executor
+    return hass
@@ -2,17 +2,26 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
+from custom_components.visionect_joan import api as api_mod
 from custom_components.visionect_joan.api import VisionectAPI
 
 
+def _hass() -> MagicMock:
+    hass = MagicMock()
+    hass.async_create_background_task = lambda coro, name: asyncio.get_running_loop().create_task(coro)
+    return hass
+
+
 def _api() -> VisionectAPI:
-    return VisionectAPI(MagicMock(), "http://127.0.0.1:8081")
+    return VisionectAPI(_hass(), "http://127.0.0.1:8081")
 
 
 def test_session_payload_for_put_minimal() -> None:
@@ -71,3 +80,212 @@ def test_normalize_url_for_battery_guard_cb() -> None:
         "http://ha/local/a.html?x=1&cb=2"
     )
     assert a == b
+
+
+class _FakeResponse:
+    def __init__(self, status: int, headers: dict | None = None, body=None) -> None:
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> bool:
+        return False
+
+    async def json(self, content_type=None):
+        return self._body
+
+    async def read(self):
+        return self._body
+
+    async def text(self, errors="strict"):
+        return "" if self._body is None else str(self._body)
+
+
+class _FakeSession:
+    def __init__(self, responses: list[_FakeResponse]) -> None:
+        self._responses = list(responses)
+        self.calls: list[tuple[str, str, dict]] = []
+
+    def request(self, method: str, url: str, **kwargs):
+        self.calls.append((method, url, kwargs))
+        return self._responses.pop(0)
+
+
+async def test_request_hmac_signs_and_serializes_json() -> None:
+    api = VisionectAPI(_hass(), "http://127.0.0.1:8081", api_key="k", api_secret="s")
+    api.authenticated_by = "api_key_hmac"
+    session = _FakeSession([_FakeResponse(204)])
+    api._http_session = session
+
+    assert await api._request("put", "/api/session/abc", json={"Uuid": "abc"}) is True
+    method, url, kwargs = session.calls[0]
+    assert method == "PUT"
+    assert url == "http://127.0.0.1:8081/api/session/abc"
+    assert kwargs["data"] == '{"Uuid":"abc"}'
+    assert kwargs["allow_redirects"] is False
+    assert kwargs["headers"]["Authorization"].startswith("k:")
+
+
+async def test_request_redirect_and_http_error_return_none() -> None:
+    api = _api()
+    api._http_session = _FakeSession(
+        [
+            _FakeResponse(302, {"Location": "/login"}),
+            _FakeResponse(500, body="boom"),
+        ]
+    )
+    assert await api._request("get", "/api/device/", silent=True) is None
+    assert await api._request("get", "/api/device/", silent=True) is None
+
+
+async def test_request_decodes_json_payload() -> None:
+    api = _api()
+    api._http_session = _FakeSession(
+        [_FakeResponse(200, {"Content-Type": "application/json"}, [{"Uuid": "a"}])]
+    )
+    assert await api._request("get", "/api/device/") == [{"Uuid": "a"}]
+
+
+async def test_fleet_snapshot_serves_rows_without_detail_get() -> None:
+    api = _api()
+    full = {"Uuid": "AA", "State": "online", "Status": {"Battery": "80"}, "Options": {}, "Displays": []}
+    partial = {"Uuid": "bb"}
+    session = _FakeSession(
+        [
+            _FakeResponse(200, {"Content-Type": "application/json"}, [full, partial]),
+            _FakeResponse(200, {"Content-Type": "application/json"}, {"Uuid": "bb", "Status": {}}),
+        ]
+    )
+    api._http_session = session
+
+    a = await api.async_get_device_data("aa", fetch_session=False, prefer_fleet=True)
+    b = await api.async_get_device_data("bb", fetch_session=False, prefer_fleet=True)
+    again = await api.async_get_device_data("aa", fetch_session=False, prefer_fleet=True)
+
+    assert a["Status"]["Battery"] == "80" and again["Uuid"] == "AA"
+    assert b["Uuid"] == "bb"
+    assert [url.rsplit("8081", 1)[1] for _, url, _ in session.calls] == [
+        "/api/device/",
+        "/api/device/bb",
+    ]
+    assert api.get_fleet_metrics() == {
+        "fleet_list_fetches": 1,
+        "fleet_rows_used": 2,
+        "detail_fetches": 1,
+    }
+    # Snapshot rows are copied, normalisation must not leak into the shared list.
+    assert "Config" not in full
+
+
+async def test_concurrent_identical_gets_share_one_request() -> None:
+    class _SlowResponse(_FakeResponse):
+        async def __aenter__(self):
+            await asyncio.sleep(0.05)
+            return self
+
+    class _SlowSession(_FakeSession):
+        def request(self, method: str, url: str, **kwargs):
+            self.calls.append((method, url, kwargs))
+            return _SlowResponse(200, {"Content-Type": "application/json"}, {"Uuid": "a"})
+
+    api = _api()
+    session = _SlowSession([])
+    api._http_session = session
+
+    first, second = await asyncio.gather(
+        api._request("get", "/api/session/a"), api._request("get", "/api/session/a")
+    )
+    assert first == second == {"Uuid": "a"}
+    assert first is not second
+    assert len(session.calls) == 1
+    assert api.get_request_metrics() == {"get_issued": 1, "get_coalesced": 1}
+
+    await api._request("get", "/api/session/a")
+    assert len(session.calls) == 2
+
+
+async def test_session_data_stale_while_revalidate_and_invalidation() -> None:
+    api = _api()
+    clock = {"now": 1000.0}
+    api._session_cache._clock = lambda: clock["now"]
+    session = _FakeSession(
+        [
+            _FakeResponse(200, {"Content-Type": "application/json"}, {"Backend": {"Fields": {"url": "v1"}}}),
+            _FakeResponse(200, {"Content-Type": "application/json"}, {"Backend": {"Fields": {"url": "v2"}}}),
+            _FakeResponse(200, {"Content-Type": "application/json"}, {"Backend": {"Fields": {"url": "v3"}}}),
+        ]
+    )
+    api._http_session = session
+
+    first = await api.async_get_session_data("u1", allow_stale=True)
+    assert first["Backend"]["Fields"]["url"] == "v1"
+
+    clock["now"] += api._session_cache.ttl_s + 1
+    stale = await api.async_get_session_data("u1", allow_stale=True)
+    assert stale["Backend"]["Fields"]["url"] == "v1"
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert (await api.async_get_session_data("u1"))["Backend"]["Fields"]["url"] == "v2"
+
+    api._invalidate_session_cache("u1")
+    fresh = await api.async_get_session_data("u1", allow_stale=True)
+    assert fresh["Backend"]["Fields"]["url"] == "v3"
+    assert len(session.calls) == 3
+
+
+async def test_verification_after_put_never_reuses_an_older_get() -> None:
+    vss = {"url": "old"}
+
+    class _SnapshotResponse(_FakeResponse):
+        async def __aenter__(self):
+            await asyncio.sleep(0.05)
+            return self
+
+    class _VssSession(_FakeSession):
+        def request(self, method: str, url: str, **kwargs):
+            self.calls.append((method, url, kwargs))
+            if method.lower() == "put":
+                vss["url"] = json.loads(kwargs.get("data") or json.dumps(kwargs["json"]))["Backend"]["Fields"]["url"]
+                return _FakeResponse(200, {"Content-Type": "application/json"}, {})
+            # The body is what VSS had when the GET was received, answered later.
+            body = {"Backend": {"Name": "HTML", "Fields": {"url": vss["url"], "ReloadTimeout": "604800"}}}
+            return _SnapshotResponse(200, {"Content-Type": "application/json"}, body)
+
+    api = _api()
+    session = _VssSession([])
+    api._http_session = session
+
+    # A background read (e.g. stale-while-revalidate) is still in flight when the PUT goes out.
+    slow_read = asyncio.ensure_future(api.async_get_session_data("u1"))
+    await asyncio.sleep(0)
+    put_body = {"Backend": {"Name": "HTML", "Fields": {"url": "new"}}}
+    await api._request("put", "/api/session/u1", json=put_body)
+
+    assert await api._verify_session_configuration("u1", expected_url="new", expected_backend_name="HTML")
+    await slow_read
+    # The pre-write read is not cached over the verified session.
+    assert (await api.async_get_session_data("u1"))["Backend"]["Fields"]["url"] == "new"
+    assert api.get_request_metrics()["get_coalesced"] == 0
+
+
+async def test_only_the_dedicated_login_session_is_closed() -> None:
+    shared = MagicMock(closed=False, close=AsyncMock())
+    with patch.object(api_mod, "async_get_clientsession", return_value=shared):
+        api = VisionectAPI(_hass(), "http://127.0.0.1:8081", api_key="k", api_secret="s")
+        assert api._get_http_session() is shared
+        await api.async_close()
+    shared.close.assert_not_awaited()
+
+    sessions = [MagicMock(closed=False, close=AsyncMock()) for _ in range(2)]
+    with patch.object(api_mod, "async_create_clientsession", side_effect=sessions):
+        api = VisionectAPI(_hass(), "http://127.0.0.1:8081", username="u", password="p")
+        assert api._get_http_session() is sessions[0]
+        # Re-login replaces the cookie session; the old one is closed, not leaked.
+        await api._async_close_http_session()
+        assert api._get_http_session() is sessions[1]
+        await api.async_close()
+    sessions[0].close.assert_awaited_once()
+    sessions[1].close.assert_awaited_once()
@@ -0,0 +1,99 @@
+"""Tests for the bounded LRU + TTL cache."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from custom_components.visionect_joan.cache import LruTtlCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_expiry_and_lru_eviction() -> None:
+    clock = _Clock()
+    cache = LruTtlCache("t", ttl_s=10, max_entries=2, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "a" becomes most recently used
+    cache.set("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    clock.now += 11
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 3
+
+
+def test_byte_budget_evicts_oldest_and_rejects_oversized() -> None:
+    cache = LruTtlCache("png", ttl_s=60, max_entries=10, max_bytes=100)
+    cache.set("a", b"x" * 60)
+    cache.set("b", b"y" * 30)
+    cache.set("c", b"z" * 30)
+    assert "a" not in cache and "b" in cache and "c" in cache
+    assert cache.stats()["bytes"] == 60
+    cache.set("huge", b"h" * 500)
+    assert "huge" not in cache
+
+
+async def test_stale_while_revalidate_serves_stale_and_refreshes() -> None:
+    clock = _Clock()
+    cache = LruTtlCache("s", ttl_s=10, stale_s=100, clock=clock)
+    calls = {"n": 0}
+
+    async def loader():
+        calls["n"] += 1
+        return f"v{calls['n']}"
+
+    assert await cache.async_get_or_load("k", loader) == "v1"
+    clock.now += 20
+    assert await cache.async_get_or_load("k", loader) == "v1"
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert cache.get("k") == "v2"
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["revalidations"] == 1
+
+    clock.now += 500
+    assert await cache.async_get_or_load("k", loader) == "v3"
+    assert await cache.async_get_or_load("k", loader, force=True) == "v4"
+
+
+async def test_revalidation_uses_owner_task_factory_and_close_cancels_it() -> None:
+    clock = _Clock()
+    started: list[str] = []
+
+    def factory(coro, name):
+        started.append(name)
+        return asyncio.get_running_loop().create_task(coro)
+
+    cache = LruTtlCache("s", ttl_s=10, stale_s=100, clock=clock, task_factory=factory)
+    release = asyncio.Event()
+
+    async def loader():
+        await release.wait()
+        return "fresh"
+
+    cache.set("k", "old")
+    clock.now += 20
+    assert await cache.async_get_or_load("k", loader) == "old"
+    assert started == ["visionect_joan_s_revalidate"]
+    task = next(iter(cache._refreshing.values()))
+
+    cache.close()
+    await asyncio.sleep(0)
+    assert task.cancelled()
+    release.set()
+    assert cache.get_with_age("k", count=False)[0] == "old"
@@ -0,0 +1,73 @@
+"""Tests for the per-calendar event window cache."""
+
+from __future__ import annotations
+
+import sys
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.visionect_joan import calendar_cache
+from custom_components.visionect_joan.calendar_cache import CalendarEventCache
+
+
+async def test_events_are_served_from_window_until_it_moves_or_state_changes() -> None:
+    now = dt_util.utcnow()
+    soon = now + timedelta(hours=2)
+    raw = [
+        {"summary": "Past", "start": (now - timedelta(hours=3)).isoformat(), "end": (now - timedelta(hours=2)).isoformat()},
+        {"summary": "Meeting", "start": {"dateTime": soon.isoformat()}, "end": {"dateTime": (soon + timedelta(hours=1)).isoformat()}},
+        {"summary": "Later", "start": (now + timedelta(days=2)).isoformat(), "end": (now + timedelta(days=2, hours=1)).isoformat()},
+        {"summary": "Broken", "start": None},
+    ]
+    hass = MagicMock()
+    hass.services.async_call = AsyncMock(return_value={"calendar.home": {"events": raw}})
+    state = SimpleNamespace(state="off", last_updated=now)
+    hass.states.get.return_value = state
+    cache = CalendarEventCache(hass)
+
+    first = await cache.async_get_events("calendar.home", 1)
+    assert [e["summary"] for e in first] == ["Meeting"]
+    assert first[0]["start"] == soon
+    first[0]["summary"] = "edited by a renderer"
+
+    # Same window, unchanged calendar: no backend call, cached events untouched.
+    again = await cache.async_get_events("calendar.home", 1)
+    assert [e["summary"] for e in again] == ["Meeting"]
+    assert hass.services.async_call.await_count == 1
+
+    # A longer range runs past the cached window.
+    week = await cache.async_get_events("calendar.home", 7)
+    assert [e["summary"] for e in week] == ["Meeting", "Later"]
+    assert hass.services.async_call.await_count == 2
+
+    # The entity reports a new next event.
+    state.last_updated = now + timedelta(seconds=1)
+    await cache.async_get_events("calendar.home", 7)
+    assert hass.services.async_call.await_count == 3
+
+    # Old data is re-read even when nothing visible changed.
+    with patch.object(calendar_cache.time, "monotonic", return_value=calendar_cache.time.monotonic() + 3600):
+        await cache.async_get_events("calendar.home", 7)
+    assert hass.services.async_call.await_count == 4
+    assert cache.stats()["hits"] == 1
+
+
+async def test_failed_fetch_is_empty_or_raises_on_request() -> None:
+    hass = MagicMock()
+    hass.services.async_call = AsyncMock(side_effect=RuntimeError("backend down"))
+    hass.states.get.return_value = None
+    cache = CalendarEventCache(hass)
+
+    assert await cache.async_get_events("calendar.home", 1) == []
+    with pytest.raises(RuntimeError):
+        await cache.async_get_events("calendar.home", 1, raise_on_error=True)
+    assert cache.stats()["errors"] == 2
+    assert cache.stats()["calendars"] == 0
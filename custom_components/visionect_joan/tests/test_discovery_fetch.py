@@ -0,0 +1,61 @@
+"""Tests for the bounded parallel discovery fetch."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from custom_components.visionect_joan.__init__ import (  # noqa: PLC2701
+    _async_fetch_device_details_bounded,
+)
+
+
+class _FakeApi:
+    def __init__(self, delays: dict[str, float]):
+        self.delays = delays
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.session_calls: list[str] = []
+
+    async def async_get_device_data(
+        self, uuid: str, fetch_session: bool = False, prefer_fleet: bool = False
+    ):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(uuid, 0.01))
+        finally:
+            self.in_flight -= 1
+        if uuid == "missing":
+            return None
+        return {"Uuid": uuid, "Config": {}}
+
+    async def async_get_session_data(self, uuid: str, allow_stale: bool = False):
+        self.session_calls.append(uuid)
+        return {"Backend": {"Fields": {"url": f"http://x/{uuid}", "ReloadTimeout": "60"}}}
+
+
+async def test_fetch_is_bounded_and_fills_session_url() -> None:
+    api = _FakeApi({})
+    uuids = [f"u{i}" for i in range(7)] + ["missing"]
+    details, timed_out = await _async_fetch_device_details_bounded(
+        api, uuids, fetch_session=False, concurrency=3, timeout_s=5
+    )
+    assert api.max_in_flight == 3
+    assert sorted(details) == [f"u{i}" for i in range(7)]
+    assert details["u2"]["Config"]["Url"] == "http://x/u2"
+    assert details["u2"]["Config"]["ReloadTimeout"] == "60"
+    assert timed_out == set()
+
+
+async def test_fetch_times_out_slow_device_only() -> None:
+    api = _FakeApi({"slow": 1.0})
+    details, timed_out = await _async_fetch_device_details_bounded(
+        api, ["fast", "slow"], fetch_session=True, concurrency=4, timeout_s=0.1
+    )
+    assert list(details) == ["fast"]
+    assert timed_out == {"slow"}
+    assert api.session_calls == []
@@ -0,0 +1,78 @@
+"""Tests for sensor-graph history downsampling."""
+
+from __future__ import annotations
+
+import math
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from custom_components.visionect_joan import downsample as ds
+
+
+def _series(n: int = 20000) -> tuple[list[float], list[float]]:
+    ts = [1_700_000_000.0 + i for i in range(n)]
+    values = [math.sin(i / 500) * 10 for i in range(n)]
+    values[n * 2 // 3] = 99.0  # spike that must survive
+    return ts, values
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_minmax_keeps_extremes_and_bounds_size(monkeypatch, use_numpy: bool) -> None:
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(ds, "np", None)
+    ts, values = _series()
+    out_t, out_v = ds.downsample(ts, values, 1200)
+    assert len(out_t) <= 1200
+    assert max(out_v) == 99.0
+    assert min(out_v) == min(values)
+    assert out_t == sorted(out_t)
+
+
+def test_minmax_numpy_matches_python(monkeypatch) -> None:
+    pytest.importorskip("numpy")
+    ts, values = _series(5000)
+    values[100:140] = [3.0] * 40  # ties: the first occurrence wins in both
+    fast = ds.downsample(ts, values, 300)
+    monkeypatch.setattr(ds, "np", None)
+    assert fast == ds.downsample(ts, values, 300)
+
+
+def test_lttb_numpy_matches_python(monkeypatch) -> None:
+    pytest.importorskip("numpy")
+    ts, values = _series(5000)
+    fast = ds.downsample(ts, values, 300, ds.METHOD_LTTB)
+    monkeypatch.setattr(ds, "np", None)
+    slow = ds.downsample(ts, values, 300, ds.METHOD_LTTB)
+    assert len(fast[0]) == 300
+    assert fast == slow
+
+
+def test_series_from_states_and_statistics_rows() -> None:
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    states = [
+        SimpleNamespace(state="21,5", last_updated=t0),
+        SimpleNamespace(state="unavailable", last_updated=t0 + timedelta(minutes=1)),
+    ]
+    assert ds.series_from_rows(states) == ([t0.timestamp()], [21.5])
+    stats = [{"start": t0.timestamp(), "mean": 20.25}, {"start": t0, "mean": None, "state": "3"}]
+    assert ds.series_from_rows(stats) == ([t0.timestamp(), t0.timestamp()], [20.25, 3.0])
+
+
+def test_statistics_extremes_survive_minmax_downsampling() -> None:
+    rows = [{"start": 3600.0 * i, "mean": 20.0, "min": 19.5, "max": 20.5} for i in range(1000)]
+    rows[400] = {"start": 3600.0 * 400, "mean": 21.0, "min": 19.0, "max": 45.0}
+    ts, values = ds.downsample(*ds.series_from_rows(rows), 100)
+    assert max(values) == 21.0
+
+    ts, values = ds.downsample(*ds.series_from_rows(rows, extremes=True), 100)
+    assert (min(values), max(values)) == (19.0, 45.0)
+    assert ts == sorted(ts)
+    assert ds.series_from_rows([{"start": 0.0, "mean": 1.0}], extremes=True) == ([0.0], [1.0])
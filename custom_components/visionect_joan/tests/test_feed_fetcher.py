@@ -0,0 +1,68 @@
+"""Tests for the conditional-GET RSS fetcher."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from custom_components.visionect_joan import feed_fetcher
+from custom_components.visionect_joan.feed_fetcher import FeedFetcher
+
+RSS = b"""<?xml version="1.0"?><rss version="2.0"><channel><title>T</title>
+<item><title>First</title></item><item><title>Second</title></item>
+</channel></rss>"""
+
+
+async def test_conditional_get_and_parsed_cache(executor_hass, fake_http) -> None:
+    def respond(url, headers):
+        if headers.get("If-None-Match") == '"v1"':
+            return 304, b"", {}
+        return 200, RSS, {"ETag": '"v1"', "Content-Type": "application/rss+xml"}
+
+    fake_http.respond = respond
+    fetcher = FeedFetcher(executor_hass, recheck_s=0)
+
+    with (
+        patch.object(feed_fetcher, "async_get_clientsession", return_value=fake_http),
+        patch.object(feed_fetcher.feedparser, "parse", wraps=feed_fetcher.feedparser.parse) as parse,
+    ):
+        first = await fetcher.async_get_items("http://feed/rss", 5)
+        second = await fetcher.async_get_items("http://feed/rss", 1)
+
+    assert [i["title"] for i in first] == ["First", "Second"]
+    assert second == [{"title": "First"}]
+    assert fake_http.requests[1] == ("http://feed/rss", {"If-None-Match": '"v1"'})
+    assert parse.call_count == 1
+    assert fetcher.stats()["not_modified"] == 1
+
+    # Within the recheck window there is no request at all.
+    fetcher._recheck_s = 3600
+    with patch.object(feed_fetcher, "async_get_clientsession", return_value=fake_http):
+        await fetcher.async_get_items("http://feed/rss", 5)
+    assert len(fake_http.requests) == 2
+
+
+async def test_broken_feed_keeps_last_items_and_unknown_urls_leave_no_state(executor_hass, fake_http) -> None:
+    bodies = [RSS, RSS[:60]]  # the second download is cut off
+
+    def respond(url, headers):
+        if url == "http://feed/down":
+            raise aiohttp.ClientConnectionError("connection refused")
+        return 200, bodies.pop(0), {}
+
+    fake_http.respond = respond
+    fetcher = FeedFetcher(executor_hass, recheck_s=0)
+
+    with patch.object(feed_fetcher, "async_get_clientsession", return_value=fake_http):
+        assert len(await fetcher.async_get_items("http://feed/rss", 5)) == 2
+        # A 200 whose body does not parse does not replace the last good items.
+        assert len(await fetcher.async_get_items("http://feed/rss", 5)) == 2
+        assert await fetcher.async_get_items("http://feed/down", 5) == []
+
+    assert fetcher.stats()["errors"] == 2
+    assert list(fetcher._locks) == ["http://feed/rss"]
@@ -0,0 +1,111 @@
+"""Tests for the send_sensor_graph history source."""
+
+from __future__ import annotations
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.visionect_joan import graph_history
+from custom_components.visionect_joan.downsample import series_from_rows
+
+
+def test_statistics_period_for_window() -> None:
+    assert graph_history.statistics_period_for(timedelta(hours=24), 48) is None
+    assert graph_history.statistics_period_for(timedelta(days=3), 48) == "5minute"
+    assert graph_history.statistics_period_for(timedelta(days=30), 48) == "hour"
+    assert graph_history.statistics_period_for(timedelta(days=30), 0) is None
+
+
+async def test_long_window_uses_statistics_and_falls_back_per_entity(executor_hass) -> None:
+    start = dt_util.utcnow() - timedelta(days=3)
+    calls: list[tuple] = []
+
+    def fake_statistics(hass, start_time, end_time, ids, period, units, types):
+        calls.append(("stats", frozenset(ids), period))
+        return {"sensor.temp": [{"start": start.timestamp(), "mean": 20.5}]}
+
+    def fake_states(hass, start_time, end_time, *, entity_ids, **kwargs):
+        calls.append(("states", tuple(entity_ids)))
+        return {"sensor.text_like": [SimpleNamespace(state="3", last_updated=start)]}
+
+    hass = MagicMock()
+    hass.states.get = lambda entity_id: SimpleNamespace(state="21.0")
+
+    with (
+        # The recorder instance only runs executor jobs here.
+        patch.object(graph_history, "get_instance", return_value=executor_hass),
+        patch.object(graph_history.history, "get_significant_states", fake_states),
+        patch(
+            "homeassistant.components.recorder.statistics.statistics_during_period",
+            fake_statistics,
+        ),
+    ):
+        rows = await graph_history.async_get_graph_history(
+            hass, ["sensor.temp", "sensor.text_like"], start, statistics_after_hours=48
+        )
+
+    assert calls == [
+        ("stats", frozenset({"sensor.temp", "sensor.text_like"}), "5minute"),
+        ("states", ("sensor.text_like",)),
+    ]
+    assert series_from_rows(rows["sensor.temp"])[1] == [20.5, 21.0]
+    assert series_from_rows(rows["sensor.text_like"])[1] == [3.0]
+
+
+async def test_history_cache_fetches_only_the_delta() -> None:
+    t0 = 1_700_000_000.0
+    fetches: list[tuple] = []
+
+    def state(value: str, ts: float) -> SimpleNamespace:
+        return SimpleNamespace(state=value, last_updated=datetime.fromtimestamp(ts, tz=timezone.utc))
+
+    recorded = [state("1", t0), state("2", t0 + 1800), state("3", t0 + 7200)]
+
+    async def fetch(hass, entity_ids, start, end, initial):
+        fetches.append((start.timestamp(), end.timestamp(), initial))
+        rows = [r for r in recorded if start.timestamp() <= r.last_updated.timestamp() <= end.timestamp()]
+        return {entity_id: rows for entity_id in entity_ids}
+
+    cache = graph_history.HistoryWindowCache()
+    first = await cache.async_get(None, "states", ["sensor.a"], t0, t0 + 3600, fetch)
+    assert [r.state for r in first["sensor.a"]] == ["1", "2"]
+
+    # Same one-hour window an hour later: only the new samples are queried.
+    second = await cache.async_get(None, "states", ["sensor.a"], t0 + 3600, t0 + 7200, fetch)
+    assert fetches[1][2] is False
+    assert fetches[1][0] >= t0 + 1800
+    assert series_from_rows(second["sensor.a"]) == ([t0 + 3600, t0 + 7200], [2.0, 3.0])
+
+    # A wider window than anything cached is fetched in full.
+    await cache.async_get(None, "states", ["sensor.a"], t0 - 3600, t0 + 7200, fetch)
+    assert fetches[2][2] is True
+    assert cache.stats()["full_fetches"] == 2
+
+
+async def test_history_cache_is_bounded_and_survives_concurrent_expiry() -> None:
+    t0 = 1_700_000_000.0
+    cache = graph_history.HistoryWindowCache(max_rows=5)
+    expire_during_fetch = False
+
+    async def fetch(hass, entity_ids, start, end, initial):
+        if expire_during_fetch:
+            cache._windows.clear()  # another call expired everything meanwhile
+        ts = start.timestamp()
+        return {entity_id: [{"start": ts + i, "state": "1"} for i in range(3)] for entity_id in entity_ids}
+
+    await cache.async_get(None, "statistics", ["sensor.a"], t0, t0 + 60, fetch)
+    await cache.async_get(None, "statistics", ["sensor.b"], t0, t0 + 60, fetch)
+    # Six rows over a budget of five: the least recently used window goes.
+    assert (cache.stats()["windows"], cache.stats()["evictions"]) == (1, 1)
+
+    expire_during_fetch = True
+    rows = await cache.async_get(None, "statistics", ["sensor.b"], t0, t0 + 120, fetch)
+    assert [r["start"] - t0 for r in rows["sensor.b"]] == [0, 1, 2, 3, 4]
+    assert cache.stats()["windows"] == 1
@@ -0,0 +1,133 @@
+"""Tests for HTML generator helpers."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import math
+import sys
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from custom_components.visionect_joan import html_generator
+from custom_components.visionect_joan.graph_engine import GraphEngine
+from custom_components.visionect_joan.html_generator import (
+    create_text_message_url,
+    render_mode,
+)
+from custom_components.visionect_joan.icon_index import IconIndex
+from custom_components.visionect_joan.svg_path import (
+    drop_collinear,
+    quantize,
+    relative_path,
+    step_points,
+)
+
+
+def test_deterministic_render_is_stable_across_time() -> None:
+    with patch.object(html_generator.time, "time", return_value=1000.0):
+        first = create_text_message_url("Hello")
+    with patch.object(html_generator.time, "time", return_value=2000.0):
+        second = create_text_message_url("Hello")
+    assert first == second
+    assert "cb%3A" not in first
+
+    with render_mode(deterministic=False), patch.object(html_generator.time, "time", return_value=3000.0):
+        legacy = create_text_message_url("Hello")
+    assert "cb%3A3000" in legacy
+    assert create_text_message_url("Hello") == first
+
+
+async def test_render_mode_is_scoped_to_each_caller() -> None:
+    async def render(deterministic: bool) -> str:
+        with render_mode(deterministic=deterministic):
+            await asyncio.sleep(0)
+            return create_text_message_url("Hello")
+
+    # Two config entries rendering at the same time keep their own setting.
+    stable, legacy = await asyncio.gather(render(True), render(False))
+    assert "cb%3A" not in stable
+    assert "cb%3A" in legacy
+
+
+async def test_status_panel_embeds_each_icon_once() -> None:
+    index = IconIndex.build(Path(html_generator.__file__).parent)
+    # svg_button/ takes precedence over svg/ for names present in both.
+    button_door = (Path(html_generator.__file__).parent / "svg_button" / "door-open.svg").read_bytes()
+    assert index.data_url("door-open.svg").endswith(base64.b64encode(button_door).decode())
+
+    states = {
+        f"light.l{i}": SimpleNamespace(
+            entity_id=f"light.l{i}", domain="light", state="on", attributes={"friendly_name": f"L{i}"}
+        )
+        for i in range(20)
+    }
+    hass = MagicMock()
+    hass.states.get = states.get
+    with patch.object(html_generator, "_ICON_INDEX", index):
+        url = await html_generator.create_status_panel_url(hass, "T", list(states), "en", "0")
+    page = urllib.parse.unquote(url.split(",", 1)[1])
+    assert page.count("data:image/svg+xml") == 1
+    assert page.count('class="icon ic-light-on"') == 20
+
+
+def test_raster_helpers_without_backend() -> None:
+    from custom_components.visionect_joan.raster_render import (
+        find_raster_backend,
+        image_page_html,
+        is_static_page,
+    )
+    from custom_components.visionect_joan.screen_layout import device_resolution
+
+    assert find_raster_backend("none") is None
+    assert is_static_page("<html><body><div>21 °C</div></body></html>")
+    assert not is_static_page('<div onclick="go()">x</div>')
+    # DisplayRotation codes: "0"/"2" portrait, "1"/"3" landscape.
+    assert device_resolution({"Displays": [{"Width": 1600, "Height": 1200}]}, "0") == (1200, 1600)
+    assert device_resolution({"Displays": [{"Width": 1600, "Height": 1200}]}, "3") == (1600, 1200)
+    assert device_resolution({}, "1") == (1024, 758)
+    assert device_resolution({}, "2") == (758, 1024)
+    assert 'width:1024px;height:758px' in image_page_html("http://ha/x.png", 1024, 758)
+
+
+def test_graph_engine_reuses_one_figure_per_layout() -> None:
+    pytest.importorskip("matplotlib")
+    engine = GraphEngine()
+    t0 = datetime(2026, 1, 1)
+    series = [("a", [t0 + timedelta(minutes=i) for i in range(50)], [float(i % 7) for i in range(50)])]
+    layout = html_generator._get_sensor_graph_layout("joan6", "1")
+    first = engine.render(series, layout, "line", False)
+    engine.render(series, layout, "bar", True)
+    again = engine.render(series, layout, "line", False)
+    assert first == again
+    assert engine.stats == {"renders": 3, "figures_created": 1}
+
+
+def test_svg_graph_paths_are_compact() -> None:
+    pts = quantize([(0.4, 10.2), (5.1, 10.4), (10, 10), (10, 3), (10, 8), (20, 18)])
+    # Straight run collapses; the in-column spike (10,3) survives.
+    assert drop_collinear(pts) == [(0, 10), (10, 10), (10, 3), (10, 8), (20, 18)]
+    assert relative_path(drop_collinear(pts)) == "M0 10h10v-7v5l10 10"
+    assert step_points([(0, 5), (4, 2)]) == [(0, 5), (4, 5), (4, 2)]
+
+    t0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        SimpleNamespace(state=str(20 + 3 * math.sin(i / 40)), last_updated=t0 + timedelta(seconds=30 * i))
+        for i in range(5000)
+    ]
+    hass = MagicMock()
+    hass.states.get = lambda entity_id: None
+    for graph_type in ("line", "step", "bar"):
+        url = html_generator.create_sensor_graph_svg_data_url(
+            hass, {"sensor.t": rows}, ["sensor.t"], "1", "joan6", graph_type, 0, True
+        )
+        page = urllib.parse.unquote(url.split(",", 1)[1])
+        assert "<polyline" not in page
+        assert len(url) < 60_000
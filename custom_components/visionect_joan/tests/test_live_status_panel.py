@@ -0,0 +1,139 @@
+"""Tests for subscription-driven status panels."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from custom_components.visionect_joan import live_status_panel
+from custom_components.visionect_joan.live_status_panel import LiveStatusPanel, async_detach_tablets
+
+
+async def test_only_displayed_changes_render_and_bursts_coalesce(monkeypatch) -> None:
+    listeners: list = []
+    timers: list = []
+    monkeypatch.setattr(
+        live_status_panel,
+        "async_track_state_change_event",
+        lambda hass, entity_ids, action: listeners.append(action) or (lambda: None),
+    )
+    monkeypatch.setattr(
+        live_status_panel,
+        "async_call_later",
+        lambda hass, delay, action: timers.append(action) or (lambda: None),
+    )
+
+    states = {"sensor.t": "21.31", "sensor.h": "40"}
+    renders: list[int] = []
+
+    async def _render() -> None:
+        renders.append(1)
+
+    panel = LiveStatusPanel(
+        MagicMock(),
+        list(states),
+        ["dev-1"],
+        debounce_s=5,
+        format_row=lambda eid: f"{float(states[eid]):.1f}",
+        render=_render,
+    )
+    panel.async_start()
+    (on_change,) = listeners
+
+    def _event(entity_id: str, value: str) -> None:
+        states[entity_id] = value
+        on_change(SimpleNamespace(data={"entity_id": entity_id}))
+
+    _event("sensor.t", "21.33")  # still "21.3" on screen
+    assert timers == []
+
+    _event("sensor.t", "21.4")
+    _event("sensor.h", "41")
+    assert len(timers) == 1
+
+    await timers[0](None)
+    assert renders == [1]
+    assert panel.stats()["unchanged"] == 1
+    assert panel.stats()["events"] == 3
+
+
+async def test_update_held_by_battery_guard_is_pushed_when_the_window_ends(monkeypatch) -> None:
+    listeners: list = []
+    timers: list[tuple[float, object]] = []
+    monkeypatch.setattr(
+        live_status_panel,
+        "async_track_state_change_event",
+        lambda hass, entity_ids, action: listeners.append(action) or (lambda: None),
+    )
+    monkeypatch.setattr(
+        live_status_panel,
+        "async_call_later",
+        lambda hass, delay, action: timers.append((delay, action)) or (lambda: None),
+    )
+
+    states = {"sensor.t": "21.0"}
+    outcomes = ["skipped_guard", "success"]
+    rendered: list[str] = []
+
+    async def _render() -> dict[str, str]:
+        rendered.append(states["sensor.t"])
+        return {"dev-1": outcomes.pop(0)}
+
+    panel = LiveStatusPanel(
+        MagicMock(),
+        list(states),
+        ["dev-1"],
+        debounce_s=5,
+        format_row=lambda eid: states[eid],
+        render=_render,
+        retry_delay=lambda held: 100.0,
+    )
+    panel.async_start()
+    (on_change,) = listeners
+
+    states["sensor.t"] = "22.0"
+    on_change(SimpleNamespace(data={"entity_id": "sensor.t"}))
+    delay, fire = timers.pop()
+    assert delay == 5
+    await fire(None)
+
+    # Guard held the push: the row is still pending and retried after the window.
+    assert rendered == ["22.0"]
+    delay, fire = timers.pop()
+    assert delay == 101.0
+    states["sensor.t"] = "23.0"
+    on_change(SimpleNamespace(data={"entity_id": "sensor.t"}))
+    assert timers == []  # the retry timer already covers it
+    await fire(None)
+    assert rendered == ["22.0", "23.0"]
+    assert timers == []
+    assert panel.stats()["retries"] == 1
+
+    # Same rows again: nothing to push.
+    on_change(SimpleNamespace(data={"entity_id": "sensor.t"}))
+    assert timers == []
+
+
+async def test_pushing_something_else_detaches_the_tablet(monkeypatch) -> None:
+    unsubscribed: list[str] = []
+    monkeypatch.setattr(
+        live_status_panel,
+        "async_track_state_change_event",
+        lambda hass, entity_ids, action: lambda: unsubscribed.append("state"),
+    )
+    panel = LiveStatusPanel(
+        MagicMock(), ["sensor.t"], ["DEV-1", "dev-2"], debounce_s=5, format_row=str, render=MagicMock()
+    )
+    panel.async_start()
+    panels = {"dev-1": panel, "dev-2": panel}
+
+    # A sleep page or low-battery screen goes to one tablet: the other keeps its live panel.
+    async_detach_tablets(panels, ["dev-1"])
+    assert (panels, panel.uuids, unsubscribed) == ({"dev-2": panel}, ["dev-2"], [])
+
+    async_detach_tablets(panels, ["DEV-2", "dev-3"])
+    assert (panels, panel.uuids, unsubscribed) == ({}, [], ["state"])
@@ -0,0 +1,63 @@
+"""Tests for cached CryptoCompare market data."""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from custom_components.visionect_joan import market_data
+from custom_components.visionect_joan.market_data import HOUR_S, MarketData
+
+
+def _cryptocompare(clock: dict):
+    """Answer price and hourly-history requests like CryptoCompare, history ending at ``clock["now_hour"]``."""
+
+    def respond(url, headers):
+        query = {k: v[0] for k, v in parse_qs(urlparse(url).query).items()}
+        if "pricemultifull" in url:
+            raw = {s: {query["tsyms"]: {"PRICE": 1.0}} for s in query["fsyms"].split(",")}
+            return 200, {"RAW": raw}, {}
+        limit = int(query["limit"])
+        rows = [
+            {"time": clock["now_hour"] - (limit - i) * HOUR_S, "close": float(i)} for i in range(limit + 1)
+        ]
+        return 200, {"Data": {"Data": rows}}, {}
+
+    return respond
+
+
+async def test_prices_and_history_are_cached_and_fetched_concurrently(fake_http) -> None:
+    now_hour = int(time.time()) // HOUR_S * HOUR_S
+    clock = {"now_hour": now_hour}
+    session = fake_http
+    session.delay_s = 0.01
+    session.respond = _cryptocompare(clock)
+    market = MarketData(MagicMock(), concurrency=2)
+    symbols = ["BTC", "ETH", "SOL", "ADA", "DOT"]
+
+    with patch.object(market_data, "async_get_clientsession", return_value=session):
+        prices = await market.async_prices(symbols, "USD")
+        histories = await market.async_histories(symbols, "USD", 24)
+        # Second tablet group right after: served from the caches.
+        await market.async_prices(symbols, "USD")
+        again = await market.async_histories(symbols, "USD", 24)
+
+    assert set(prices) == set(symbols)
+    assert all(len(h) == 25 for h in histories.values())
+    assert again == histories
+    assert session.max_in_flight == 2
+    assert len(session.requests) == 1 + len(symbols)
+
+    # An hour later only the open candle and the new one are requested.
+    with (
+        patch.object(market_data, "async_get_clientsession", return_value=session),
+        patch.object(market_data.time, "time", return_value=now_hour + HOUR_S + 5),
+    ):
+        clock["now_hour"] = now_hour + HOUR_S
+        await market.async_histories(["BTC"], "USD", 24)
+    assert "limit=1" in session.requests[-1][0]
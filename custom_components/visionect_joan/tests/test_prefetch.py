@@ -0,0 +1,71 @@
+"""Tests for the panel-input prefetch scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from custom_components.visionect_joan import prefetch as prefetch_mod
+from custom_components.visionect_joan.prefetch import PrefetchScheduler
+
+
+async def test_prefetched_values_are_served_warm_and_loads_coalesce() -> None:
+    hass = MagicMock()
+    hass.loop = asyncio.get_running_loop()
+    scheduler = PrefetchScheduler(hass, lead_s=30)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return ["forecast"]
+
+    # Without prefetching every call loads (concurrent ones share the request).
+    first, second = await asyncio.gather(
+        scheduler.async_get("k", loader), scheduler.async_get("k", loader)
+    )
+    assert first == second == ["forecast"]
+    assert calls == 1
+    await scheduler.async_get("k", loader)
+    assert calls == 2
+
+    # Scheduled 30 s before the next run; the run then reads the warm value.
+    with patch.object(prefetch_mod, "async_call_later", return_value=MagicMock()) as later:
+        scheduler.async_schedule("send_weather:abc", 600, {"k": loader})
+    assert later.call_args.args[1] == 570
+    await scheduler._async_prefetch("send_weather:abc", {"k": loader})
+    assert await scheduler.async_get("k", loader) == ["forecast"]
+    assert calls == 3
+    assert scheduler.stats()["warm_hits"] == 1
+
+    scheduler.async_stop()
+    assert scheduler.stats()["scheduled_panels"] == 0
+
+
+async def test_failed_loads_are_not_kept() -> None:
+    hass = MagicMock()
+    hass.loop = asyncio.get_running_loop()
+    scheduler = PrefetchScheduler(hass)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        raise RuntimeError("calendar backend down")
+
+    await scheduler._async_prefetch("send_calendar:abc", {"k": loader})
+    assert scheduler.stats()["prefetch_errors"] == 1
+    assert scheduler.stats()["warm_values"] == 0
+
+    # The next call loads inline again and renders with its default.
+    assert await scheduler.async_get("k", loader, default=[]) == []
+    assert calls == 2
+    with pytest.raises(RuntimeError):
+        await scheduler.async_get("k", loader)
@@ -0,0 +1,59 @@
+"""Tests for the content-addressed page publish store."""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from custom_components.visionect_joan.publish_store import (
+    TAG_LOW_BATTERY,
+    PublishStore,
+    content_hash_for,
+)
+
+
+def _hass() -> MagicMock:
+    hass = MagicMock()
+    executor_calls: list = []
+
+    async def _executor(func, *args):
+        executor_calls.append(func)
+        return func(*args)
+
+    hass.async_add_executor_job = _executor
+    hass.executor_calls = executor_calls
+    return hass
+
+
+async def test_known_page_is_published_without_io(tmp_path: Path) -> None:
+    hass = _hass()
+    store = PublishStore(hass, tmp_path / "visionect_cache")
+    html = "<html><body>LOW BATTERY</body></html>"
+
+    name = await store.async_publish(html, service="battery_guard", tags=(TAG_LOW_BATTERY,))
+    assert name == f"{content_hash_for(html)}.html"
+    assert (tmp_path / "visionect_cache" / name).read_text(encoding="utf-8") == html
+
+    again = await store.async_publish(html, service="send_text")
+    assert again == name
+    assert len(hass.executor_calls) == 1
+    page = store.get(content_hash_for(html))
+    assert page.service == "battery_guard"
+    assert TAG_LOW_BATTERY in page.tags
+    assert store.stats()["index_hits"] == 1
+
+
+async def test_forget_and_recently_published(tmp_path: Path) -> None:
+    store = PublishStore(_hass(), tmp_path, max_entries=2)
+    names = [await store.async_publish(f"<p>{i}</p>") for i in range(3)]
+    # Oldest row evicted from the bounded index; file stays on disk.
+    assert store.get(names[0][:-5]) is None
+    assert (tmp_path / names[0]).exists()
+
+    assert store.recently_published(time.time() - 60) == set(names[1:])
+    store.forget([names[1]])
+    assert store.get(names[1][:-5]) is None
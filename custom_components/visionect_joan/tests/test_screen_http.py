@@ -0,0 +1,95 @@
+"""Tests for the in-memory screen store and its HTTP view."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from custom_components.visionect_joan import screen_http
+from custom_components.visionect_joan.const import DOMAIN
+from custom_components.visionect_joan.publish_store import PublishStore
+from custom_components.visionect_joan.screen_http import (
+    ScreenStore,
+    VisionectJoanScreenView,
+    screen_name_for,
+)
+
+
+def _hass() -> MagicMock:
+    hass = MagicMock()
+
+    def _executor(func, *args):
+        return asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    hass.async_add_executor_job = _executor
+    hass.data = {}
+    return hass
+
+
+def _request(headers: dict[str, str]) -> SimpleNamespace:
+    return SimpleNamespace(headers=headers)
+
+
+async def test_publish_goes_to_memory_and_spills_over_budget(tmp_path: Path) -> None:
+    hass = _hass()
+    spill = tmp_path / "visionect_cache"
+    screens = ScreenStore(hass, spill, max_bytes=3000)
+    store = PublishStore(hass, spill, screens=screens)
+
+    first = await store.async_publish("<html>" + "a" * 2000 + "</html>")
+    assert not spill.exists()
+    second = await store.async_publish("<html>" + "b" * 2000 + "</html>")
+    await asyncio.sleep(0.05)
+
+    # The older page was pushed out of RAM and is now served from disk.
+    assert (spill / first).exists()
+    assert not (spill / second).exists()
+    assert (await screens.async_get(first)).data.startswith(b"<html>aaa")
+    assert screens.stats()["disk_hits"] == 1
+    assert screens.stats()["memory_entries"] == 1
+
+
+async def test_view_etag_304_and_gzip(tmp_path: Path) -> None:
+    hass = _hass()
+    screens = ScreenStore(hass, tmp_path, max_bytes=1 << 20)
+    hass.data[DOMAIN] = {"screen_store": screens}
+    html = ("<html><body>" + "hello " * 500 + "</body></html>").encode()
+    name = screen_name_for(html, "html")
+    screens.put(name, html)
+    view = VisionectJoanScreenView(hass)
+
+    compress_threads: list[threading.Thread] = []
+    real_compress = gzip.compress
+
+    def _compress(data: bytes, compresslevel: int) -> bytes:
+        compress_threads.append(threading.current_thread())
+        return real_compress(data, compresslevel=compresslevel)
+
+    with patch.object(screen_http.gzip, "compress", _compress):
+        resp = await view.get(_request({"Accept-Encoding": "gzip, deflate"}), name)
+        await view.get(_request({"Accept-Encoding": "gzip"}), name)
+    # Compressed once, off the event loop.
+    assert len(compress_threads) == 1
+    assert compress_threads[0] is not threading.main_thread()
+    assert resp.status == 200
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(resp.body) == html
+    etag = resp.headers["ETag"]
+
+    resp = await view.get(_request({"If-None-Match": etag}), name)
+    assert resp.status == 304
+
+    resp = await view.get(_request({}), name)
+    assert resp.status == 200
+    assert resp.body == html
+    assert "Content-Encoding" not in resp.headers
+
+    resp = await view.get(_request({}), "../secrets.yaml")
+    assert resp.status == 404
@@ -0,0 +1,74 @@
+"""Tests for camera snapshot preparation and the per-camera file ring."""
+
+from __future__ import annotations
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from custom_components.visionect_joan.snapshot_pipeline import SnapshotRing, prepare_snapshot
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _frame(width: int, height: int, shade: int = 90) -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (width, height), (shade, 160, 220)).save(out, format="JPEG")
+    return out.getvalue()
+
+
+def test_4k_frame_is_fitted_to_the_panel_in_grayscale() -> None:
+    frame = _frame(3840, 2160)
+
+    data, ext = prepare_snapshot(frame, 1024, 758)
+    with Image.open(io.BytesIO(data)) as img:
+        assert (ext, img.format, img.mode) == ("jpg", "JPEG", "L")
+        assert img.size == (1024, 576)
+    assert len(data) < len(frame)
+
+    data, ext = prepare_snapshot(frame, 758, 1024, gray_levels=4)
+    with Image.open(io.BytesIO(data)) as img:
+        assert (ext, img.size) == ("png", (758, 426))
+        assert len(set(img.convert("L").getdata())) <= 4
+
+    # Small frames are not upscaled; undecodable data is passed through.
+    with Image.open(io.BytesIO(prepare_snapshot(_frame(320, 240), 1024, 758)[0])) as img:
+        assert img.size == (320, 240)
+    assert prepare_snapshot(b"not a jpeg", 1024, 758) == (b"not a jpeg", "jpg")
+
+
+async def test_ring_keeps_a_bounded_set_of_files_per_camera(executor_hass, tmp_path: Path) -> None:
+    ring = SnapshotRing(executor_hass, tmp_path, size=2)
+
+    box = (1024, 758)
+    names = [(await ring.async_write("camera.front_door", box, bytes([i]), "jpg"))[0] for i in range(5)]
+    assert names[:3] == [
+        "visionect_snapshot_camera_front_door_1024x758_0.jpg",
+        "visionect_snapshot_camera_front_door_1024x758_1.jpg",
+        "visionect_snapshot_camera_front_door_1024x758_0.jpg",
+    ]
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(set(names))
+    assert (tmp_path / names[-1]).read_bytes() == bytes([4])
+
+    # An unchanged frame reuses its slot without writing.
+    again, _digest = await ring.async_write("camera.front_door", box, bytes([4]), "jpg")
+    assert again == names[-1]
+    assert ring.stats() == {"written": 5, "reused": 1, "cameras": 1, "rings": 1}
+
+
+async def test_ring_never_overwrites_another_box_of_the_same_call(executor_hass, tmp_path: Path) -> None:
+    ring = SnapshotRing(executor_hass, tmp_path)
+
+    # joan6 / joan13 in both orientations: four frames published by one call.
+    boxes = [(1024, 758), (758, 1024), (1600, 1200), (1200, 1600)]
+    names = [
+        (await ring.async_write("camera.front_door", box, bytes([i]), "jpg"))[0] for i, box in enumerate(boxes)
+    ]
+    assert len(set(names)) == 4
+    for i, name in enumerate(names):
+        assert (tmp_path / name).read_bytes() == bytes([i])
+    assert ring.stats()["rings"] == 4
@@ -2,15 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
+from custom_components.visionect_joan.content_fingerprint import volatile_span
+from custom_components.visionect_joan.publish_store import PublishStore
 from custom_components.visionect_joan.url_push import (
     ATTR_WAKE_TABLET,
     async_push_url_from_service,
+    async_push_urls_batch,
+    fire_batch_command_result,
     get_configured_url_from_coordinator,
     resolve_service_force_wake,
     urls_equivalent,
@@ -27,6 +32,9 @@ class _FakeApi:
             "url_write_skip_unchanged": 0,
         }
         self.put_calls: list[tuple[str, str, bool]] = []
+        self.outcomes: dict[str, str] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
 
     @staticmethod
     def _normalize_url_for_battery_guard(url: str) -> str:
@@ -47,9 +55,16 @@ class _FakeApi:
     def get_battery_guard_metrics(self) -> dict:
         return dict(self._metrics)
 
+    def get_last_url_write_outcome(self, uuid: str) -> str | None:
+        return self.outcomes.get(uuid)
+
     async def async_set_device_url(self, uuid: str, url: str, force: bool = False) -> bool:
         self.put_calls.append((uuid, url, force))
-        return True
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return uuid not in self.outcomes
 
 
 def test_urls_equivalent_ignores_cb_query() -> None:
@@ -74,52 +89,42 @@ def test_resolve_force_wake_alert_profile() -> None:
     assert resolve_service_force_wake(entry_data, "abc", {}) is True
 
 
-def test_push_skips_unchanged_without_vss_put() -> None:
-    import asyncio
-
-    async def _run() -> None:
-        api = _FakeApi()
-        coordinator = MagicMock()
-        coordinator.data = {
-            "dev-1": {"Config": {"Url": "http://ha/local/a.html?cb=1"}},
-        }
-        entry_data = {"prefs": {"refresh_profile_by_uuid": {"dev-1": "eco"}}}
-        result, skipped = await async_push_url_from_service(
-            api,
-            coordinator,
-            entry_data,
-            "dev-1",
-            "http://ha/local/a.html?cb=99",
-            {},
-        )
-        assert result == "skipped_unchanged"
-        assert skipped is True
-        assert api.put_calls == []
-
-    asyncio.run(_run())
-
-
-def test_push_eco_uses_force_false() -> None:
-    import asyncio
-
-    async def _run() -> None:
-        api = _FakeApi()
-        coordinator = MagicMock()
-        coordinator.data = {"dev-1": {"Config": {"Url": "http://ha/old.html"}}}
-        entry_data = {"prefs": {"refresh_profile_by_uuid": {"dev-1": "eco"}}}
-        result, skipped = await async_push_url_from_service(
-            api,
-            coordinator,
-            entry_data,
-            "dev-1",
-            "http://ha/new.html",
-            {},
-        )
-        assert result == "success"
-        assert skipped is False
-        assert api.put_calls == [("dev-1", "http://ha/new.html", False)]
-
-    asyncio.run(_run())
+async def test_push_skips_unchanged_without_vss_put() -> None:
+    api = _FakeApi()
+    coordinator = MagicMock()
+    coordinator.data = {
+        "dev-1": {"Config": {"Url": "http://ha/local/a.html?cb=1"}},
+    }
+    entry_data = {"prefs": {"refresh_profile_by_uuid": {"dev-1": "eco"}}}
+    result, skipped = await async_push_url_from_service(
+        api,
+        coordinator,
+        entry_data,
+        "dev-1",
+        "http://ha/local/a.html?cb=99",
+        {},
+    )
+    assert result == "skipped_unchanged"
+    assert skipped is True
+    assert api.put_calls == []
+
+
+async def test_push_eco_uses_force_false() -> None:
+    api = _FakeApi()
+    coordinator = MagicMock()
+    coordinator.data = {"dev-1": {"Config": {"Url": "http://ha/old.html"}}}
+    entry_data = {"prefs": {"refresh_profile_by_uuid": {"dev-1": "eco"}}}
+    result, skipped = await async_push_url_from_service(
+        api,
+        coordinator,
+        entry_data,
+        "dev-1",
+        "http://ha/new.html",
+        {},
+    )
+    assert result == "success"
+    assert skipped is False
+    assert api.put_calls == [("dev-1", "http://ha/new.html", False)]
 
 
 def test_get_configured_url_normalizes_uuid() -> None:
@@ -128,3 +133,80 @@ def test_get_configured_url_normalizes_uuid() -> None:
         "aa-bb-cc": {"Config": {"Url": "http://ha/view.html"}},
     }
     assert get_configured_url_from_coordinator(coordinator, "AA-BB-CC") == "http://ha/view.html"
+
+
+async def test_batch_push_is_bounded_and_reports_per_tablet() -> None:
+    api = _FakeApi()
+    api.outcomes = {"dev-2": "skip_guard", "dev-3": "failure"}
+    coordinator = MagicMock()
+    coordinator.data = {"dev-4": {"Config": {"Url": "http://ha/same.html?cb=1"}}}
+    entry_data = {"prefs": {"refresh_profile_by_uuid": {}}}
+    seen: list[str] = []
+    pushes = [
+        ("dev-1", "http://ha/a.html"),
+        ("dev-2", "http://ha/a.html"),
+        ("dev-3", "http://ha/a.html"),
+        ("dev-4", "http://ha/same.html?cb=2"),
+        ("dev-5", "http://ha/a.html"),
+    ]
+    results = await async_push_urls_batch(
+        api,
+        coordinator,
+        entry_data,
+        pushes,
+        {},
+        concurrency=2,
+        on_result=lambda u, r, s: seen.append(u),
+    )
+    assert list(results) == ["dev-1", "dev-2", "dev-3", "dev-4", "dev-5"]
+    assert results["dev-1"] == ("success", False)
+    assert results["dev-2"] == ("skipped_guard", True)
+    assert results["dev-3"] == ("failure", False)
+    assert results["dev-4"] == ("skipped_unchanged", True)
+    assert sorted(seen) == sorted(results)
+    assert api.max_in_flight == 2
+
+    hass = MagicMock()
+    fire_batch_command_result(hass, "send_text", results)
+    _event, payload = hass.bus.async_fire.call_args.args
+    assert payload["batch"] is True
+    assert payload["status"] == "failure"
+    assert payload["counts"] == {
+        "success": 2,
+        "skipped_guard": 1,
+        "failure": 1,
+        "skipped_unchanged": 1,
+    }
+
+
+async def test_push_skips_when_rendered_content_unchanged(executor_hass, tmp_path: Path) -> None:
+    pages = PublishStore(executor_hass, tmp_path)
+    api = _FakeApi()
+    coordinator = MagicMock()
+    coordinator.data = {"dev-1": {"Config": {"Url": "http://ha/old.html"}}}
+    entry_data = {"prefs": {"refresh_profile_by_uuid": {}}}
+
+    first = await pages.async_publish(f"<p>21.3 °C</p>{volatile_span('12:00')}<!-- cb:1 -->")
+    url_1 = f"http://ha/local/visionect_cache/{first}?cb=1"
+    result, _ = await async_push_url_from_service(
+        api, coordinator, entry_data, "dev-1", url_1, {}, pages=pages
+    )
+    assert result == "success"
+    coordinator.data["dev-1"]["Config"]["Url"] = url_1
+
+    second = await pages.async_publish(f"<p>21.3 °C</p>{volatile_span('12:05')}<!-- cb:2 -->")
+    assert second != first
+    result, skipped = await async_push_url_from_service(
+        api, coordinator, entry_data, "dev-1",
+        f"http://ha/local/visionect_cache/{second}?cb=2", {}, pages=pages,
+    )
+    assert (result, skipped) == ("skipped_unchanged", True)
+
+    third = await pages.async_publish(f"<p>21.4 °C</p>{volatile_span('12:10')}")
+    result, _ = await async_push_url_from_service(
+        api, coordinator, entry_data, "dev-1",
+        f"http://ha/local/visionect_cache/{third}?cb=3", {}, pages=pages,
+    )
+    assert result == "success"
+    assert len(api.put_calls) == 2
+
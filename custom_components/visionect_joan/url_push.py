@@ -2,16 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections.abc import Callable
 from typing import Any, TYPE_CHECKING
 
-from .const import DOMAIN
+from .const import DOMAIN, PUSH_CONCURRENCY_DEFAULT
 from .profile_tuning import normalize_device_uuid, normalize_refresh_profile
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
     from .api import VisionectAPI
+    from .publish_store import PublishStore
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -70,36 +73,51 @@ async def async_push_url_from_service(
     call_data: dict | None = None,
     *,
     intentional_wake: bool = False,
+    pages: PublishStore | None = None,
 ) -> tuple[PushResult, bool]:
     """Push URL to VSS session respecting eco battery guard.
 
+    With ``pages``, a generated page whose content fingerprint matches the last
+    page pushed to this tablet (still its session URL) is skipped as unchanged.
+
     Returns (result, skipped_wake). skipped_wake is True when tablet was not updated.
     """
     if not url:
         return "failure", False
 
+    nu = normalize_device_uuid(device_uuid)
     current = get_configured_url_from_coordinator(coordinator, device_uuid)
     if current and urls_equivalent(api, current, url):
-        _LOGGER.debug(
-            "Battery push skipped for %s: URL unchanged (no VSS PUT).",
-            normalize_device_uuid(device_uuid),
-        )
+        _LOGGER.debug("Battery push skipped for %s: URL unchanged (no VSS PUT).", nu)
+        return "skipped_unchanged", True
+
+    fingerprints: dict[str, tuple[str, str]] = entry_data.setdefault("content_fingerprints", {})
+    fingerprint = pages.fingerprint_for_url(url) if pages is not None else None
+    last = fingerprints.get(nu)
+    if (
+        fingerprint
+        and last is not None
+        and last[0] == fingerprint
+        and current
+        and urls_equivalent(api, current, last[1])
+    ):
+        _LOGGER.debug("Battery push skipped for %s: rendered content unchanged (no VSS PUT).", nu)
+        pages.touch_url(current)
         return "skipped_unchanged", True
 
-    metrics_before = api.get_battery_guard_metrics()
     force = resolve_service_force_wake(
         entry_data, device_uuid, call_data, intentional_wake=intentional_wake
     )
     ok = await api.async_set_device_url(device_uuid, url, force=force)
     if ok:
+        if fingerprint:
+            fingerprints[nu] = (fingerprint, url)
+        else:
+            fingerprints.pop(nu, None)
         return "success", False
 
-    metrics_after = api.get_battery_guard_metrics()
-    if (
-        not force
-        and metrics_after.get("url_write_skip_guard", 0)
-        > metrics_before.get("url_write_skip_guard", 0)
-    ):
+    # Per-device outcome (global guard counters are not reliable while pushes run in parallel).
+    if not force and api.get_last_url_write_outcome(device_uuid) == "skip_guard":
         _LOGGER.debug(
             "Battery guard blocked URL push for %s (profile allows retry later).",
             normalize_device_uuid(device_uuid),
@@ -109,6 +127,54 @@ async def async_push_url_from_service(
     return "failure", False
 
 
+async def async_push_urls_batch(
+    api: VisionectAPI,
+    coordinator,
+    entry_data: dict,
+    pushes: list[tuple[str, str]],
+    call_data: dict | None = None,
+    *,
+    concurrency: int = PUSH_CONCURRENCY_DEFAULT,
+    intentional_wake: bool = False,
+    on_result: Callable[[str, PushResult, bool], None] | None = None,
+    pages: PublishStore | None = None,
+) -> dict[str, tuple[PushResult, bool]]:
+    """Push prepared URLs to many tablets, at most ``concurrency`` at a time.
+
+    Each tablet goes through ``async_push_url_from_service`` (same battery guard and
+    verification as a single push). ``on_result`` is called as each push finishes.
+    Returns {uuid: (result, skipped_wake)} in input order; a later URL for the same
+    UUID replaces an earlier one.
+    """
+    targets = dict(pushes)
+    semaphore = asyncio.Semaphore(max(1, int(concurrency)))
+
+    async def _push_one(device_uuid: str, url: str) -> tuple[PushResult, bool]:
+        async with semaphore:
+            try:
+                outcome = await async_push_url_from_service(
+                    api,
+                    coordinator,
+                    entry_data,
+                    device_uuid,
+                    url,
+                    call_data,
+                    intentional_wake=intentional_wake,
+                    pages=pages,
+                )
+            except Exception as err:
+                _LOGGER.error("URL push to %s failed: %s", device_uuid, err)
+                outcome = ("failure", False)
+        if on_result is not None:
+            on_result(device_uuid, *outcome)
+        return outcome
+
+    outcomes = await asyncio.gather(
+        *(_push_one(device_uuid, url) for device_uuid, url in targets.items())
+    )
+    return dict(zip(targets, outcomes))
+
+
 def event_status_from_push_result(result: PushResult) -> str:
     """Map internal push result to legacy automation status field."""
     if result in ("success", "skipped_unchanged", "skipped_guard"):
@@ -136,3 +202,28 @@ def fire_command_result(
     if skipped_wake or result in ("skipped_unchanged", "skipped_guard"):
         payload["skipped_wake"] = True
     hass.bus.async_fire(EVENT_COMMAND_RESULT, payload)
+
+
+def fire_batch_command_result(
+    hass: HomeAssistant,
+    service_name: str,
+    results: dict[str, tuple[PushResult, bool]],
+) -> None:
+    """Fire one aggregate visionect_joan_command_result for a multi-tablet push."""
+    from .const import EVENT_COMMAND_RESULT
+
+    counts: dict[str, int] = {}
+    for result, _skipped in results.values():
+        counts[result] = counts.get(result, 0) + 1
+    statuses = {event_status_from_push_result(r) for r, _s in results.values()}
+    hass.bus.async_fire(
+        EVENT_COMMAND_RESULT,
+        {
+            "service": service_name,
+            "batch": True,
+            "uuids": list(results),
+            "status": "success" if statuses == {"success"} else "failure",
+            "push_results": {u: r for u, (r, _s) in results.items()},
+            "counts": counts,
+        },
+    )